@@ -1,21 +1,88 @@
-from services.analyse_service import analyze_market
+from config import load_config
+from data.resampler import ANALYSIS_BARS
+from services.analyse_service import (
+    analyze_market,
+    data_router,
+    htf_trend
+)
 from analytics.signal_validator import SignalValidator
 from analytics.signal_ranker import SignalRanker
 from analytics.signal_dispatcher import SignalDispatcher
+from analytics.signal_fanout import SignalFanout
+from analytics.signal_validity import get_signal_validity
+from analytics.signal_store import signal_store
+from execution.brokers.mt5_export import MT5ExportQueue
+from database.history_writer import HistoryWriter
+from risk.portfolio_risk import portfolio_risk
+
+
+DEFAULT_SYMBOLS = [
+    "EURUSD", "GBPUSD", "USDJPY",
+    "AUDUSD", "USDCAD", "XAGUSD",
+    "XAUUSD", "BTCUSDT", "XPTUSD"
+]
+
+
+def load_universe() -> list[str]:
+    """
+    Scan universe from config/settings.yaml (all groups, de-duplicated)
+    """
+
+    groups = load_config("settings").get("universe") or {}
+    symbols = [s.upper() for group in groups.values() for s in group or []]
+
+    return list(dict.fromkeys(symbols)) or DEFAULT_SYMBOLS
+
 
 class AutoSignalScanner:
 
-    SYMBOLS = [
-        "EURUSD", "GBPUSD", "USDJPY",
-        "AUDUSD", "USDCAD", "XAGUSD",
-        "XAUUSD", "BTCUSDT", "XPTUSD"
-    ]
+    SYMBOLS = load_universe()
+
+    # Send only top N strongest signals per scan
+    TOP_N = 3
+
+    @classmethod
+    def scan_and_dispatch(
+        cls,
+        interval,
+        account_balance,
+        risk_percent,
+        scheduler=None
+    ):
+        symbols = cls.SYMBOLS
+
+        # Adaptive mode: only symbols whose recheck window has elapsed
+        if scheduler is not None:
+            scheduler.register(cls.SYMBOLS, interval)
+            symbols = scheduler.pop_due(interval=interval)
+
+        valid_signals = cls.scan_symbols(
+            symbols, interval, account_balance, risk_percent, scheduler
+        )
+
+        if scheduler is not None:
+            scheduler.save()
+
+        cls.dispatch_ranked(valid_signals, account_balance)
 
     @classmethod
-    def scan_and_dispatch(cls, interval, account_balance, risk_percent):
+    def scan_symbols(
+        cls,
+        symbols,
+        interval,
+        account_balance,
+        risk_percent,
+        scheduler=None
+    ) -> list[dict]:
+        """
+        Analyze `symbols` and return valid signals (no dispatch)
+        """
+
         valid_signals = []
 
-        for symbol in cls.SYMBOLS:
+        for symbol in symbols:
+            result = None
+
             try:
                 result = analyze_market(
                     symbol=symbol,
@@ -28,17 +95,154 @@ class AutoSignalScanner:
                 )
 
                 if SignalValidator.is_valid(result):
-                    valid_signals.append(result)
+                    valid_signals.append(cls.to_signal(result))
 
             except Exception as e:
                 print(f"[SCAN ERROR] {symbol}: {e}")
 
+            if scheduler is not None:
+                scheduler.schedule_result(symbol, interval, result)
+
+        return valid_signals
+
+    @classmethod
+    def scan_intervals(cls, intervals, account_balance, risk_percent, scheduler=None):
+        """
+        One scan for several intervals closing together
+        Adaptive with a RecheckScheduler: only pairs whose recheck
+        window has elapsed are analyzed, then rescheduled
+        """
+
+        due = None
+
+        if scheduler is not None:
+            due = scheduler.due_intervals(cls.SYMBOLS, intervals)
+
+        valid_signals = cls.collect_intervals(
+            cls.SYMBOLS, intervals, account_balance, risk_percent, due, scheduler
+        )
+
+        if scheduler is not None:
+            scheduler.save()
+
+        cls.dispatch_ranked(valid_signals, account_balance)
+
+    @classmethod
+    def collect_intervals(
+        cls,
+        symbols,
+        intervals,
+        account_balance,
+        risk_percent,
+        due=None,
+        scheduler=None
+    ) -> list[dict]:
+        """
+        Valid signals for every (symbol, interval)
+        Each symbol is fetched once; higher intervals are resampled
+        `due` (symbol → intervals) limits the pairs analyzed; each
+        analyzed pair is rescheduled on `scheduler`
+        """
+
+        valid_signals = []
+        bars = max(htf_trend.required_bars(i, ANALYSIS_BARS) for i in intervals)
+
+        for symbol in symbols:
+            wanted = intervals if due is None else due.get(symbol)
+
+            if not wanted:
+                continue
+
+            # A failed fetch leaves the pairs unscheduled: register()
+            # makes them due again on the next scan
+            try:
+                frames = data_router.fetch_timeframes(symbol, wanted, bars)
+            except Exception as e:
+                print(f"[SCAN ERROR] {symbol}: {e}")
+                continue
+
+            for interval in wanted:
+                result = None
+
+                try:
+                    result = analyze_market(
+                        symbol=symbol,
+                        interval=interval,
+                        account_balance=account_balance,
+                        risk_percent=risk_percent,
+                        lot_size=None,
+                        min_lot=0.001,
+                        max_lot=100,
+                        history=frames[interval]
+                    )
+
+                    if SignalValidator.is_valid(result):
+                        valid_signals.append(cls.to_signal(result))
+
+                except Exception as e:
+                    print(f"[SCAN ERROR] {symbol} {interval}: {e}")
+
+                if scheduler is not None:
+                    scheduler.schedule_result(symbol, interval, result)
+
+        return valid_signals
+
+    @staticmethod
+    def to_signal(result: dict) -> dict:
+        """
+        analyze_market result → dispatcher payload
+        """
+
+        return {
+            **result,
+            "entry_price": result["entry"],
+            "signal_validity": get_signal_validity(result["interval"])
+        }
+
+    @classmethod
+    def dispatch_ranked(
+        cls,
+        valid_signals: list[dict],
+        account_balance: float | None = None
+    ):
+
         if not valid_signals:
             print("No valid signals found")
             return
 
-        ranked = SignalRanker.rank(valid_signals)
+        # Signals already sent and still valid are not sent again
+        fresh = signal_store.filter_new(valid_signals)
+
+        if not fresh:
+            print(f"No new signals ({len(valid_signals)} already sent)")
+            return
+
+        ranked = SignalRanker.rank(fresh)
+
+        # Portfolio limits: drop / downsize signals that stack the same
+        # currency or correlated risk (checked in rank order)
+        if account_balance:
+            ranked = portfolio_risk.review(ranked, account_balance)
+
+        # Per-user sizing & delivery from the users table when enabled
+        fanout = SignalFanout.shared()
+
+        # Orders for an MT5 EA when an export target is configured
+        exporter = MT5ExportQueue.shared()
+        writer = HistoryWriter.shared()
+
+        for signal in ranked[:cls.TOP_N]:
+            if fanout is not None:
+                fanout.fan_out(signal)
+            else:
+                SignalDispatcher.dispatch(signal)
+
+            if exporter is not None and signal.get("sizing"):
+                exporter.submit(signal)
+
+            signal_store.record(signal)
+
+            if writer is not None:
+                writer.record("signal", signal, block=True)
 
-        # Send only top 3 strongest signals
-        for signal in ranked[:3]:
-            SignalDispatcher.dispatch(signal)
+        signal_store.save()
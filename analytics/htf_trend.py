@@ -0,0 +1,175 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from analytics.trend_engine import TrendEngine
+from data.resampler import (
+    IncrementalResampler,
+    bucket_start_ms,
+    interval_ms,
+    open_times_ms,
+    resample_ohlcv
+)
+
+
+# Trading interval → confirmation (higher) timeframe
+HTF_MAP = {
+    "1m": "15m",
+    "5m": "1h",
+    "15m": "4h",
+    "30m": "4h",
+    "1h": "4h",
+    "4h": "1d",
+}
+
+
+class HigherTimeframeTrend:
+    """
+    Higher-Timeframe Trend Service
+    Purpose:
+    - Confirm trading-interval signals with the HTF bias
+    - HTF bars are resampled from the trading interval (single fetch)
+    - Each bar only sees HTF bars that had closed by its own close
+    """
+
+    def __init__(self, trend_engine: TrendEngine | None = None):
+        self.trend_engine = trend_engine or TrendEngine()
+        self._cache = {}
+
+    @staticmethod
+    def htf_for(interval: str) -> str | None:
+        return HTF_MAP.get(interval)
+
+    def required_bars(self, interval: str, bars: int = 500) -> int:
+        """
+        Trading-interval bars needed to warm up the HTF moving average
+        """
+
+        htf = self.htf_for(interval)
+
+        if htf is None:
+            return bars
+
+        ratio = interval_ms(htf) // interval_ms(interval)
+
+        return max(bars, (self.trend_engine.MA_PERIOD + 2) * ratio)
+
+    # ==============================
+    # VECTORIZED (BACKTESTS)
+    # ==============================
+
+    def trend_series(self, df: pd.DataFrame, interval: str) -> pd.Series:
+        """
+        HTF trend aligned to every bar of `df`
+        """
+
+        htf = self.htf_for(interval)
+
+        if htf is None:
+            return self.trend_engine.classify_trend_series(df)
+
+        htf_df = resample_ohlcv(df, htf)
+        htf_trend = self.trend_engine.classify_trend_series(htf_df).to_numpy()
+
+        htf_close = htf_df["timestamp"].to_numpy() + interval_ms(htf)
+        bar_close = open_times_ms(df) + interval_ms(interval)
+
+        # Latest HTF bar closed at or before each bar's close
+        idx = np.searchsorted(htf_close, bar_close, side="right") - 1
+
+        trend = np.where(
+            idx >= 0,
+            htf_trend[np.clip(idx, 0, None)],
+            "Ranging"
+        )
+
+        return pd.Series(trend, index=df.index)
+
+    # ==============================
+    # LIVE (CACHED PER HTF CLOSE)
+    # ==============================
+
+    def trend_for(self, symbol: str, interval: str, df: pd.DataFrame) -> str:
+        """
+        HTF trend as of the last bar of `df`
+        Recomputed only when a new HTF bar has closed
+        """
+
+        htf = self.htf_for(interval) or interval
+
+        last_close = int(open_times_ms(df)[-1]) + interval_ms(interval)
+        last_htf_close = int(bucket_start_ms(last_close, htf))
+
+        key = (symbol.upper(), interval)
+        cached = self._cache.get(key)
+
+        if cached and cached[0] == last_htf_close:
+            return cached[1]
+
+        trend = str(self.trend_series(df, interval).iloc[-1])
+        self._cache[key] = (last_htf_close, trend)
+
+        return trend
+
+    def live_state(self, interval: str) -> "LiveTrendState":
+        return LiveTrendState(interval, self.trend_engine)
+
+
+class LiveTrendState:
+    """
+    Incremental HTF trend (one trading-interval bar at a time)
+    update(bar_i) == trend_series(df, interval).iloc[i]
+    """
+
+    def __init__(self, interval: str, trend_engine: TrendEngine | None = None):
+        self.trend_engine = trend_engine or TrendEngine()
+
+        self.interval = interval
+        self.htf = HTF_MAP.get(interval)
+
+        self._resampler = IncrementalResampler(self.htf) if self.htf else None
+        self._closes = deque(maxlen=self.trend_engine.MA_PERIOD)
+        self._last_bucket = None
+
+        self.trend = "Ranging"
+
+    def _push(self, bucket, close: float):
+        if bucket == self._last_bucket:
+            return
+
+        self._last_bucket = bucket
+        self._closes.append(close)
+
+        if len(self._closes) < self.trend_engine.MA_PERIOD:
+            self.trend = "Ranging"
+            return
+
+        ma = sum(self._closes) / len(self._closes)
+
+        if close > ma:
+            self.trend = "Bullish"
+        elif close < ma:
+            self.trend = "Bearish"
+        else:
+            self.trend = "Ranging"
+
+    def update(self, open_time: int, open: float, high: float, low: float, close: float) -> str:
+        if self._resampler is None:
+            self._push(open_time, close)
+            return self.trend
+
+        closed = self._resampler.update(open_time, open, high, low, close)
+
+        # HTF bar left incomplete (missing base bars) closes on rollover
+        if closed is not None:
+            self._push(closed["timestamp"], closed["close"])
+
+        current = self._resampler.current
+        bar_close = open_time + interval_ms(self.interval)
+
+        # This bar completes its HTF bucket → that HTF bar counts now
+        if bar_close >= current["timestamp"] + interval_ms(self.htf):
+            self._push(current["timestamp"], current["close"])
+
+        return self.trend
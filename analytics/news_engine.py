@@ -1,23 +1,36 @@
 
+import os
 import requests
 from datetime import datetime, timezone, timedelta
 import xml.etree.ElementTree as ET
 
+from data.cache_backend import CacheBackend
+
 
 class NewsEngine:
 
     FEED_URL = "https://nfs.faireconomy.media/ff_calendar_thisweek.xml"
 
+    # Weekly calendar: refreshed every 15 minutes, once for all nodes
+    CACHE_KEY = "news:high_impact"
+    CACHE_TTL = float(os.getenv("CACHE_NEWS_TTL", "900"))
+
+
+    @staticmethod
+    def download_events():
+
+        r = requests.get(NewsEngine.FEED_URL, timeout=10)
+        r.raise_for_status()
+
+        root = ET.fromstring(r.text)
+        return root.findall("event")
+
 
     @staticmethod
     def fetch_events():
 
         try:
-            r = requests.get(NewsEngine.FEED_URL, timeout=10)
-            r.raise_for_status()
-
-            root = ET.fromstring(r.text)
-            return root.findall("event")
+            return NewsEngine.download_events()
 
         except Exception:
             return []
@@ -26,7 +39,28 @@ class NewsEngine:
     @staticmethod
     def get_high_impact_events():
 
-        events = NewsEngine.fetch_events()
+        def compute():
+            # A failed download is not cached (retried on next call)
+            try:
+                events = NewsEngine.download_events()
+            except Exception:
+                return None
+
+            return [dt.isoformat() for dt in NewsEngine.parse_high_impact(events)]
+
+        if NewsEngine.CACHE_TTL <= 0:
+            return NewsEngine.parse_high_impact(NewsEngine.fetch_events())
+
+        cached = CacheBackend.shared().get_or_set(
+            NewsEngine.CACHE_KEY, compute, ttl=NewsEngine.CACHE_TTL
+        )
+
+        return [datetime.fromisoformat(t) for t in cached or []]
+
+
+    @staticmethod
+    def parse_high_impact(events):
+
         high = []
 
         for e in events:
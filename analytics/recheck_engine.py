@@ -1,5 +1,8 @@
 from enum import Enum
 
+import numpy as np
+import pandas as pd
+
 
 class MarketState(str, Enum):
     TREND_MISMATCH = "TREND_MISMATCH"
@@ -112,6 +115,56 @@ class RecheckDecisionEngine:
 
         return MarketState.RANGING
 
+    @staticmethod
+    def determine_states(
+        signal: pd.Series,
+        trend: pd.Series,
+        rsi: pd.Series,
+        volatility: pd.Series,
+        ema_slope: pd.Series,
+        atr_threshold: float = 0.001
+    ) -> pd.Series:
+        """
+        Vectorized determine_state for a whole history
+        Same rule order: the first matching rule wins per bar
+        """
+
+        signal = signal.to_numpy()
+        trend = trend.to_numpy()
+        rsi = rsi.to_numpy(dtype=float)
+        volatility = volatility.to_numpy(dtype=float)
+        slope = np.abs(ema_slope.to_numpy(dtype=float))
+
+        missing = np.isnan(volatility) | np.isnan(slope) | np.isnan(rsi)
+
+        mismatch = (
+            ((signal == "BUY") & (trend != "Bullish")) |
+            ((signal == "SELL") & (trend != "Bearish"))
+        )
+
+        with np.errstate(invalid="ignore"):
+            states = np.select(
+                [
+                    missing,
+                    (volatility > atr_threshold * 3) & (slope < atr_threshold),
+                    mismatch,
+                    volatility < atr_threshold,
+                    (rsi >= 70) | (rsi <= 30),
+                    (slope > atr_threshold) & (signal == "NONE")
+                ],
+                [
+                    MarketState.RANGING.value,
+                    MarketState.CHOPPY_HIGH_VOL.value,
+                    MarketState.TREND_MISMATCH.value,
+                    MarketState.LOW_VOLATILITY.value,
+                    MarketState.OVEREXTENDED.value,
+                    MarketState.PULLBACK_PENDING.value
+                ],
+                default=MarketState.RANGING.value
+            )
+
+        return pd.Series(states, index=ema_slope.index).map(MarketState)
+
     # ==================================================
     # RESPONSE BUILDER
     # ==================================================
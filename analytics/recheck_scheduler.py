@@ -0,0 +1,212 @@
+import heapq
+import json
+import os
+import threading
+import time
+
+from analytics.recheck_engine import TIMEFRAME_MINUTES
+
+
+class RecheckScheduler:
+    """
+    Adaptive Recheck Scheduler
+    Purpose:
+    - Re-analyze a symbol only when its recheck window elapses
+      (tradeable / unknown states: at the next candle close)
+    - Priority queue of (next_check_time, symbol, interval)
+    - Persisted so a restart keeps the schedule
+    """
+
+    DEFAULT_PATH = os.getenv("RECHECK_QUEUE_PATH", "state/recheck_queue.json")
+
+    def __init__(self, path: str | None = DEFAULT_PATH):
+        self.path = path
+
+        self._heap = []
+        self._due_at = {}
+        self._lock = threading.Lock()
+
+        self.load()
+
+    # ==============================
+    # TIME UTILS
+    # ==============================
+
+    @staticmethod
+    def interval_seconds(interval: str) -> int:
+        return TIMEFRAME_MINUTES.get(interval, 60) * 60
+
+    @classmethod
+    def next_candle_close(cls, now: float, interval: str) -> float:
+        period = cls.interval_seconds(interval)
+        return (now // period + 1) * period
+
+    # ==============================
+    # QUEUE
+    # ==============================
+
+    def schedule(self, symbol: str, interval: str, at: float):
+        key = (symbol, interval)
+
+        with self._lock:
+            self._due_at[key] = at
+            heapq.heappush(self._heap, (at, symbol, interval))
+
+    def schedule_result(
+        self,
+        symbol: str,
+        interval: str,
+        result: dict | None,
+        now: float | None = None
+    ) -> float:
+        """
+        Next check from an analyze_market result
+        - recheck present → close of the Nth candle from now
+        - otherwise → next candle close
+        """
+
+        now = time.time() if now is None else now
+
+        recheck = (result or {}).get("recheck") or {}
+        candles = max(int(recheck.get("recheck_after_candles", 1)), 1)
+
+        at = (
+            self.next_candle_close(now, interval)
+            + (candles - 1) * self.interval_seconds(interval)
+        )
+
+        self.schedule(symbol, interval, at)
+        return at
+
+    def register(self, symbols: list[str], interval: str, now: float | None = None):
+        """
+        Make never-seen symbols due immediately
+        """
+
+        now = time.time() if now is None else now
+
+        with self._lock:
+            missing = [s for s in symbols if (s, interval) not in self._due_at]
+
+        for symbol in missing:
+            self.schedule(symbol, interval, now)
+
+    def due_intervals(
+        self,
+        symbols: list[str],
+        intervals: list[str],
+        now: float | None = None
+    ) -> dict:
+        """
+        symbol → intervals due for one multi-interval scan
+        Never-seen pairs are due; returned pairs are removed until
+        rescheduled (pairs of symbols left out of `symbols` are dropped)
+        """
+
+        now = time.time() if now is None else now
+        wanted = set(symbols)
+        due = {}
+
+        for interval in intervals:
+            self.register(symbols, interval, now)
+
+            for symbol in self.pop_due(now, interval):
+                if symbol in wanted:
+                    due.setdefault(symbol, []).append(interval)
+
+        return due
+
+    def pop_due(
+        self,
+        now: float | None = None,
+        interval: str | None = None
+    ) -> list[str]:
+        """
+        Remove and return symbols whose check time has arrived
+        """
+
+        now = time.time() if now is None else now
+
+        due = []
+        other = []
+
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                at, symbol, iv = heapq.heappop(self._heap)
+                key = (symbol, iv)
+
+                # Stale heap entry (rescheduled since)
+                if self._due_at.get(key) != at:
+                    continue
+
+                if interval is not None and iv != interval:
+                    other.append((at, symbol, iv))
+                    continue
+
+                del self._due_at[key]
+                due.append(symbol)
+
+            for entry in other:
+                heapq.heappush(self._heap, entry)
+
+        return due
+
+    def next_due_time(self) -> float | None:
+        with self._lock:
+            while self._heap:
+                at, symbol, interval = self._heap[0]
+
+                if self._due_at.get((symbol, interval)) == at:
+                    return at
+
+                heapq.heappop(self._heap)
+
+        return None
+
+    def upcoming(self, limit: int = 50) -> list[dict]:
+        with self._lock:
+            entries = sorted(
+                (at, symbol, interval)
+                for (symbol, interval), at in self._due_at.items()
+            )[:limit]
+
+        return [
+            {"symbol": s, "interval": i, "next_check": at}
+            for at, s, i in entries
+        ]
+
+    # ==============================
+    # PERSISTENCE
+    # ==============================
+
+    def save(self):
+        if not self.path:
+            return
+
+        with self._lock:
+            entries = [
+                [at, symbol, interval]
+                for (symbol, interval), at in self._due_at.items()
+            ]
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[RECHECK QUEUE] ignoring unreadable {self.path}: {e}")
+            return
+
+        for at, symbol, interval in entries:
+            self.schedule(symbol, interval, float(at))
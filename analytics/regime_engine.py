@@ -0,0 +1,99 @@
+import pandas as pd
+
+from analytics.htf_trend import HigherTimeframeTrend
+from analytics.recheck_engine import RecheckDecisionEngine
+from strategy.ema_rsi_strategy import EMARsiStrategy
+
+
+class RegimeEngine:
+    """
+    Full-History Regime Engine
+    Purpose:
+    - Per-bar stop-hunt flags (rolling detect_liquidity_trap)
+    - Per-bar MarketState timeline (vectorized determine_state)
+    - Feeds backtests and regime analytics
+    """
+
+    LIQUIDITY_LOOKBACK = 12
+    VOLATILITY_WINDOW = 100
+
+    def __init__(self, strategy=None, trend_service=None):
+        self.strategy = strategy or EMARsiStrategy()
+        self.trend_service = trend_service or HigherTimeframeTrend()
+
+    # ==============================
+    # LIQUIDITY TRAPS
+    # ==============================
+
+    @classmethod
+    def liquidity_trap_series(
+        cls,
+        df: pd.DataFrame,
+        lookback: int | None = None
+    ) -> pd.DataFrame:
+        """
+        Stop-hunt flags for every bar
+        Bar i matches detect_liquidity_trap(df.iloc[:i + 1]):
+        sliding max/min of the prior (lookback - 1) bars
+        """
+
+        window = (lookback or cls.LIQUIDITY_LOOKBACK) - 1
+
+        prior_high = df["high"].shift(1).rolling(window, min_periods=1).max()
+        prior_low = df["low"].shift(1).rolling(window, min_periods=1).min()
+
+        close_inside = (prior_low < df["close"]) & (df["close"] < prior_high)
+
+        return pd.DataFrame({
+            "buy_stop_hunt": (df["high"] > prior_high) & close_inside,
+            "sell_stop_hunt": (df["low"] < prior_low) & close_inside
+        }, index=df.index)
+
+    # ==============================
+    # MARKET STATE TIMELINE
+    # ==============================
+
+    def state_timeline(
+        self,
+        df: pd.DataFrame,
+        interval: str,
+        atr_threshold: float = 0.001
+    ) -> pd.DataFrame:
+        """
+        Indicator inputs and MarketState for every bar
+        - ema_slope: relative change of the fast EMA per bar
+        - volatility: rolling calculate_volatility over VOLATILITY_WINDOW
+        """
+
+        ind = self.strategy.indicators(df)
+
+        timeline = pd.DataFrame({
+            "signal": self.strategy.signal_series(df),
+            "trend": self.trend_service.trend_series(df, interval),
+            "rsi": ind["rsi"],
+            "ema_slope": ind["ema_fast"].pct_change(),
+            "volatility": (
+                df["close"].pct_change()
+                .rolling(self.VOLATILITY_WINDOW).std() * 100
+            ).clip(upper=1.0).round(3)
+        }, index=df.index)
+
+        timeline["market_state"] = RecheckDecisionEngine.determine_states(
+            signal=timeline["signal"],
+            trend=timeline["trend"],
+            rsi=timeline["rsi"],
+            volatility=timeline["volatility"],
+            ema_slope=timeline["ema_slope"],
+            atr_threshold=atr_threshold
+        )
+
+        return timeline
+
+    @staticmethod
+    def state_summary(timeline: pd.DataFrame) -> dict:
+        """
+        Share of bars spent in each MarketState
+        """
+
+        shares = timeline["market_state"].map(lambda s: s.value)
+        return shares.value_counts(normalize=True).round(4).to_dict()
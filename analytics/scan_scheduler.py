@@ -0,0 +1,160 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from analytics.recheck_engine import TIMEFRAME_MINUTES
+from analytics.session_engine import MarketSessionEngine
+
+
+SCAN_INTERVALS = ["5m", "15m", "1h", "4h", "1d"]
+
+
+class CandleCloseScanScheduler:
+    """
+    Candle-Close Scan Scheduler
+    Purpose:
+    - Fire scans a few seconds after each candle close
+    - Merge intervals closing on the same boundary into one scan
+      (shared fetch + resample per symbol)
+    - Skip while the market is closed, never overlap runs
+    - With a RecheckScheduler, each scan only analyzes the pairs
+      whose recheck window has elapsed
+    """
+
+    def __init__(
+        self,
+        account_balance: float,
+        risk_percent: float,
+        intervals: list[str] | None = None,
+        delay_seconds: int = 5,
+        scan_fn=None,
+        recheck=None
+    ):
+        self.account_balance = account_balance
+        self.risk_percent = risk_percent
+        self.intervals = intervals or SCAN_INTERVALS
+        self.delay_seconds = delay_seconds
+        self.step_minutes = min(TIMEFRAME_MINUTES[i] for i in self.intervals)
+
+        if scan_fn is None:
+            from analytics.auto_signal_scanner import AutoSignalScanner
+            scan_fn = AutoSignalScanner.scan_intervals
+
+        self.scan_fn = scan_fn
+        self.recheck = recheck
+
+        self._running = threading.Lock()
+        self.scheduler = BackgroundScheduler(timezone=timezone.utc)
+
+    # ==============================
+    # BOUNDARIES
+    # ==============================
+
+    def closing_intervals(self, boundary: datetime) -> list[str]:
+        """
+        Intervals whose candle closes exactly at `boundary` (UTC)
+        """
+
+        minute_of_day = boundary.hour * 60 + boundary.minute
+
+        return [
+            interval for interval in self.intervals
+            if minute_of_day % TIMEFRAME_MINUTES[interval] == 0
+        ]
+
+    def boundary_for(self, scheduled_run_time: datetime) -> datetime:
+        """
+        Candle close a fire time belongs to: the fire time minus the
+        delay, floored to the scheduler step (late or jittered runs
+        still map to the boundary they were scheduled for)
+        """
+
+        closed = scheduled_run_time.astimezone(timezone.utc) - timedelta(seconds=self.delay_seconds)
+        step = self.step_minutes * 60
+        midnight = closed.replace(hour=0, minute=0, second=0, microsecond=0)
+        elapsed = (closed - midnight).total_seconds()
+
+        return midnight + timedelta(seconds=elapsed // step * step)
+
+    @staticmethod
+    def market_closed() -> bool:
+        status = MarketSessionEngine.market_status()
+        return status["weekend"] or not status["active_sessions"]
+
+    # ==============================
+    # JOB
+    # ==============================
+
+    def run_boundary(self, scheduled_run_time: datetime | None = None) -> list[str]:
+        """
+        Scan every interval that closed at the boundary of this fire
+        Returns the intervals scanned (empty when skipped)
+        """
+
+        scheduled_run_time = scheduled_run_time or MarketSessionEngine.utc_now()
+        boundary = self.boundary_for(scheduled_run_time)
+
+        intervals = self.closing_intervals(boundary)
+
+        if not intervals:
+            return []
+
+        if self.market_closed():
+            print(f"[SCAN SCHEDULER] market closed, skipping {intervals}")
+            return []
+
+        if not self._running.acquire(blocking=False):
+            print(f"[SCAN SCHEDULER] previous scan still running, skipping {intervals}")
+            return []
+
+        adaptive = {} if self.recheck is None else {"scheduler": self.recheck}
+
+        try:
+            self.scan_fn(
+                intervals=intervals,
+                account_balance=self.account_balance,
+                risk_percent=self.risk_percent,
+                **adaptive
+            )
+        except Exception as e:
+            print(f"[SCAN SCHEDULER ERROR] {intervals}: {e}")
+        finally:
+            self._running.release()
+
+        return intervals
+
+    # ==============================
+    # LIFECYCLE
+    # ==============================
+
+    def start(self):
+        step = self.step_minutes
+
+        if step < 60:
+            fields = {"minute": f"*/{step}"}
+        elif step < 1440:
+            fields = {"minute": 0, "hour": f"*/{step // 60}"}
+        else:
+            fields = {"minute": 0, "hour": 0}
+
+        self.scheduler.add_job(
+            self.run_boundary,
+            CronTrigger(
+                second=self.delay_seconds,
+                timezone=timezone.utc,
+                **fields
+            ),
+            id="candle_close_scan",
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=60,
+            replace_existing=True
+        )
+
+        self.scheduler.start()
+
+    def shutdown(self):
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
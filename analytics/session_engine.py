@@ -38,9 +38,7 @@ class MarketSessionEngine:
 
 
     @staticmethod
-    def get_active_sessions():
-
-        hour = MarketSessionEngine.utc_now().hour
+    def sessions_at(hour: int) -> list:
 
         active = []
 
@@ -51,6 +49,12 @@ class MarketSessionEngine:
         return active
 
 
+    @staticmethod
+    def get_active_sessions():
+
+        return MarketSessionEngine.sessions_at(MarketSessionEngine.utc_now().hour)
+
+
     @staticmethod
     def is_killzone() -> bool:
         """
@@ -0,0 +1,294 @@
+import bisect
+import hashlib
+import itertools
+import multiprocessing as mp
+import queue
+import time
+
+from config import load_config
+from risk.portfolio_risk import portfolio_risk
+
+
+# ==============================
+# CONSISTENT HASHING
+# ==============================
+
+class ConsistentHashRing:
+    """
+    Consistent hash ring with virtual nodes
+    Adding / removing a worker only moves ~1/N of the symbols
+    """
+
+    def __init__(self, nodes=(), virtual_nodes: int = 128):
+        self.virtual_nodes = virtual_nodes
+
+        self._keys = []
+        self._owners = {}
+
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        # Stable across processes (unlike hash())
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    @property
+    def nodes(self) -> set:
+        return set(self._owners.values())
+
+    def add_node(self, node):
+        for replica in range(self.virtual_nodes):
+            point = self._hash(f"{node}#{replica}")
+            self._owners[point] = node
+            bisect.insort(self._keys, point)
+
+    def remove_node(self, node):
+        for replica in range(self.virtual_nodes):
+            point = self._hash(f"{node}#{replica}")
+
+            if self._owners.pop(point, None) is not None:
+                self._keys.pop(bisect.bisect_left(self._keys, point))
+
+    def node_for(self, key: str):
+        if not self._keys:
+            raise ValueError("Hash ring has no nodes")
+
+        idx = bisect.bisect(self._keys, self._hash(key)) % len(self._keys)
+        return self._owners[self._keys[idx]]
+
+    def partition(self, keys) -> dict:
+        shards = {node: [] for node in self.nodes}
+
+        for key in keys:
+            shards[self.node_for(key)].append(key)
+
+        return shards
+
+
+# ==============================
+# WORKER PROCESS
+# ==============================
+
+def _default_collect(symbols, intervals, account_balance, risk_percent, due=None, scheduler=None):
+    from analytics.auto_signal_scanner import AutoSignalScanner
+
+    return AutoSignalScanner.collect_intervals(
+        symbols, intervals, account_balance, risk_percent, due, scheduler
+    )
+
+
+class _RecheckLog:
+    """
+    Stands in for the coordinator's RecheckScheduler inside a worker:
+    records each analyzed pair's recheck for the coordinator to apply
+    """
+
+    def __init__(self):
+        self.entries = []
+
+    def schedule_result(self, symbol, interval, result):
+        self.entries.append((symbol, interval, {"recheck": (result or {}).get("recheck")}))
+
+
+def _worker_loop(worker_id, tasks, results, collect_fn):
+    """
+    Long-lived worker: keeps its own router, caches and indicator
+    state (module globals of this process) for the shard it owns
+    """
+
+    collect_fn = collect_fn or _default_collect
+
+    while True:
+        task = tasks.get()
+
+        if task is None:
+            break
+
+        job_id, symbols, intervals, account_balance, risk_percent, due = task
+        rechecks = _RecheckLog()
+
+        try:
+            if due is None:
+                signals = collect_fn(symbols, intervals, account_balance, risk_percent)
+            else:
+                signals = collect_fn(
+                    symbols, intervals, account_balance, risk_percent,
+                    due=due, scheduler=rechecks
+                )
+            error = None
+        except Exception as e:
+            signals, error = [], repr(e)
+
+        # Bars seen by this shard feed the coordinator's correlations
+        results.put((
+            job_id, worker_id, signals, error,
+            portfolio_risk.drain_bars(), rechecks.entries
+        ))
+
+
+# ==============================
+# COORDINATOR
+# ==============================
+
+class ShardedScanCoordinator:
+    """
+    Sharded Universe Scanner
+    Purpose:
+    - Partition the universe across N worker processes (consistent hash)
+    - Same symbol → same worker, so per-symbol caches stay warm
+    - Gather shard results and rank globally
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        symbols: list[str] | None = None,
+        virtual_nodes: int | None = None,
+        collect_fn=None
+    ):
+        settings = load_config("settings").get("scanner") or {}
+
+        if symbols is None:
+            from analytics.auto_signal_scanner import load_universe
+            symbols = load_universe()
+
+        self.symbols = symbols
+        self.worker_count = workers or settings.get("workers", 1)
+        self.collect_fn = collect_fn
+
+        self.ring = ConsistentHashRing(
+            virtual_nodes=virtual_nodes or settings.get("virtual_nodes", 128)
+        )
+
+        self._ctx = mp.get_context("spawn")
+        self._results = self._ctx.Queue()
+        self._workers = {}
+        self._job_ids = itertools.count()
+        self._worker_ids = itertools.count()
+
+    # ==============================
+    # LIFECYCLE
+    # ==============================
+
+    def start(self):
+        for _ in range(self.worker_count):
+            self.add_worker()
+
+    def add_worker(self) -> str:
+        worker_id = f"worker-{next(self._worker_ids)}"
+        tasks = self._ctx.Queue()
+
+        process = self._ctx.Process(
+            target=_worker_loop,
+            args=(worker_id, tasks, self._results, self.collect_fn),
+            name=f"scan-{worker_id}",
+            daemon=True
+        )
+        process.start()
+
+        self._workers[worker_id] = (process, tasks)
+        self.ring.add_node(worker_id)
+
+        return worker_id
+
+    def remove_worker(self, worker_id: str):
+        process, tasks = self._workers.pop(worker_id)
+        self.ring.remove_node(worker_id)
+
+        tasks.put(None)
+        process.join(timeout=5)
+
+    def stop(self):
+        for worker_id in list(self._workers):
+            self.remove_worker(worker_id)
+
+    def shards(self) -> dict:
+        return self.ring.partition(self.symbols)
+
+    # ==============================
+    # SCAN
+    # ==============================
+
+    def collect(
+        self,
+        intervals: list[str],
+        account_balance: float,
+        risk_percent: float,
+        timeout: float = 600,
+        scheduler=None
+    ) -> list[dict]:
+        """
+        Fan the universe out to the workers and gather valid signals
+        With a RecheckScheduler only due pairs are sent, and the
+        workers' recheck results are scheduled here
+        """
+
+        job_id = next(self._job_ids)
+        pending = set()
+        due = None
+
+        if scheduler is not None:
+            due = scheduler.due_intervals(self.symbols, intervals)
+
+        for worker_id, symbols in self.shards().items():
+            shard_due = None
+
+            if due is not None:
+                symbols = [s for s in symbols if s in due]
+                shard_due = {s: due[s] for s in symbols}
+
+            if not symbols:
+                continue
+
+            _, tasks = self._workers[worker_id]
+            tasks.put((job_id, symbols, intervals, account_balance, risk_percent, shard_due))
+            pending.add(worker_id)
+
+        signals = []
+        deadline = time.monotonic() + timeout
+
+        while pending:
+            try:
+                result_job, worker_id, shard_signals, error, bars, rechecks = self._results.get(
+                    timeout=max(deadline - time.monotonic(), 0.001)
+                )
+            except queue.Empty:
+                print(f"[SHARDED SCAN] timed out waiting for {sorted(pending)}")
+                break
+
+            portfolio_risk.record_bars(bars)
+
+            # Late results still reschedule the pairs they analyzed
+            if scheduler is not None:
+                for symbol, interval, result in rechecks:
+                    scheduler.schedule_result(symbol, interval, result)
+
+            # Late result from a previous (timed out) job
+            if result_job != job_id:
+                continue
+
+            pending.discard(worker_id)
+
+            if error:
+                print(f"[SHARDED SCAN ERROR] {worker_id}: {error}")
+
+            signals.extend(shard_signals)
+
+        return signals
+
+    def scan_intervals(self, intervals, account_balance, risk_percent, scheduler=None):
+        """
+        Drop-in for AutoSignalScanner.scan_intervals (global ranking)
+        """
+
+        from analytics.auto_signal_scanner import AutoSignalScanner
+
+        valid_signals = self.collect(
+            intervals, account_balance, risk_percent, scheduler=scheduler
+        )
+
+        if scheduler is not None:
+            scheduler.save()
+
+        AutoSignalScanner.dispatch_ranked(valid_signals, account_balance)
@@ -1,13 +1,58 @@
+import os
+import threading
+
 from notifications.signal_cli_sender import SignalCLISender
 from notifications.emailjs_sender import EmailJSSender
+from notifications.dispatch_queue import NotificationQueue
 
 class SignalDispatcher:
 
     MODE = "signal"  # "signal" or "email"
 
+    CHANNELS = {
+        "signal": SignalCLISender,
+        "email": EmailJSSender,
+    }
+
+    _queue = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def queue(cls) -> NotificationQueue:
+        """
+        Shared background delivery queue (started on first use)
+        """
+
+        with cls._lock:
+            if cls._queue is None:
+                cls._queue = NotificationQueue(
+                    channels=cls.CHANNELS,
+                    workers=int(os.getenv("NOTIFY_WORKERS", "2")),
+                    max_pending=int(os.getenv("NOTIFY_MAX_PENDING", "250000")),
+                    dead_letter_path=os.getenv(
+                        "NOTIFY_DEAD_LETTER_PATH", "state/dead_letters.jsonl"
+                    )
+                )
+                cls._queue.start()
+
+            return cls._queue
+
     @classmethod
     def dispatch(cls, signal: dict):
-        if cls.MODE == "signal":
-            SignalCLISender.send(signal)
-        elif cls.MODE == "email":
-            EmailJSSender.send(signal)
+        """
+        Enqueue `signal` for every recipient of the active channel
+        Returns immediately; delivery happens in the background
+        """
+
+        sender = cls.CHANNELS[cls.MODE]
+
+        for recipient in sender.RECIPIENTS:
+            cls.queue().enqueue(cls.MODE, recipient, signal)
+
+    @classmethod
+    def shutdown(cls, timeout: float = 10.0):
+        with cls._lock:
+            q, cls._queue = cls._queue, None
+
+        if q is not None:
+            q.stop(timeout)
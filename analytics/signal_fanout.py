@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from analytics.signal_dispatcher import SignalDispatcher
+from analytics.signal_ranker import SignalRanker
+from database.user_cache import UserSettingsCache
+from risk.position_sizer import PositionSizer
+
+
+class SignalFanout:
+    """
+    Per-User Signal Fan-Out
+    Purpose:
+    - Recipients (user + active settings) from the settings cache:
+      column arrays reloaded only after a user change
+    - Size the trade for every user at once (NumPy, no per-user analysis)
+    - Per-user confidence threshold, then one personalized message
+      per user
+    """
+
+    CHUNK_SIZE = 10_000
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, session_factory=None, channel: str = "signal", users=None):
+        self.users = users or UserSettingsCache(session_factory)
+        self.channel = channel
+
+    @classmethod
+    def shared(cls):
+        """
+        Fan-out used by the scanner when USER_FANOUT=1, else None
+        """
+
+        if os.getenv("USER_FANOUT") != "1":
+            return None
+
+        with cls._lock:
+            if cls._shared is None:
+                cls._shared = cls(users=UserSettingsCache.shared())
+
+            return cls._shared
+
+    # ==============================
+    # FAN-OUT
+    # ==============================
+
+    @classmethod
+    def chunks(cls, recipients: dict):
+        """
+        CHUNK_SIZE slices of the recipient columns
+        """
+
+        for start in range(0, len(recipients["id"]), cls.CHUNK_SIZE):
+            yield {
+                name: values[start:start + cls.CHUNK_SIZE]
+                for name, values in recipients.items()
+            }
+
+    def fan_out(self, signal: dict) -> dict:
+        """
+        Personalize `signal` for every eligible user and enqueue it
+        """
+
+        started = time.perf_counter()
+        high_profit = SignalRanker.is_high_profit(signal)
+
+        # Portfolio downsizing applies to every user's risk alike
+        scale = (signal.get("portfolio_adjustment") or {}).get("scale", 1.0)
+
+        queue = SignalDispatcher.queue()
+        stats = {
+            "recipients": 0,
+            "enqueued": 0,
+            "skipped_lot_too_small": 0,
+            "skipped_low_confidence": 0
+        }
+
+        confidence = signal.get("confidence_percent")
+
+        # Cached recipient columns: the DB is read once per user change
+        recipients = self.users.recipients(high_profit)
+
+        for chunk in self.chunks(recipients):
+            sizing = PositionSizer.calculate_positions(
+                signal["symbol"],
+                chunk["balance"],
+                chunk["risk_percent"] * scale,
+                signal["entry_price"],
+                signal["stop_loss"]
+            )
+
+            # Same rules as analyze_market: block below min, cap at max
+            eligible = sizing["lots"] >= chunk["min_lot"]
+            lots = np.minimum(sizing["lots"], chunk["max_lot"])
+
+            stats["recipients"] += len(chunk["id"])
+            stats["skipped_lot_too_small"] += int((~eligible).sum())
+
+            # Per-user confidence threshold (users without settings: none)
+            if confidence is not None:
+                below = chunk["confidence_threshold"] > confidence
+                stats["skipped_low_confidence"] += int((below & eligible).sum())
+                eligible &= ~below
+
+            lots_list = lots.tolist()
+            risk_list = sizing["risk_amount"].tolist()
+
+            for i in np.flatnonzero(eligible).tolist():
+                personalized = {
+                    **signal,
+                    "user_id": chunk["id"][i],
+                    "recommended_lot_size": lots_list[i],
+                    "risk_amount": risk_list[i]
+                }
+
+                if queue.enqueue(self.channel, chunk["number"][i], personalized):
+                    stats["enqueued"] += 1
+
+        stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return stats
@@ -16,3 +16,7 @@ class SignalRanker:
             signal.get("confidence_percent", 0) >= 80
             and signal.get("rr_ratio", 0) >= 3
         )
+
+    @staticmethod
+    def rank(signals: list[dict]) -> list[dict]:
+        return sorted(signals, key=SignalRanker.score, reverse=True)
@@ -0,0 +1,222 @@
+import heapq
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from risk.instrument_registry import instrument_registry
+
+
+def expiry_time(signal: dict, now: float) -> float:
+    """
+    Epoch seconds at which `signal` stops being valid
+    (get_signal_validity payload; 3h when missing)
+    """
+
+    validity = signal.get("signal_validity") or {}
+    expires_at = validity.get("expires_at")
+
+    if expires_at:
+        parsed = datetime.fromisoformat(expires_at.rstrip("Z"))
+        return parsed.replace(tzinfo=parsed.tzinfo or timezone.utc).timestamp()
+
+    return now + validity.get("valid_for_minutes", 180) * 60
+
+
+class SignalStateStore:
+    """
+    Sent-Signal State Store
+    Purpose:
+    - Record of every dispatched signal until its validity expires
+    - Keyed by symbol / interval / direction / entry bucket, so an
+      unchanged signal on the next scan is not sent again
+    - Dict for O(1) lookups, expiry min-heap for eviction
+    - Persisted so a restart does not re-send live signals
+    """
+
+    DEFAULT_PATH = os.getenv("SIGNAL_STORE_PATH", "state/sent_signals.json")
+
+    # Entries within this many pips share a bucket
+    BUCKET_PIPS = 10
+
+    def __init__(self, path: str | None = DEFAULT_PATH, bucket_pips: float = BUCKET_PIPS):
+        self.path = path
+        self.bucket_pips = bucket_pips
+
+        self._entries = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+        # Recorded or evicted since the last save
+        self._dirty = False
+
+        self.load()
+
+    # ==============================
+    # KEYS
+    # ==============================
+
+    def _bucket(self, signal: dict) -> tuple[str, float, float, int]:
+        """
+        (key prefix, entry, bucket width, bucket index)
+        """
+
+        symbol = instrument_registry.clean(signal["symbol"])
+        entry = float(signal.get("entry_price", signal.get("entry")))
+
+        width = instrument_registry.spec(symbol).pip_size * self.bucket_pips
+        prefix = f"{symbol}|{signal.get('interval')}|{signal.get('signal')}"
+
+        return prefix, entry, width, round(entry / width)
+
+    def key(self, signal: dict) -> str:
+        prefix, _, _, bucket = self._bucket(signal)
+
+        return f"{prefix}|{bucket}"
+
+    # ==============================
+    # LOOKUPS
+    # ==============================
+
+    def is_sent(self, signal: dict, now: float | None = None) -> bool:
+        """
+        A live record within one bucket width of this entry, looked up
+        in the neighbouring buckets too (entries straddling a bucket
+        edge are still the same trade)
+        """
+
+        now = time.time() if now is None else now
+        prefix, price, width, bucket = self._bucket(signal)
+
+        for b in (bucket, bucket - 1, bucket + 1):
+            entry = self._entries.get(f"{prefix}|{b}")
+
+            if entry is None or entry["expires_at"] <= now:
+                continue
+
+            sent_price = entry.get("entry")
+
+            if b == bucket or (sent_price is not None and abs(float(sent_price) - price) < width):
+                return True
+
+        return False
+
+    def filter_new(self, signals: list[dict], now: float | None = None) -> list[dict]:
+        """
+        Signals not already sent and still live
+        """
+
+        now = time.time() if now is None else now
+
+        self.evict(now)
+
+        return [s for s in signals if not self.is_sent(s, now)]
+
+    def record(self, signal: dict, now: float | None = None):
+        """
+        Mark `signal` as sent until its validity expires
+        """
+
+        now = time.time() if now is None else now
+
+        self._put(
+            self.key(signal),
+            {
+                "expires_at": expiry_time(signal, now),
+                "sent_at": now,
+                "entry": signal.get("entry_price", signal.get("entry"))
+            }
+        )
+
+    def _put(self, key: str, entry: dict):
+        with self._lock:
+            self._entries[key] = entry
+            heapq.heappush(self._heap, (entry["expires_at"], key))
+            self._dirty = True
+
+    def evict(self, now: float | None = None) -> int:
+        """
+        Drop expired entries (heap order: only the expired are touched)
+        """
+
+        now = time.time() if now is None else now
+        evicted = 0
+
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, key = heapq.heappop(self._heap)
+
+                # Stale heap entry (re-recorded since)
+                entry = self._entries.get(key)
+
+                if entry is None or entry["expires_at"] != expires_at:
+                    continue
+
+                del self._entries[key]
+                evicted += 1
+                self._dirty = True
+
+            # Re-recorded keys leave stale heap entries behind
+            if len(self._heap) > 2 * len(self._entries) + 1024:
+                self._heap = [(e["expires_at"], k) for k, e in self._entries.items()]
+                heapq.heapify(self._heap)
+
+        return evicted
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ==============================
+    # PERSISTENCE
+    # ==============================
+
+    def save(self):
+        """
+        Write the live entries (no-op when nothing changed)
+        """
+
+        if not self.path:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+
+            entries = dict(self._entries)
+            self._dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f, default=float)
+
+            os.replace(tmp_path, self.path)
+
+        except OSError:
+            self._dirty = True
+            raise
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[SIGNAL STORE] ignoring unreadable {self.path}: {e}")
+            return
+
+        now = time.time()
+
+        for key, entry in entries.items():
+            if entry["expires_at"] > now:
+                self._put(key, entry)
+
+        self._dirty = False
+
+
+signal_store = SignalStateStore()
@@ -26,3 +26,18 @@ class SignalValidator:
             return False, f"RR too low ({round(rr,2)})"
 
         return True, "VALID"
+
+    @staticmethod
+    def is_valid(result: dict) -> bool:
+        """
+        Scanner gate for analyze_market results
+        (RR taken from the analysis: rounded prices can shave it)
+        """
+
+        if not result.get("trade_allowed"):
+            return False
+
+        if not result.get("stop_loss") or not result.get("take_profit"):
+            return False
+
+        return (result.get("rr_ratio") or 0) >= SignalValidator.MIN_RR
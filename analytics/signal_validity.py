@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+
+
+# ==============================
+# SIGNAL VALIDITY ENGINE
+# ==============================
+def get_signal_validity(interval: str):
+    mapping = {
+        "5m": (5, 25),
+        "15m": (5, 75),
+        "30m": (4, 120),
+        "1h": (4, 240),
+        "4h": (3, 720),
+        "1d": (2, 2880),
+    }
+
+    candles, minutes = mapping.get(interval, (3, 180))
+    expires_at = datetime.utcnow() + timedelta(minutes=minutes)
+
+    return {
+        "valid_candles": candles,
+        "valid_for_minutes": minutes,
+        "expires_at": expires_at.isoformat() + "Z"
+    }
@@ -0,0 +1,361 @@
+import csv
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+
+from analytics.session_engine import MarketSessionEngine
+from risk.instrument_registry import instrument_registry
+
+
+# Approx Exness Standard spreads (registry pips), used until enough
+# quotes are seen
+STATIC_SPREADS = {
+    "EURUSD": 1.0,
+    "GBPUSD": 1.4,
+    "USDJPY": 1.2,
+    "XAUUSD": 25.0
+}
+DEFAULT_SPREAD = 1.5
+
+ALL_SESSIONS = "ALL"
+OFF_SESSION = "OFF_SESSION"
+
+
+def session_key(timestamp: float | None = None) -> str:
+    """
+    Session bucket of a quote ("LONDON+NEW_YORK" for the overlap)
+    """
+
+    timestamp = time.time() if timestamp is None else timestamp
+    hour = datetime.fromtimestamp(timestamp, timezone.utc).hour
+
+    return "+".join(MarketSessionEngine.sessions_at(hour)) or OFF_SESSION
+
+
+class SpreadWindow:
+    """
+    Fixed-size ring buffer of spread samples with a running histogram
+    - add: O(1) (evicts the oldest sample's bin count)
+    - percentile: O(bins), independent of the number of samples
+    Log-spaced bins (~5% wide) cover FX pips and crypto ticks alike
+    """
+
+    EDGES = np.geomspace(0.01, 10_000, 257)
+    MIDPOINTS = np.sqrt(EDGES[:-1] * EDGES[1:])
+
+    def __init__(self, capacity: int = 2048):
+        self.capacity = capacity
+
+        self._bins = np.zeros(capacity, dtype=np.int16)
+        self._counts = np.zeros(len(self.MIDPOINTS), dtype=np.int64)
+        self._pos = 0
+        self.count = 0
+        self.last = None
+
+    def add(self, spread: float):
+        idx = int(np.searchsorted(self.EDGES, spread, side="right")) - 1
+        idx = min(max(idx, 0), len(self.MIDPOINTS) - 1)
+
+        if self.count == self.capacity:
+            self._counts[self._bins[self._pos]] -= 1
+        else:
+            self.count += 1
+
+        self._bins[self._pos] = idx
+        self._counts[idx] += 1
+        self._pos = (self._pos + 1) % self.capacity
+        self.last = spread
+
+    def percentile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+
+        rank = max(int(np.ceil(q / 100 * self.count)), 1)
+        idx = int(np.searchsorted(np.cumsum(self._counts), rank))
+
+        return float(self.MIDPOINTS[idx])
+
+
+class SpreadEstimator:
+    """
+    Live Spread Model
+    Purpose:
+    - Rolling spread statistics per symbol and trading session
+    - Percentile estimate in pips for the spread filter
+    - Static table only until a symbol has enough quotes
+    """
+
+    def __init__(
+        self,
+        capacity: int = 2048,
+        percentile: float = 75,
+        min_samples: int = 50
+    ):
+        self.capacity = capacity
+        self.percentile = percentile
+        self.min_samples = min_samples
+
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def _window(self, symbol: str, session: str) -> SpreadWindow:
+        key = (symbol, session)
+        window = self._windows.get(key)
+
+        if window is None:
+            window = self._windows[key] = SpreadWindow(self.capacity)
+
+        return window
+
+    # ==============================
+    # QUOTES
+    # ==============================
+
+    def record_quote(
+        self,
+        symbol: str,
+        bid: float,
+        ask: float,
+        timestamp: float | None = None
+    ):
+        symbol = instrument_registry.clean(symbol)
+
+        if not (ask >= bid > 0):
+            return
+
+        try:
+            pip_size = instrument_registry.spec(symbol).pip_size
+        except ValueError:
+            return
+
+        spread = (ask - bid) / pip_size
+        session = session_key(timestamp)
+
+        with self._lock:
+            self._window(symbol, session).add(spread)
+            self._window(symbol, ALL_SESSIONS).add(spread)
+
+    def replay(self, path: str) -> int:
+        """
+        Feed a recorded quotes CSV (timestamp,symbol,bid,ask)
+        """
+
+        count = 0
+
+        for timestamp, symbol, bid, ask in load_recorded_quotes(path):
+            self.record_quote(symbol, bid, ask, timestamp)
+            count += 1
+
+        return count
+
+    # ==============================
+    # ESTIMATE
+    # ==============================
+
+    def estimate(
+        self,
+        symbol: str,
+        timestamp: float | None = None,
+        percentile: float | None = None,
+        pip_size: float | None = None
+    ) -> float:
+        """
+        Spread at the given percentile for the current session
+        Falls back: session → all sessions → static table
+        In registry pips unless `pip_size` asks for another unit
+        """
+
+        symbol = instrument_registry.clean(symbol)
+        percentile = self.percentile if percentile is None else percentile
+
+        spread = STATIC_SPREADS.get(symbol, DEFAULT_SPREAD)
+
+        with self._lock:
+            for session in (session_key(timestamp), ALL_SESSIONS):
+                window = self._windows.get((symbol, session))
+
+                if window is not None and window.count >= self.min_samples:
+                    spread = window.percentile(percentile)
+                    break
+
+        if pip_size:
+            try:
+                spread *= instrument_registry.spec(symbol).pip_size / pip_size
+            except ValueError:
+                pass
+
+        return round(spread, 2)
+
+    def stats(self, symbol: str) -> dict:
+        symbol = instrument_registry.clean(symbol)
+
+        with self._lock:
+            return {
+                session: {
+                    "samples": window.count,
+                    "last": window.last,
+                    "p50": window.percentile(50),
+                    "p75": window.percentile(75),
+                    "p95": window.percentile(95)
+                }
+                for (s, session), window in self._windows.items()
+                if s == symbol
+            }
+
+
+class QuoteSampler:
+    """
+    Background Quote Sampler
+    Purpose:
+    - Polls live (bid, ask) quotes off the request path and records
+      them into the spread estimator; analysis only reads estimates
+    - Symbols without a quote source (quote_fn → None) are dropped
+    - A failing symbol is logged once until it recovers (counted always)
+    The estimator is per process, so every worker runs its own sampler
+    """
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        quote_fn,
+        symbols: list[str],
+        interval: float = 5.0,
+        estimator: SpreadEstimator | None = None
+    ):
+        self.quote_fn = quote_fn
+        self.symbols = list(dict.fromkeys(symbols))
+        self.interval = interval
+        self.estimator = estimator or spread_estimator
+
+        self._failing = set()
+        self._counters = defaultdict(int)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def shared(cls):
+        """
+        Sampler over the scan universe when SPREAD_SAMPLER=1, else None
+        """
+
+        if os.getenv("SPREAD_SAMPLER") != "1":
+            return None
+
+        with cls._lock:
+            if cls._shared is None:
+                from analytics.auto_signal_scanner import AutoSignalScanner
+                from services.analyse_service import data_router
+
+                cls._shared = cls(
+                    data_router.fetch_quote,
+                    AutoSignalScanner.SYMBOLS,
+                    interval=float(os.getenv("SPREAD_SAMPLE_INTERVAL", "5"))
+                )
+                cls._shared.start()
+
+            return cls._shared
+
+    @classmethod
+    def shutdown(cls):
+        with cls._lock:
+            sampler, cls._shared = cls._shared, None
+
+        if sampler is not None:
+            sampler.stop()
+
+    # ==============================
+    # LIFECYCLE
+    # ==============================
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="quote-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            self.sample()
+
+            if self._stop.wait(self.interval):
+                return
+
+    # ==============================
+    # SAMPLING
+    # ==============================
+
+    def sample(self) -> int:
+        """
+        One quote per symbol; returns the number recorded
+        """
+
+        recorded = 0
+
+        for symbol in list(self.symbols):
+            try:
+                quote = self.quote_fn(symbol)
+            except Exception as e:
+                self._counters["errors"] += 1
+
+                if symbol not in self._failing:
+                    self._failing.add(symbol)
+                    print(f"[SPREAD] {symbol} quotes failing: {e}")
+                continue
+
+            self._failing.discard(symbol)
+
+            if quote is None:
+                self.symbols.remove(symbol)
+                continue
+
+            self.estimator.record_quote(symbol, *quote)
+            recorded += 1
+
+        self._counters["quotes"] += recorded
+
+        return recorded
+
+    def stats(self) -> dict:
+        return {
+            "symbols": len(self.symbols),
+            "failing": sorted(self._failing),
+            **self._counters
+        }
+
+
+def load_recorded_quotes(path: str):
+    """
+    Yield (timestamp, symbol, bid, ask) rows from a quotes CSV
+    """
+
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            yield (
+                float(row["timestamp"]),
+                row["symbol"],
+                float(row["bid"]),
+                float(row["ask"])
+            )
+
+
+spread_estimator = SpreadEstimator()
+
+if os.getenv("SPREAD_QUOTES_PATH"):
+    spread_estimator.replay(os.getenv("SPREAD_QUOTES_PATH"))
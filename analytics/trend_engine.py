@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -9,6 +10,8 @@ class TrendEngine:
     - Not prediction, only classification
     """
 
+    MA_PERIOD = 50
+
     def classify_trend(self, df: pd.DataFrame) -> str:
         """
         Trend logic:
@@ -18,7 +21,7 @@ class TrendEngine:
         """
 
         df = df.copy()
-        df["ma_50"] = df["close"].rolling(50).mean()
+        df["ma_50"] = df["close"].rolling(self.MA_PERIOD).mean()
 
         last_price = df["close"].iloc[-1]
         last_ma = df["ma_50"].iloc[-1]
@@ -30,3 +33,20 @@ class TrendEngine:
             return "Bearish"
 
         return "Ranging"
+
+    def classify_trend_series(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Same rules as classify_trend, evaluated for every bar
+        (bars inside the MA warm-up are Ranging)
+        """
+
+        close = df["close"]
+        ma = close.rolling(self.MA_PERIOD).mean()
+
+        trend = np.select(
+            [close > ma, close < ma],
+            ["Bullish", "Bearish"],
+            default="Ranging"
+        )
+
+        return pd.Series(trend, index=df.index)
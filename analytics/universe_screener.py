@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+
+from analytics.trend_engine import TrendEngine
+from data.resampler import ANALYSIS_BARS
+from strategy.ema_rsi_strategy import EMARsiStrategy
+
+
+class UniverseScreener:
+    """
+    Cross-Sectional Universe Screener
+    Purpose:
+    - Stack the whole universe into (symbols × bars) matrices
+    - Compute EMA / RSI / ATR / trend / liquidity-trap flags for every
+      symbol at once (column-wise, one pass per indicator)
+    - Return a sortable table for ranking opportunities
+    """
+
+    ATR_PERIOD = 14
+    LIQUIDITY_LOOKBACK = 12
+
+    # Same window as analyze_market: EMA 200 values match the strategy's
+    def __init__(self, data_router=None, bars: int = ANALYSIS_BARS, max_workers: int = 8):
+        self.data_router = data_router
+        self.bars = bars
+        self.max_workers = max_workers
+
+    # ==============================
+    # DATA
+    # ==============================
+
+    def fetch_frames(self, symbols: list[str], interval: str) -> dict:
+        """
+        Batched / concurrent fetch of the whole universe
+        """
+
+        frames, errors = self.data_router.fetch_many(
+            symbols, interval, self.bars, max_workers=self.max_workers
+        )
+
+        for symbol, e in errors.items():
+            print(f"[SCREENER ERROR] {symbol}: {e}")
+
+        return frames
+
+    @staticmethod
+    def stack(frames: dict, bars: int) -> tuple[list, dict]:
+        """
+        Right-align each symbol's last `bars` candles into matrices
+        Shorter histories are NaN-padded at the start
+        """
+
+        symbols = [s for s, df in frames.items() if df is not None and len(df)]
+        matrices = {}
+
+        for column in ("close", "high", "low"):
+            matrix = np.full((len(symbols), bars), np.nan)
+
+            for row, symbol in enumerate(symbols):
+                values = frames[symbol][column].to_numpy(dtype=float)[-bars:]
+                matrix[row, bars - len(values):] = values
+
+            matrices[column] = matrix
+
+        return symbols, matrices
+
+    # ==============================
+    # INDICATORS (2D)
+    # ==============================
+
+    @staticmethod
+    def ema_last(close: np.ndarray, span: int) -> np.ndarray:
+        """
+        Last value of pandas ewm(span, adjust=True) for every row
+        (weighted average with weights (1 - alpha) ** age)
+        """
+
+        alpha = 2 / (span + 1)
+        weights = (1 - alpha) ** np.arange(close.shape[1] - 1, -1, -1)
+
+        valid = ~np.isnan(close)
+
+        return (
+            np.where(valid, close, 0.0) @ weights
+        ) / (valid @ weights)
+
+    def compute(self, symbols: list[str], matrices: dict) -> pd.DataFrame:
+        """
+        Indicator snapshot at the last bar of every symbol
+        Same formulas as EMARsiStrategy, TrendEngine, calculate_atr,
+        calculate_volatility and detect_liquidity_trap
+        (rolling windows need a full window, else NaN)
+        """
+
+        close = matrices["close"]
+        high = matrices["high"]
+        low = matrices["low"]
+
+        c = close[:, -1]
+
+        fast = self.ema_last(close, EMARsiStrategy.EMA_FAST)
+        slow = self.ema_last(close, EMARsiStrategy.EMA_SLOW)
+
+        delta = np.diff(close[:, -(EMARsiStrategy.RSI_PERIOD + 1):], axis=1)
+        avg_gain = np.clip(delta, 0, None).mean(axis=1)
+        avg_loss = (-np.clip(delta, None, 0)).mean(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+        window = slice(-self.ATR_PERIOD, None)
+        prev_close = close[:, -(self.ATR_PERIOD + 1):-1]
+        true_range = np.maximum(
+            high[:, window] - low[:, window],
+            np.maximum(
+                np.abs(high[:, window] - prev_close),
+                np.abs(low[:, window] - prev_close)
+            )
+        )
+        atr = true_range.mean(axis=1)
+
+        ma = close[:, -TrendEngine.MA_PERIOD:].mean(axis=1)
+
+        returns = close[:, 1:] / close[:, :-1] - 1
+        volatility = np.round(
+            np.minimum(np.nanstd(returns, axis=1, ddof=1) * 100, 1.0), 3
+        )
+
+        # Liquidity trap: last bar vs the prior (lookback - 1) bars
+        prior = slice(-self.LIQUIDITY_LOOKBACK, -1)
+        prior_high = high[:, prior].max(axis=1)
+        prior_low = low[:, prior].min(axis=1)
+        close_inside = (prior_low < c) & (c < prior_high)
+
+        signal = np.select(
+            [(fast > slow) & (rsi > 50), (fast < slow) & (rsi < 50)],
+            ["BUY", "SELL"],
+            default="NO_TRADE"
+        )
+
+        trend = np.select(
+            [c > ma, c < ma],
+            ["Bullish", "Bearish"],
+            default="Ranging"
+        )
+
+        return pd.DataFrame({
+            "symbol": symbols,
+            "close": c,
+            "signal": signal,
+            "trend": trend,
+            "rsi": rsi,
+            "ema_fast": fast,
+            "ema_slow": slow,
+            "atr": atr,
+            "atr_percent": atr / c * 100,
+            "volatility": volatility,
+            "buy_stop_hunt": (high[:, -1] > prior_high) & close_inside,
+            "sell_stop_hunt": (low[:, -1] < prior_low) & close_inside
+        })
+
+    # ==============================
+    # SCAN
+    # ==============================
+
+    def scan(
+        self,
+        symbols: list[str],
+        interval: str,
+        sort_by: str = "atr_percent",
+        descending: bool = True
+    ) -> pd.DataFrame:
+
+        frames = self.fetch_frames(symbols, interval)
+        return self.screen(frames, sort_by, descending)
+
+    def screen(
+        self,
+        frames: dict,
+        sort_by: str = "atr_percent",
+        descending: bool = True
+    ) -> pd.DataFrame:
+
+        symbols, matrices = self.stack(frames, self.bars)
+
+        if not symbols:
+            return pd.DataFrame()
+
+        table = self.compute(symbols, matrices)
+
+        if sort_by not in table.columns:
+            raise ValueError(f"Unknown sort column: {sort_by}")
+
+        return table.sort_values(
+            sort_by, ascending=not descending, na_position="last"
+        ).reset_index(drop=True)
@@ -1,29 +1,115 @@
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime, timedelta
 
 from data.market_data_router import MarketDataRouter
+from data.shared_candles import SharedCandleCache
+from data.cache_backend import CacheBackend
 from strategy.ema_rsi_strategy import EMARsiStrategy
 from analytics.trend_engine import TrendEngine
 from analytics.recheck_engine import RecheckDecisionEngine
 from data.validators import validate_trade
-from services.analyse_service import analyze_market
+from services.analyse_service import analysis_snapshot
 
 from execution.order_builder import OrderBuilder
 from execution.brokers.paper import PaperBroker
+from execution.trade_journal import JournalLocked, TradeJournal
+from risk.portfolio_risk import portfolio_risk
 from execution.brokers.mt5 import MT5Bridge
+from execution.brokers.mt5_export import MT5ExportQueue
+from database.history_writer import HistoryWriter
 
 from analytics.signal_validator import SignalValidator
 from analytics.signal_ranker import SignalRanker
 from analytics.signal_dispatcher import SignalDispatcher
 from analytics.auto_signal_scanner import AutoSignalScanner
+from analytics.universe_screener import UniverseScreener
+from analytics.recheck_scheduler import RecheckScheduler
+from analytics.signal_validity import get_signal_validity
+from analytics.spread_estimator import QuoteSampler
+from analytics.scan_scheduler import CandleCloseScanScheduler
+from analytics.sharded_scanner import ShardedScanCoordinator
 
 from api.user import router as users_router
+from database.session import pool_stats
+from database.user_cache import UserSettingsCache
 from dotenv import load_dotenv
 load_dotenv()
 
 
-app = FastAPI(title="Trading Analysis Chatbot")
+# ==============================
+# CANDLE-CLOSE SCAN SCHEDULER
+# ==============================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global paper_broker
+
+    scheduler = None
+    coordinator = None
+    paper_journal = None
+
+    # Paper trades journaled (and restored on start) when a directory is
+    # set; one worker owns the journal, the others run unjournaled
+    if os.getenv("PAPER_JOURNAL_DIR"):
+        try:
+            paper_journal = TradeJournal(os.environ["PAPER_JOURNAL_DIR"])
+            paper_broker = PaperBroker(journal=paper_journal)
+        except JournalLocked as e:
+            print(f"[PAPER JOURNAL] {e}, this worker's paper trades are not journaled")
+
+    # Users + settings in one query before the first fan-out
+    if os.getenv("USER_FANOUT") == "1":
+        try:
+            UserSettingsCache.shared().warm()
+        except Exception as e:
+            print(f"[USER CACHE] warm-up failed: {e}")
+
+    # Live quotes for the spread model, polled off the request path
+    QuoteSampler.shared()
+
+    # Opt-in: run in exactly one process of a multi-worker deployment
+    if os.getenv("SCAN_SCHEDULER_ENABLED") == "1":
+        workers = int(os.getenv("SCAN_WORKERS", "0")) or None
+        coordinator = ShardedScanCoordinator(workers=workers)
+
+        # Shard the universe across processes when configured
+        if coordinator.worker_count > 1:
+            coordinator.start()
+        else:
+            coordinator = None
+
+        # Adaptive by default: pairs are rescanned when their recheck
+        # window elapses (SCAN_ADAPTIVE=0 → every pair, every close)
+        scheduler = CandleCloseScanScheduler(
+            account_balance=float(os.getenv("SCAN_ACCOUNT_BALANCE", "10000")),
+            risk_percent=float(os.getenv("SCAN_RISK_PERCENT", DEFAULT_RISK)),
+            scan_fn=coordinator.scan_intervals if coordinator else None,
+            recheck=recheck_scheduler if os.getenv("SCAN_ADAPTIVE", "1") == "1" else None
+        )
+        scheduler.start()
+
+    yield
+
+    if scheduler:
+        scheduler.shutdown()
+
+    if coordinator:
+        coordinator.stop()
+
+    QuoteSampler.shutdown()
+    SignalDispatcher.shutdown()
+    MT5ExportQueue.shutdown()
+    HistoryWriter.shutdown()
+    SharedCandleCache.shutdown()
+    CacheBackend.shutdown()
+
+    if paper_journal:
+        paper_journal.close()
+
+
+app = FastAPI(title="Trading Analysis Chatbot", lifespan=lifespan)
 
 # ==============================
 # MIDDLEWARE
@@ -54,29 +140,15 @@ MAX_LOT_SIZE = 100.0
 data_router = MarketDataRouter()
 strategy = EMARsiStrategy()
 trend_engine = TrendEngine()
+# Journaled in the lifespan (PAPER_JOURNAL_DIR, single writer)
 paper_broker = PaperBroker()
+screener = UniverseScreener(data_router)
+recheck_scheduler = RecheckScheduler()
 
-# ==============================
-# SIGNAL VALIDITY ENGINE
-# ==============================
-def get_signal_validity(interval: str):
-    mapping = {
-        "5m": (5, 25),
-        "15m": (5, 75),
-        "30m": (4, 120),
-        "1h": (4, 240),
-        "4h": (3, 720),
-        "1d": (2, 2880),
-    }
-
-    candles, minutes = mapping.get(interval, (3, 180))
-    expires_at = datetime.utcnow() + timedelta(minutes=minutes)
-
-    return {
-        "valid_candles": candles,
-        "valid_for_minutes": minutes,
-        "expires_at": expires_at.isoformat() + "Z"
-    }
+# Open paper positions count towards the portfolio limits
+# (no endpoint executes orders here, so nothing needs fills: the
+# PaperTrader loop runs and feeds its own engine)
+portfolio_risk.position_source = lambda: paper_broker.open_trades
 
 # ==============================
 # HEALTH
@@ -92,15 +164,85 @@ def health():
 def scan_and_send(
     interval: str = "1h",
     account_balance: float = Query(..., gt=0),
-    risk_percent: float = DEFAULT_RISK
+    risk_percent: float = DEFAULT_RISK,
+    adaptive: bool = False
 ):
     AutoSignalScanner.scan_and_dispatch(
         interval=interval,
         account_balance=account_balance,
-        risk_percent=risk_percent
+        risk_percent=risk_percent,
+        scheduler=recheck_scheduler if adaptive else None
     )
     return {"status": "Signal scan completed"}
 
+# ==============================
+# NOTIFICATION QUEUE
+# ==============================
+@app.get("/notifications/stats")
+def notification_stats():
+    return SignalDispatcher.queue().stats()
+
+# ==============================
+# DATABASE POOL
+# ==============================
+@app.get("/db/pool")
+def db_pool_stats():
+    return pool_stats()
+
+# ==============================
+# CACHES
+# ==============================
+@app.get("/market-data/cache")
+def candle_cache_stats():
+    if data_router.candle_cache is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **data_router.candle_cache.stats()}
+
+@app.get("/cache/stats")
+def cache_stats():
+    return CacheBackend.shared().stats()
+
+# ==============================
+# RECHECK SCHEDULE
+# ==============================
+@app.get("/recheck-schedule")
+def recheck_schedule(limit: int = Query(50, gt=0, le=1000)):
+    return {
+        "next_due": recheck_scheduler.next_due_time(),
+        "upcoming": recheck_scheduler.upcoming(limit)
+    }
+
+# ==============================
+# UNIVERSE SCREENER
+# ==============================
+@app.get("/screener")
+def screen_universe(
+    interval: str = "1h",
+    symbols: str | None = None,
+    sort_by: str = "atr_percent",
+    descending: bool = True
+):
+    universe = (
+        [s.strip().upper() for s in symbols.split(",") if s.strip()]
+        if symbols
+        else AutoSignalScanner.SYMBOLS
+    )
+
+    try:
+        table = screener.scan(universe, interval, sort_by, descending)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)})
+
+    rows = table.astype(object).where(table.notna(), None).to_dict("records")
+
+    return {
+        "interval": interval,
+        "sort_by": sort_by,
+        "count": len(rows),
+        "results": rows
+    }
+
 # ==============================
 # ANALYZE
 # ==============================
@@ -130,7 +272,7 @@ def analyze(
     # ------------------
     # CORE ANALYSIS SERVICE
     # ------------------
-    result = analyze_market(
+    result = analysis_snapshot(
         symbol=symbol,
         interval=interval,
         account_balance=account_balance,
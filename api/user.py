@@ -1,21 +1,79 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from database.deps import get_db
-from database.models import User
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.deps import get_async_db
+from database.models import User, UserSettings
+from database.user_cache import UserSettingsCache
+from risk.position_sizer import PositionSizer
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+
+class SettingsUpdate(BaseModel):
+    """
+    Fields a user may change; anything else is rejected (422)
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    account_balance: float | None = Field(None, gt=0)
+    # Same range /analyze accepts
+    risk_percent: float | None = Field(None, ge=0.1, le=100.0)
+    max_lot_size: float | None = Field(None, ge=PositionSizer.MIN_LOT, le=PositionSizer.MAX_LOT)
+    confidence_threshold: float | None = Field(None, ge=0, le=100)
+
+
 @router.post("/register")
-def register_user(user: dict, db: Session = Depends(get_db)):
+async def register_user(user: dict, db: AsyncSession = Depends(get_async_db)):
     trader = User(
         name=user["name"],
         whatsapp_number=user["whatsapp_number"],
+        account_balance=user.get("account_balance", 0.0),
+        risk_percent=user.get("risk_percent", 1.0),
         email=user.get("email", None),
         clerk_id=user.get("clerk_id", None)
     )
 
     db.add(trader)
-    db.commit()
-    db.refresh(trader)
+    await db.commit()
+    await db.refresh(trader)
+
+    # New recipient: the fan-out snapshot is rebuilt on next use
+    UserSettingsCache.shared().invalidate(trader.id)
 
     return {"status": "registered", "user_id": trader.id}
+
+@router.put("/{user_id}/settings")
+async def update_settings(
+    user_id: int,
+    settings: SettingsUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    if await db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail={"error": "Unknown user"})
+
+    row = await db.scalar(
+        select(UserSettings)
+        .where(UserSettings.user_id == user_id, UserSettings.is_active.is_not(False))
+        .order_by(UserSettings.id.desc())
+    )
+
+    if row is None:
+        user = await db.get(User, user_id)
+        row = UserSettings(
+            user_id=user_id,
+            account_balance=user.account_balance,
+            risk_percent=user.risk_percent or 1.0
+        )
+        db.add(row)
+
+    for field, value in settings.model_dump(exclude_unset=True).items():
+        setattr(row, field, value)
+
+    await db.commit()
+
+    # Version bump: cached rows loaded before this write are dropped
+    UserSettingsCache.shared().invalidate(user_id)
+
+    return {"status": "updated", "user_id": user_id}
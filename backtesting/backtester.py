@@ -1,20 +1,31 @@
+from analytics.htf_trend import HigherTimeframeTrend
+from analytics.regime_engine import RegimeEngine
+
+
 class Backtester:
     """
     Backtesting Engine
     Simulates strategy performance on historical data
     """
 
-    def __init__(self, strategy, risk_manager, validator):
+    def __init__(self, strategy, risk_manager, validator, trend_service=None):
         self.strategy = strategy
         self.risk_manager = risk_manager
         self.validator = validator
+        self.trend_service = trend_service or HigherTimeframeTrend()
         self.trades = []
 
-    def run(self, df, balance=10000, risk_pct=0.01):
+    def run(self, df, balance=10000, risk_pct=0.01, interval="1h"):
         """
         Run backtest candle-by-candle
         """
 
+        # HTF trend for every bar, computed once without lookahead
+        trends = self.trend_service.trend_series(df, interval).to_numpy()
+        traps = RegimeEngine.liquidity_trap_series(df)
+        buy_hunts = traps["buy_stop_hunt"].to_numpy()
+        sell_hunts = traps["sell_stop_hunt"].to_numpy()
+
         for i in range(200, len(df)):
             window = df.iloc[:i]
             signal = self.strategy.generate_signal(window)
@@ -22,6 +33,13 @@ class Backtester:
             if signal == "NO_TRADE":
                 continue
 
+            # Same liquidity filter as the live analysis engine
+            if signal == "BUY" and buy_hunts[i - 1]:
+                continue
+
+            if signal == "SELL" and sell_hunts[i - 1]:
+                continue
+
             entry = window.close.iloc[-1]
             direction = signal
 
@@ -30,7 +48,7 @@ class Backtester:
 
             valid = self.validator(
                 signal=signal,
-                trend="Bullish",  # HTF trend placeholder
+                trend=trends[i - 1],
                 entry=entry,
                 stop_loss=stop,
                 take_profit=take_profit
@@ -0,0 +1,19 @@
+import os
+from functools import lru_cache
+
+import yaml
+
+
+CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=None)
+def load_config(name: str) -> dict:
+    """
+    Load config/<name>.yaml (empty file → {})
+    """
+
+    path = os.path.join(CONFIG_DIR, f"{name}.yaml")
+
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
@@ -0,0 +1,506 @@
+import json
+import os
+import queue
+import socket
+import ssl
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import unquote, urlparse
+
+
+class CacheError(Exception):
+    """
+    Error reply from the cache server, or the server is unreachable
+    """
+
+
+def json_default(value):
+    # json.dumps default: numpy scalars → Python, anything else → str
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+_MISSING = object()
+
+
+def encode_json(value) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=json_default).encode()
+
+
+def decode_json(payload: bytes):
+    return json.loads(payload)
+
+
+class CacheBackend:
+    """
+    Cache Backend (byte values, TTLs, per-key locks)
+    Purpose:
+    - One interface for per-process and shared (multi-node) caches
+    - get_or_set: cache-aside where a single caller per key computes a
+      missing value while the others wait and read it
+    - Backend outages (CacheError) degrade to computing locally
+    Subclasses implement get / set / delete / _acquire / _release
+    """
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self._counters = defaultdict(int)
+
+    @classmethod
+    def shared(cls) -> "CacheBackend":
+        """
+        CACHE_URL=redis://… → shared Redis-protocol backend,
+        otherwise an in-process one
+        """
+
+        with CacheBackend._lock:
+            if CacheBackend._shared is None:
+                url = os.getenv("CACHE_URL")
+                prefix = os.getenv("CACHE_PREFIX", "tc:")
+
+                CacheBackend._shared = (
+                    RedisBackend(url, prefix=prefix) if url else MemoryBackend(prefix=prefix)
+                )
+
+            return CacheBackend._shared
+
+    @classmethod
+    def shutdown(cls):
+        with CacheBackend._lock:
+            if CacheBackend._shared is not None:
+                CacheBackend._shared.close()
+                CacheBackend._shared = None
+
+    # ==============================
+    # PRIMITIVES
+    # ==============================
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float | None = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def _acquire(self, key: str, token: str, ttl: float) -> bool:
+        raise NotImplementedError
+
+    def _release(self, key: str, token: str) -> bool:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    # ==============================
+    # LOCKS
+    # ==============================
+
+    @contextmanager
+    def lock(self, key: str, ttl: float = 30.0, timeout: float = 30.0):
+        """
+        Distributed lock on `key`; yields True if held
+        - expires after `ttl` if the holder dies
+        - gives up after `timeout` (yields False): callers go ahead
+          unlocked rather than stall
+        """
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        held = self._acquire(lock_key, token, ttl)
+
+        if not held:
+            self._counters["lock_waits"] += 1
+
+        while not held and time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+            held = self._acquire(lock_key, token, ttl)
+
+        if not held:
+            self._counters["lock_timeouts"] += 1
+
+        try:
+            yield held
+        finally:
+            # Only our own token is removed (not a lock re-taken after expiry)
+            if held:
+                self._release(lock_key, token)
+
+    # ==============================
+    # CACHE-ASIDE
+    # ==============================
+
+    def get_or_set(
+        self,
+        key: str,
+        compute,
+        ttl: float,
+        encode=encode_json,
+        decode=decode_json,
+        usable=None,
+        lock_ttl: float = 30.0
+    ):
+        """
+        Cached value of `key`, else `compute()` under the key's lock
+        (None results are not cached; `usable(value)` can reject a hit)
+        """
+
+        try:
+            value = self._lookup(key, decode, usable)
+        except CacheError as e:
+            return self._unavailable(e, compute)
+
+        if value is not None:
+            return value
+
+        result = _MISSING
+
+        try:
+            with self.lock(key, ttl=lock_ttl, timeout=lock_ttl) as held:
+                # Filled by another node while we waited
+                if held:
+                    value = self._lookup(key, decode, usable)
+
+                    if value is not None:
+                        return value
+
+                result = compute()
+                self._counters["computed"] += 1
+
+                if result is not None:
+                    self.set(key, encode(result), ttl)
+
+                return result
+
+        except CacheError as e:
+            # Keep a value already computed (set / release failed)
+            return self._unavailable(e, compute) if result is _MISSING else result
+
+    def _unavailable(self, error, compute):
+        self._counters["backend_errors"] += 1
+        print(f"[CACHE] {type(self).__name__} unavailable ({error}), computing locally")
+
+        return compute()
+
+    def _lookup(self, key: str, decode, usable):
+        payload = self.get(key)
+
+        if payload is None:
+            self._counters["misses"] += 1
+            return None
+
+        value = decode(payload)
+
+        if usable is not None and not usable(value):
+            self._counters["rejected"] += 1
+            return None
+
+        self._counters["hits"] += 1
+        return value
+
+    def stats(self) -> dict:
+        return {"backend": type(self).__name__, **self._counters}
+
+
+class MemoryBackend(CacheBackend):
+    """
+    In-process backend (single node / tests): same semantics, locks
+    only coordinate the threads of this process
+    """
+
+    def __init__(self, prefix: str = "", max_entries: int = 10_000):
+        super().__init__(prefix)
+        self.max_entries = max_entries
+        self._entries = {}
+        self._mutex = threading.Lock()
+
+    def _live(self, key: str):
+        # Lock held
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        return entry
+
+    def get(self, key):
+        with self._mutex:
+            entry = self._live(self.prefix + key)
+            return entry[0] if entry else None
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + ttl if ttl else None
+
+        with self._mutex:
+            key = self.prefix + key
+
+            # Re-insert: dict order stays oldest-write first
+            self._entries.pop(key, None)
+            self._entries[key] = (bytes(value), expires)
+
+            if len(self._entries) > self.max_entries:
+                self._trim()
+
+    def _trim(self):
+        # Lock held: expired entries first, then the oldest writes
+        now = time.monotonic()
+
+        for key in [k for k, (_, expires) in self._entries.items() if expires and expires <= now]:
+            del self._entries[key]
+
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+            self._counters["evictions"] += 1
+
+    def delete(self, key):
+        with self._mutex:
+            self._entries.pop(self.prefix + key, None)
+
+    def _acquire(self, key, token, ttl):
+        key = self.prefix + key
+
+        with self._mutex:
+            if self._live(key) is not None:
+                return False
+
+            self._entries[key] = (token, time.monotonic() + ttl)
+            return True
+
+    def _release(self, key, token):
+        key = self.prefix + key
+
+        with self._mutex:
+            entry = self._live(key)
+
+            if entry is None or entry[0] != token:
+                return False
+
+            del self._entries[key]
+            return True
+
+    def stats(self):
+        with self._mutex:
+            return {**super().stats(), "keys": len(self._entries)}
+
+
+# Compare-and-delete: only the token holder releases the lock
+RELEASE_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis-protocol backend (Redis / Valkey / KeyDB), shared by every node
+    - RESP2 over a small pool of blocking sockets (no client library)
+    - Locks: SET NX PX + compare-and-delete script
+    - URL: redis[s]://[:password@]host[:port][/db]
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "",
+        pool_size: int = 8,
+        timeout: float = 2.0
+    ):
+        super().__init__(prefix)
+
+        parsed = urlparse(url)
+
+        if parsed.scheme not in ("redis", "rediss"):
+            raise ValueError(f"Unsupported cache URL scheme: {parsed.scheme}")
+
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.tls = parsed.scheme == "rediss"
+        self.timeout = timeout
+
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    # ==============================
+    # CONNECTIONS
+    # ==============================
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        if self.tls:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=self.host)
+
+        connection = (sock, sock.makefile("rb"))
+
+        if self.password:
+            auth = [self.username, self.password] if self.username else [self.password]
+            self._call(connection, "AUTH", *auth)
+
+        if self.db:
+            self._call(connection, "SELECT", self.db)
+
+        return connection
+
+    def _checkout(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _checkin(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            self._discard(connection)
+
+    @staticmethod
+    def _discard(connection):
+        for part in reversed(connection):
+            try:
+                part.close()
+            except OSError:
+                pass
+
+    def execute(self, *args):
+        """
+        One command → decoded reply; after a dropped connection the
+        pool is emptied and the command retried once on a new one
+        """
+
+        for attempt in (0, 1):
+            try:
+                connection = self._checkout()
+            except OSError as e:
+                raise CacheError(f"{self.host}:{self.port} unreachable: {e}") from e
+
+            try:
+                reply = self._call(connection, *args)
+            except CacheError:
+                self._checkin(connection)
+                raise
+            except OSError as e:
+                self._discard(connection)
+
+                if attempt:
+                    raise CacheError(f"{self.host}:{self.port} unreachable: {e}") from e
+
+                # Server restarted: the other idle sockets are stale too
+                self.close()
+                continue
+
+            self._checkin(connection)
+            return reply
+
+    # ==============================
+    # RESP
+    # ==============================
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode()
+            elif not isinstance(arg, (bytes, bytearray, memoryview)):
+                arg = str(arg).encode()
+
+            parts.append(b"$%d\r\n" % len(arg))
+            parts.append(bytes(arg))
+            parts.append(b"\r\n")
+
+        return b"".join(parts)
+
+    def _call(self, connection, *args):
+        sock, reader = connection
+        sock.sendall(self._encode(args))
+
+        return self._read(reader)
+
+    def _read(self, reader):
+        line = reader.readline()
+
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Cache server closed the connection")
+
+        kind, body = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return body.decode()
+
+        if kind == b"-":
+            raise CacheError(body.decode())
+
+        if kind == b":":
+            return int(body)
+
+        if kind == b"$":
+            length = int(body)
+
+            if length < 0:
+                return None
+
+            data = reader.read(length + 2)
+
+            if len(data) != length + 2:
+                raise ConnectionError("Cache server closed the connection")
+
+            return data[:-2]
+
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [self._read(reader) for _ in range(length)]
+
+        raise CacheError(f"Unexpected reply: {line!r}")
+
+    # ==============================
+    # PRIMITIVES
+    # ==============================
+
+    def get(self, key):
+        return self.execute("GET", self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        if ttl:
+            self.execute("SET", self.prefix + key, value, "PX", int(ttl * 1000))
+        else:
+            self.execute("SET", self.prefix + key, value)
+
+    def delete(self, key):
+        self.execute("DEL", self.prefix + key)
+
+    def _acquire(self, key, token, ttl):
+        return self.execute("SET", self.prefix + key, token, "NX", "PX", int(ttl * 1000)) == "OK"
+
+    def _release(self, key, token):
+        return self.execute("EVAL", RELEASE_SCRIPT, 1, self.prefix + key, token) == 1
+
+    def ping(self) -> bool:
+        return self.execute("PING") == "PONG"
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._pool.get_nowait())
+            except queue.Empty:
+                return
+
+    def stats(self):
+        return {
+            **super().stats(),
+            "server": f"{self.host}:{self.port}/{self.db}",
+            "idle_connections": self._pool.qsize()
+        }
@@ -0,0 +1,70 @@
+import struct
+
+import numpy as np
+import pandas as pd
+
+from data.resampler import open_times_ms
+
+
+# magic, version, flags, reserved, rows, fetched limit
+HEADER = struct.Struct("<4sBBHII")
+MAGIC = b"OHLC"
+VERSION = 1
+
+# Forex feeds carry no volume: the column is left out when all zero
+HAS_VOLUME = 1
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+
+
+def encode_candles(df: pd.DataFrame, fetched_limit: int | None = None) -> bytes:
+    """
+    OHLCV frame (either provider) → compact little-endian columns
+    Layout: header | int64 open times (ms) | float64 open, high, low,
+    close | float64 volume (only if any is non-zero)
+    """
+
+    rows = len(df)
+    volume = df["volume"].to_numpy(dtype="<f8") if "volume" in df.columns else None
+    flags = HAS_VOLUME if volume is not None and volume.any() else 0
+
+    parts = [
+        HEADER.pack(MAGIC, VERSION, flags, 0, rows, rows if fetched_limit is None else fetched_limit),
+        open_times_ms(df).astype("<i8").tobytes()
+    ]
+
+    for field in PRICE_FIELDS:
+        parts.append(df[field].to_numpy(dtype="<f8").tobytes())
+
+    if flags & HAS_VOLUME:
+        parts.append(volume.tobytes())
+
+    return b"".join(parts)
+
+
+def decode_candles(payload: bytes) -> tuple[pd.DataFrame, int]:
+    """
+    Bytes → (frame, fetched_limit); columns are read-only views over
+    `payload` (no copy)
+    """
+
+    magic, version, flags, _, rows, fetched_limit = HEADER.unpack_from(payload)
+
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not an encoded candle window")
+
+    offset = HEADER.size
+    columns = {"timestamp": np.frombuffer(payload, dtype="<i8", count=rows, offset=offset)}
+    offset += 8 * rows
+
+    for field in PRICE_FIELDS:
+        columns[field] = np.frombuffer(payload, dtype="<f8", count=rows, offset=offset)
+        offset += 8 * rows
+
+    columns["volume"] = (
+        np.frombuffer(payload, dtype="<f8", count=rows, offset=offset)
+        if flags & HAS_VOLUME
+        else np.zeros(rows)
+    )
+
+    return pd.DataFrame(columns, copy=False), fetched_limit
@@ -55,3 +55,16 @@ class MarketDataClient:
 
         return df
 
+    def fetch_book_ticker(self, symbol: str) -> tuple[float, float]:
+        """
+        Best bid / ask from the exchange order book
+        """
+
+        url = self.base_url.rsplit("/", 1)[0] + "/ticker/bookTicker"
+
+        response = requests.get(url, params={"symbol": symbol}, timeout=5)
+        response.raise_for_status()
+
+        book = response.json()
+
+        return float(book["bidPrice"]), float(book["askPrice"])
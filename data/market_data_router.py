@@ -1,5 +1,12 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from data.cache_backend import CacheBackend, CacheError
+from data.candle_codec import decode_candles, encode_candles
 from data.market_data import MarketDataClient
 from data.twelve_data_market_data import TwelveDataMarketDataClient
+from data.resampler import bars_required, interval_ms, resample_ohlcv
+from data.shared_candles import SharedCandleCache
 
 
 class MarketDataRouter:
@@ -7,16 +14,276 @@ class MarketDataRouter:
     Routes symbols to the correct market data provider
     """
 
-    def __init__(self):
+    # Largest single request each provider accepts
+    CRYPTO_MAX_BARS = 1000
+    MULTI_ASSET_MAX_BARS = 5000
+
+    def __init__(
+        self,
+        candle_cache: SharedCandleCache | None = None,
+        cache: CacheBackend | None = None,
+        cache_ttl: float | None = None
+    ):
         self.crypto_client = MarketDataClient(
             "https://api.binance.com/api/v3/klines"
         )
         self.multi_asset_client = TwelveDataMarketDataClient()
 
-    def fetch_ohlcv(self, symbol: str, interval: str):
+        # Opt-in: one candle window per machine shared by all workers
+        if candle_cache is None and os.getenv("SHARED_CANDLES") == "1":
+            candle_cache = SharedCandleCache.shared()
+
+        self.candle_cache = candle_cache
+
+        # Shared across nodes when CACHE_URL is set (0 → disabled)
+        self.cache = cache or CacheBackend.shared()
+        self.cache_ttl = (
+            float(os.getenv("CACHE_CANDLE_TTL", "30")) if cache_ttl is None else cache_ttl
+        )
+
+    def fetch_ohlcv(self, symbol: str, interval: str, limit: int = 500):
+        # Node-local shared memory → cache backend → provider
+        if self.candle_cache is not None:
+            return self.fetch_shared(symbol, interval, limit)
+
+        return self.fetch_cached(symbol, interval, limit)
+
+    def fetch_shared(self, symbol: str, interval: str, limit: int = 500, attempts: int = 3):
+        """
+        Private copy of the shared-memory window
+        The zero-copy frame is rewritten two refreshes later, so it is
+        copied and the copy kept only if the writer did not get there
+        meanwhile
+        """
+
+        for _ in range(attempts):
+            frame = self.candle_cache.get(symbol, interval, limit, self.fetch_cached)
+            copied = self._private_copy(frame)
+
+            if copied is not None:
+                return copied
+
+        return self.fetch_cached(symbol, interval, limit)
+
+    def _private_copy(self, frame):
+        copied = frame.copy()
+
+        if not self.candle_cache.valid(frame):
+            return None
+
+        copied.attrs.pop("shared_seq", None)
+        return copied
+
+    @staticmethod
+    def _candle_key(symbol: str, interval: str) -> str:
+        return f"candles:{symbol}:{interval}"
+
+    @staticmethod
+    def _usable_window(window, limit: int) -> bool:
+        # A shorter window only serves if the provider had no more
+        df, fetched_limit = window
+        return len(df) >= limit or fetched_limit >= limit
+
+    def cached_window(self, symbol: str, interval: str, limit: int = 500):
+        """
+        Window already cached (shared memory, then the cache backend),
+        None on a miss; never calls the provider
+        """
+
+        if self.candle_cache is not None:
+            frame = self.candle_cache.peek(symbol, interval, limit)
+            copied = None if frame is None else self._private_copy(frame)
+
+            if copied is not None:
+                return copied
+
+        if self.cache_ttl <= 0:
+            return None
+
+        try:
+            payload = self.cache.get(self._candle_key(symbol, interval))
+        except CacheError:
+            return None
+
+        if payload is None:
+            return None
+
+        window = decode_candles(payload)
+
+        if not self._usable_window(window, limit):
+            return None
+
+        return window[0].tail(limit).reset_index(drop=True)
+
+    def store_window(self, symbol: str, interval: str, fetched_limit: int, df):
+        """
+        Write a window fetched outside fetch_cached under the same key
+        """
+
+        if self.cache_ttl <= 0:
+            return
+
+        try:
+            self.cache.set(
+                self._candle_key(symbol, interval),
+                encode_candles(df, fetched_limit),
+                ttl=self.cache_ttl
+            )
+        except CacheError:
+            pass
+
+    def fetch_cached(self, symbol: str, interval: str, limit: int = 500):
+        """
+        Candle window through the cache backend: one node per key
+        refreshes it, the others read the encoded window
+        """
+
+        if self.cache_ttl <= 0:
+            return self.fetch_upstream(symbol, interval, limit)
+
+        df, _ = self.cache.get_or_set(
+            self._candle_key(symbol, interval),
+            lambda: (self.fetch_upstream(symbol, interval, limit), limit),
+            ttl=self.cache_ttl,
+            encode=lambda window: encode_candles(*window),
+            decode=decode_candles,
+            usable=lambda window: self._usable_window(window, limit)
+        )
+
+        return df.tail(limit).reset_index(drop=True)
+
+    def fetch_upstream(self, symbol: str, interval: str, limit: int = 500):
         # Crypto via Binance
         if symbol.endswith("USDT"):
-            return self.crypto_client.fetch_ohlcv(symbol, interval)
+            return self.crypto_client.fetch_ohlcv(symbol, interval, limit)
 
         # Forex / Stocks / Indices via Twelve Data
-        return self.multi_asset_client.fetch_ohlcv(symbol, interval)
+        return self.multi_asset_client.fetch_ohlcv(symbol, interval, limit)
+
+    def fetch_quote(self, symbol: str) -> tuple[float, float] | None:
+        """
+        Live (bid, ask) where the provider exposes one
+        Binance book ticker for crypto; Twelve Data serves no bid/ask,
+        so None (spreads stay on the static table / recorded quotes)
+        """
+
+        if symbol.endswith("USDT"):
+            return self.crypto_client.fetch_book_ticker(symbol)
+
+        return None
+
+    def fetch_many(
+        self,
+        symbols: list[str],
+        interval: str,
+        limit: int = 500,
+        max_workers: int = 8
+    ) -> tuple[dict, dict]:
+        """
+        One interval for a whole universe with few upstream calls
+        - Twelve Data symbols: cached windows first, the misses in
+          batched time_series requests (written back to the cache)
+        - Binance symbols: one klines call each (no multi-symbol
+          endpoint), at most `max_workers` in flight
+        Returns (symbol → DataFrame, symbol → error)
+        """
+
+        crypto = [s for s in symbols if s.endswith("USDT")]
+        size = self.multi_asset_client.BATCH_SIZE
+        batch_limit = min(limit, self.MULTI_ASSET_MAX_BARS)
+
+        frames, errors = {}, {}
+        multi_asset = []
+
+        for symbol in symbols:
+            if symbol.endswith("USDT"):
+                continue
+
+            cached = self.cached_window(symbol, interval, batch_limit)
+
+            if cached is None:
+                multi_asset.append(symbol)
+            else:
+                frames[symbol] = cached
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            batches = [
+                (chunk, pool.submit(
+                    self.multi_asset_client.fetch_ohlcv_batch,
+                    chunk, interval, batch_limit
+                ))
+                for chunk in (multi_asset[i:i + size] for i in range(0, len(multi_asset), size))
+            ]
+            singles = [
+                (symbol, pool.submit(self.fetch_ohlcv, symbol, interval, limit))
+                for symbol in crypto
+            ]
+
+            for chunk, future in batches:
+                try:
+                    results = future.result()
+                except Exception as e:
+                    results = dict.fromkeys(chunk, e)
+
+                for symbol, result in results.items():
+                    if isinstance(result, Exception):
+                        errors[symbol] = result
+                    else:
+                        frames[symbol] = result
+                        self.store_window(symbol, interval, batch_limit, result)
+
+            for symbol, future in singles:
+                try:
+                    frames[symbol] = future.result()
+                except Exception as e:
+                    errors[symbol] = e
+
+        return frames, errors
+
+    def max_bars(self, symbol: str) -> int:
+        if symbol.endswith("USDT"):
+            return self.CRYPTO_MAX_BARS
+
+        return self.MULTI_ASSET_MAX_BARS
+
+    def fetch_timeframes(
+        self,
+        symbol: str,
+        intervals: list[str],
+        limit: int = 500
+    ) -> dict:
+        """
+        Fetch several intervals with as few upstream calls as possible
+        - Lowest interval is fetched once and higher ones resampled locally
+        - Falls back to a new base fetch only when the provider's
+          request cap cannot cover the resampling window
+        """
+
+        frames = {}
+        groups = []
+
+        for interval in sorted(set(intervals), key=interval_ms):
+            if groups:
+                base, members = groups[-1]
+                needed = bars_required(base, interval, limit)
+
+                if needed <= self.max_bars(symbol):
+                    members.append(interval)
+                    continue
+
+            groups.append((interval, [interval]))
+
+        for base, members in groups:
+            needed = max(
+                [limit] + [bars_required(base, i, limit) for i in members[1:]]
+            )
+            base_df = self.fetch_ohlcv(symbol, base, min(needed, self.max_bars(symbol)))
+
+            frames[base] = base_df.tail(limit).reset_index(drop=True)
+
+            for interval in members[1:]:
+                frames[interval] = resample_ohlcv(
+                    base_df, interval, drop_incomplete_head=True
+                ).tail(limit).reset_index(drop=True)
+
+        return frames
@@ -0,0 +1,241 @@
+import numpy as np
+import pandas as pd
+
+from analytics.recheck_engine import TIMEFRAME_MINUTES
+
+
+MINUTE_MS = 60_000
+HOUR_MS = 60 * MINUTE_MS
+
+# Daily bars roll over at 00:00 UTC (matches Binance & Twelve Data candles)
+DAY_START_HOUR = 0
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+# Bars the strategy / volatility models are evaluated on (analyze_market,
+# the universe screener)
+ANALYSIS_BARS = 500
+
+
+# ==============================
+# TIME UTILS
+# ==============================
+
+def interval_ms(interval: str) -> int:
+    """
+    Interval length in milliseconds
+    """
+
+    if interval not in TIMEFRAME_MINUTES:
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    return TIMEFRAME_MINUTES[interval] * MINUTE_MS
+
+
+def open_times_ms(df: pd.DataFrame) -> np.ndarray:
+    """
+    Bar open times as int64 epoch milliseconds
+    - Binance frames carry `timestamp` (ms)
+    - Twelve Data frames carry `datetime` (UTC string)
+    """
+
+    if "timestamp" in df.columns:
+        return df["timestamp"].to_numpy(dtype="int64")
+
+    if "datetime" in df.columns:
+        times = pd.to_datetime(df["datetime"], utc=True).dt.tz_localize(None)
+        return times.to_numpy(dtype="datetime64[ms]").astype("int64")
+
+    raise ValueError("OHLCV frame has no timestamp or datetime column")
+
+
+def bucket_start_ms(
+    open_time: np.ndarray | int,
+    interval: str,
+    day_start_hour: int = DAY_START_HOUR
+):
+    """
+    Open time of the higher-interval bar containing `open_time`
+    """
+
+    period = interval_ms(interval)
+    offset = day_start_hour * HOUR_MS
+
+    return (open_time - offset) // period * period + offset
+
+
+# ==============================
+# BATCH RESAMPLING
+# ==============================
+
+def resample_ohlcv(
+    df: pd.DataFrame,
+    interval: str,
+    day_start_hour: int = DAY_START_HOUR,
+    drop_incomplete_head: bool = False
+) -> pd.DataFrame:
+    """
+    Build higher-interval OHLCV bars from a lower-interval frame
+    Rules:
+    - Buckets aligned to epoch / day rollover (`day_start_hour` UTC)
+    - Open = first, High = max, Low = min, Close = last, Volume = sum
+    - Gaps (weekends, missing bars) never create empty bars
+    - Last bar may be partial while the bucket is still open
+    """
+
+    times = open_times_ms(df)
+
+    if len(times) == 0:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    starts_of = bucket_start_ms(times, interval, day_start_hour)
+
+    # Index of the first base bar of every bucket (input is ascending)
+    first = np.flatnonzero(np.r_[True, starts_of[1:] != starts_of[:-1]])
+    last = np.r_[first[1:] - 1, len(times) - 1]
+
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+
+    if "volume" in df.columns:
+        volume = np.add.reduceat(df["volume"].to_numpy(dtype=float), first)
+    else:
+        volume = np.zeros(len(first))
+
+    out = pd.DataFrame({
+        "timestamp": starts_of[first],
+        "open": df["open"].to_numpy(dtype=float)[first],
+        "high": np.maximum.reduceat(high, first),
+        "low": np.minimum.reduceat(low, first),
+        "close": df["close"].to_numpy(dtype=float)[last],
+        "volume": volume
+    })
+
+    # First bucket starts before the data does → its OHLC is truncated
+    if drop_incomplete_head and times[0] != starts_of[0]:
+        out = out.iloc[1:].reset_index(drop=True)
+
+    if "datetime" in df.columns:
+        out.insert(
+            0,
+            "datetime",
+            pd.to_datetime(out["timestamp"], unit="ms")
+            .dt.strftime("%Y-%m-%d %H:%M:%S")
+        )
+
+    return out
+
+
+def bars_required(base_interval: str, interval: str, bars: int) -> int:
+    """
+    Base bars needed to produce `bars` complete higher-interval bars
+    """
+
+    ratio = interval_ms(interval) // interval_ms(base_interval)
+
+    # One extra bucket covers a partial head that gets dropped
+    return (bars + 1) * ratio
+
+
+# ==============================
+# INCREMENTAL RESAMPLING
+# ==============================
+
+class IncrementalResampler:
+    """
+    Live higher-interval bar builder
+    Purpose:
+    - Feed base bars as they arrive (including in-progress revisions)
+    - Keep the current partial bar up to date
+    - Emit each higher-interval bar once its bucket rolls over
+    """
+
+    def __init__(self, interval: str, day_start_hour: int = DAY_START_HOUR):
+        self.interval = interval
+        self.day_start_hour = day_start_hour
+
+        self.current = None
+        self._settled = None
+        self._base_time = None
+        self._base_bar = None
+
+    def update(
+        self,
+        open_time: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0
+    ) -> dict | None:
+        """
+        Apply one base bar (new or revised)
+        Returns the higher-interval bar closed by this update, if any
+        """
+
+        if self._base_time is not None and open_time < self._base_time:
+            raise ValueError("Base bars must arrive in time order")
+
+        bucket = int(bucket_start_ms(open_time, self.interval, self.day_start_hour))
+        base_bar = {
+            "open": float(open),
+            "high": float(high),
+            "low": float(low),
+            "close": float(close),
+            "volume": float(volume)
+        }
+
+        closed = None
+
+        if self.current is not None and bucket != self.current["timestamp"]:
+            closed = self.current
+            self._settled = None
+            self._base_bar = None
+
+        elif self._base_time is not None and open_time != self._base_time:
+            # Previous base bar is final → fold it into the settled part
+            self._settled = self._merge(self._settled, self._base_bar)
+
+        self._base_time = open_time
+        self._base_bar = base_bar
+
+        merged = self._merge(self._settled, base_bar)
+        merged["timestamp"] = bucket
+        self.current = merged
+
+        return closed
+
+    def update_frame(self, df: pd.DataFrame) -> list[dict]:
+        """
+        Feed a frame of base bars, returning every closed bar
+        """
+
+        closed_bars = []
+        times = open_times_ms(df)
+        columns = [
+            df[col].to_numpy(dtype=float) if col in df.columns
+            else np.zeros(len(df))
+            for col in ("open", "high", "low", "close", "volume")
+        ]
+
+        for i, open_time in enumerate(times):
+            closed = self.update(int(open_time), *(col[i] for col in columns))
+
+            if closed:
+                closed_bars.append(closed)
+
+        return closed_bars
+
+    @staticmethod
+    def _merge(settled: dict | None, bar: dict) -> dict:
+
+        if settled is None:
+            return dict(bar)
+
+        return {
+            "open": settled["open"],
+            "high": max(settled["high"], bar["high"]),
+            "low": min(settled["low"], bar["low"]),
+            "close": bar["close"],
+            "volume": settled["volume"] + bar["volume"]
+        }
@@ -0,0 +1,472 @@
+import fcntl
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from data.resampler import open_times_ms
+
+
+# Row order of the float64 window (timestamp = open time, epoch ms)
+FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# int64 header: [0] sequence, then per buffer: bars, fetched limit, updated_at (ms)
+HEADER_SLOTS = 8
+BUFFERS = 2
+
+
+def segment_name(namespace: str, capacity: int, symbol: str, interval: str) -> str:
+    """
+    Deterministic segment name: every worker maps the same window
+    (capacity in the name → the layout never differs between attachers)
+    """
+
+    key = re.sub(r"[^A-Za-z0-9]", "_", f"{symbol}-{interval}")
+    return f"{namespace}-{capacity}-{key}"
+
+
+def segment_size(capacity: int) -> int:
+    return 8 * (HEADER_SLOTS + BUFFERS * len(FIELDS) * capacity)
+
+
+class CandleSegment:
+    """
+    One (symbol, interval) window in shared memory
+    Layout (fixed, float64 columns):
+    - header: sequence + per-buffer metadata
+    - two buffers of len(FIELDS) × capacity, written alternately
+    Seqlock:
+    - the writer makes the sequence odd, fills the buffer not being
+      read, then makes it even again: readers never block or spin
+    - published buffer = (sequence // 2) % 2
+    - a reader's view stays intact until the writer starts the
+      generation after next (checked with `SharedCandleCache.valid`)
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, capacity: int):
+        self.shm = shm
+        self.capacity = capacity
+
+        self.header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        self.buffers = np.ndarray(
+            (BUFFERS, len(FIELDS), capacity),
+            dtype=np.float64,
+            buffer=shm.buf,
+            offset=8 * HEADER_SLOTS
+        )
+
+    # ==============================
+    # READ (lock-free)
+    # ==============================
+
+    def snapshot(self):
+        """
+        (sequence, bars, fetched_limit, updated_at_ms) of the published buffer
+        """
+
+        while True:
+            seq = int(self.header[0])
+            start = 2 + 3 * self._published(seq)
+            bars, fetched_limit, updated_at = self.header[start:start + 3].tolist()
+
+            # Retry only if the writer reached this buffer meanwhile
+            if int(self.header[0]) < self.overwritten_at(seq):
+                return seq, bars, fetched_limit, updated_at
+
+    @staticmethod
+    def overwritten_at(seq: int) -> int:
+        """
+        Sequence at which the buffer published at `seq` starts being rewritten
+        """
+
+        return (seq // 2) * 2 + 3
+
+    @staticmethod
+    def _published(seq: int) -> int:
+        return (seq // 2) % BUFFERS
+
+    def window(self, seq: int, bars: int) -> np.ndarray:
+        """
+        Read-only (fields × bars) view of the published buffer (zero-copy)
+        """
+
+        view = self.buffers[self._published(seq), :, :bars]
+        view.flags.writeable = False
+
+        return view
+
+    # ==============================
+    # WRITE (single writer, key lock held)
+    # ==============================
+
+    def publish(self, columns: np.ndarray, fetched_limit: int):
+        seq = int(self.header[0])
+        target = self._published(seq + 2)
+        bars = columns.shape[1]
+
+        self.header[0] = seq + 1
+
+        self.buffers[target, :, :bars] = columns
+        self.header[2 + 3 * target:5 + 3 * target] = (
+            bars, fetched_limit, int(time.time() * 1000)
+        )
+
+        self.header[0] = seq + 2
+
+    def close(self):
+        self.header = self.buffers = None
+
+        try:
+            self.shm.close()
+        except BufferError:
+            # Frames handed out still reference the mapping; it is
+            # released with them
+            pass
+
+
+class SharedCandleCache:
+    """
+    Node-Local Shared Candle Cache
+    Purpose:
+    - One copy of each (symbol, interval) candle window per machine,
+      shared by every uvicorn worker through multiprocessing.shared_memory
+    - Readers map the window zero-copy, without locks; a frame is only
+      intact for two refreshes, so callers that keep it copy it first
+      (MarketDataRouter does)
+    - A stale window is refreshed by a single writer (per-key file lock);
+      workers asking at the same time wait for it and read its result,
+      so upstream calls do not scale with the number of workers
+    - Windows larger than the capacity bypass the cache
+    - Every attached process holds a shared flock on the segment's
+      .attach file; the last one to close unlinks the segment, so a
+      changed capacity or namespace leaves nothing behind in /dev/shm
+      (after a crash: `unlink`, or remove /dev/shm/<namespace>-*)
+    """
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        namespace: str = "candles",
+        capacity: int = 5000,
+        max_age: float = 30.0,
+        lock_dir: str | None = None
+    ):
+        self.namespace = namespace
+        self.capacity = capacity
+        self.max_age = max_age
+        self.lock_dir = lock_dir or os.path.join(tempfile.gettempdir(), f"{namespace}-locks")
+
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+        self._segments = {}
+        self._attachments = {}
+        self._mutex = threading.Lock()
+        self._counters = defaultdict(int)
+
+    @classmethod
+    def shared(cls):
+        with cls._lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    namespace=os.getenv("SHARED_CANDLES_NAMESPACE", "candles"),
+                    capacity=int(os.getenv("SHARED_CANDLES_BARS", "5000")),
+                    max_age=float(os.getenv("SHARED_CANDLES_MAX_AGE", "30"))
+                )
+
+            return cls._shared
+
+    @classmethod
+    def shutdown(cls):
+        with cls._lock:
+            if cls._shared is not None:
+                cls._shared.close()
+                cls._shared = None
+
+    # ==============================
+    # SEGMENTS
+    # ==============================
+
+    def _name(self, symbol: str, interval: str) -> str:
+        return segment_name(self.namespace, self.capacity, symbol, interval)
+
+    def _segment(self, symbol: str, interval: str) -> CandleSegment:
+        key = (symbol, interval)
+        segment = self._segments.get(key)
+
+        if segment is not None:
+            return segment
+
+        # Create / attach under the key lock: nobody maps a segment
+        # before it has been sized
+        with self._key_lock(symbol, interval):
+            opened = CandleSegment(self._open(self._name(symbol, interval)), self.capacity)
+            attachment = self._attach(symbol, interval)
+
+        with self._mutex:
+            segment = self._segments.setdefault(key, opened)
+
+            if segment is opened:
+                self._attachments[key] = attachment
+
+        # Another thread of this process mapped it first
+        if segment is not opened:
+            opened.close()
+            os.close(attachment)
+
+        return segment
+
+    def _open(self, name: str) -> shared_memory.SharedMemory:
+        size = segment_size(self.capacity)
+
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            shm = shared_memory.SharedMemory(name=name)
+
+        # The segment outlives any one worker: keep the resource tracker
+        # from unlinking it when this process exits
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+        return shm
+
+    def _key_lock(self, symbol: str, interval: str):
+        return _FileLock(os.path.join(self.lock_dir, self._name(symbol, interval) + ".lock"))
+
+    def _attach(self, symbol: str, interval: str) -> int:
+        """
+        Shared flock held while this process maps the segment (key lock held)
+        """
+
+        path = os.path.join(self.lock_dir, self._name(symbol, interval) + ".attach")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_SH)
+
+        return fd
+
+    def _detach(self, symbol: str, interval: str, fd: int):
+        """
+        Release this process's attachment; unlink the segment if no
+        other process holds one (checked under the key lock, so nobody
+        attaches in between)
+        """
+
+        with self._key_lock(symbol, interval):
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                last = False
+            else:
+                last = True
+            finally:
+                os.close(fd)
+
+            if last:
+                self.unlink(symbol, interval)
+
+    # ==============================
+    # READ / REFRESH
+    # ==============================
+
+    def get(self, symbol: str, interval: str, limit: int, fetch) -> pd.DataFrame:
+        """
+        Last `limit` candles; `fetch(symbol, interval, limit)` refreshes
+        a stale or too-short window (one caller per key at a time)
+        """
+
+        if limit > self.capacity:
+            self._counters["bypass"] += 1
+            return fetch(symbol, interval, limit)
+
+        segment = self._segment(symbol, interval)
+        snapshot = segment.snapshot()
+
+        if self._usable(snapshot, limit):
+            self._counters["hits"] += 1
+            return self._frame(segment, snapshot, limit)
+
+        with self._key_lock(symbol, interval) as lock:
+            if lock.waited:
+                self._counters["waits"] += 1
+
+            # Another worker may have refreshed while we waited
+            snapshot = segment.snapshot()
+
+            if self._usable(snapshot, limit):
+                self._counters["hits"] += 1
+                return self._frame(segment, snapshot, limit)
+
+            # Keep serving the widest window any worker asked for
+            fetch_limit = min(self.capacity, max(limit, snapshot[2]))
+            df = fetch(symbol, interval, fetch_limit)
+
+            segment.publish(self.columns(df, self.capacity), fetch_limit)
+            self._counters["refreshes"] += 1
+
+            return self._frame(segment, segment.snapshot(), limit)
+
+    def peek(self, symbol: str, interval: str, limit: int) -> pd.DataFrame | None:
+        """
+        Fresh window already in shared memory, else None (never fetches)
+        """
+
+        if limit > self.capacity:
+            return None
+
+        segment = self._segment(symbol, interval)
+        snapshot = segment.snapshot()
+
+        if not self._usable(snapshot, limit):
+            return None
+
+        self._counters["hits"] += 1
+        return self._frame(segment, snapshot, limit)
+
+    def _usable(self, snapshot, limit: int) -> bool:
+        seq, bars, fetched_limit, updated_at = snapshot
+
+        if bars == 0:
+            return False
+
+        # Provider returned fewer bars than asked: that is all there is
+        if bars < limit and fetched_limit < limit:
+            return False
+
+        return time.time() * 1000 - updated_at < self.max_age * 1000
+
+    def _frame(self, segment: CandleSegment, snapshot, limit: int) -> pd.DataFrame:
+        seq, bars = snapshot[0], snapshot[1]
+        window = segment.window(seq, bars)[:, -limit:]
+
+        frame = pd.DataFrame(
+            {
+                # Open times as int64 ms (same as exchange frames)
+                "timestamp": window[0].astype(np.int64),
+                **{field: window[i] for i, field in enumerate(FIELDS) if i}
+            },
+            copy=False
+        )
+        frame.attrs["shared_seq"] = (segment.shm.name, seq)
+
+        return frame
+
+    @staticmethod
+    def columns(df: pd.DataFrame, capacity: int) -> np.ndarray:
+        """
+        OHLCV frame (either provider) → (fields × bars) float64, newest last
+        """
+
+        df = df.tail(capacity)
+        columns = np.empty((len(FIELDS), len(df)))
+
+        columns[0] = open_times_ms(df)
+
+        for i, field in enumerate(FIELDS[1:], start=1):
+            columns[i] = df[field].to_numpy(dtype=float) if field in df.columns else 0.0
+
+        return columns
+
+    def valid(self, frame: pd.DataFrame) -> bool:
+        """
+        True while the writer has not started overwriting the buffer
+        behind `frame` (two refreshes later)
+        """
+
+        token = frame.attrs.get("shared_seq")
+
+        if token is None:
+            return True
+
+        name, seq = token
+
+        for segment in list(self._segments.values()):
+            if segment.shm.name == name:
+                return int(segment.header[0]) < segment.overwritten_at(seq)
+
+        return False
+
+    # ==============================
+    # LIFECYCLE / STATS
+    # ==============================
+
+    def stats(self) -> dict:
+        now = time.time() * 1000
+        windows = {}
+
+        for (symbol, interval), segment in list(self._segments.items()):
+            seq, bars, fetched_limit, updated_at = segment.snapshot()
+            windows[f"{symbol}:{interval}"] = {
+                "bars": bars,
+                "generation": seq // 2,
+                "age_s": round((now - updated_at) / 1000, 1) if updated_at else None
+            }
+
+        return {
+            "capacity": self.capacity,
+            "segment_bytes": segment_size(self.capacity),
+            "pid": os.getpid(),
+            **self._counters,
+            "windows": windows
+        }
+
+    def close(self):
+        """
+        Drop this process's mappings; segments stay while other workers
+        are attached, the last one removes them
+        """
+
+        with self._mutex:
+            for key, segment in self._segments.items():
+                segment.close()
+                self._detach(*key, self._attachments.pop(key))
+
+            self._segments.clear()
+
+    def unlink(self, symbol: str, interval: str):
+        """
+        Remove a segment from the machine (ops / tests)
+        """
+
+        try:
+            shm = shared_memory.SharedMemory(name=self._name(symbol, interval))
+        except FileNotFoundError:
+            return
+
+        # unlink() also unregisters from the resource tracker
+        shm.close()
+        shm.unlink()
+
+
+class _FileLock:
+    """
+    Exclusive flock on a per-key file: serializes writers across
+    processes (and threads: each use opens its own descriptor)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.waited = False
+        self._fd = None
+
+    def __enter__(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.waited = True
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
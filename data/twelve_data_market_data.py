@@ -14,47 +14,94 @@ class TwelveDataMarketDataClient:
 
     BASE_URL = "https://api.twelvedata.com/time_series"
 
+    INTERVAL_MAP = {
+        "1m": "1min",
+        "5m": "5min",
+        "15m": "15min",
+        "30m": "30min",
+        "1h": "1h",
+        "4h": "4h",
+        "1d": "1day"
+    }
+
+    # Symbols per batched time_series request
+    BATCH_SIZE = 50
+
     def __init__(self):
         self.api_key = os.getenv("TWELVE_DATA_API_KEY")
 
         if not self.api_key:
             raise ValueError("TWELVE_DATA_API_KEY not found in environment")
 
+    @staticmethod
+    def normalize_symbol(symbol: str) -> str:
+        return symbol if "/" in symbol else f"{symbol[:3]}/{symbol[3:]}"
+
     def fetch_ohlcv(
         self,
         symbol: str,
         interval: str = "1h",
         outputsize: int = 500
     ) -> pd.DataFrame:
-        normalized_symbol = (
-            symbol if "/" in symbol else f"{symbol[:3]}/{symbol[3:]}"
-        )
+        params = {
+            "symbol": self.normalize_symbol(symbol),
+            "interval": self.INTERVAL_MAP.get(interval, interval),
+            "outputsize": outputsize,
+            "apikey": self.api_key,
+            "format": "JSON"
+        }
 
+        response = requests.get(self.BASE_URL, params=params)
+        response.raise_for_status()
 
-        interval_map = {
-    "1m": "1min",
-    "5m": "5min",
-    "15m": "15min",
-    "30m": "30min",
-    "1h": "1h",
-    "4h": "4h",
-    "1d": "1day"
-}
+        return self.to_frame(response.json())
 
-        interval = interval_map.get(interval, interval)
+    def fetch_ohlcv_batch(
+        self,
+        symbols: list[str],
+        interval: str = "1h",
+        outputsize: int = 500
+    ) -> dict:
+        """
+        Several symbols in one time_series request (comma-separated)
+        Returns symbol → DataFrame, or the ValueError for that symbol
+        """
 
         params = {
-            "symbol": normalized_symbol,
-            "interval": interval,
+            "symbol": ",".join(self.normalize_symbol(s) for s in symbols),
+            "interval": self.INTERVAL_MAP.get(interval, interval),
             "outputsize": outputsize,
             "apikey": self.api_key,
             "format": "JSON"
         }
 
-        response = requests.get(self.BASE_URL, params=params)
+        response = requests.get(self.BASE_URL, params=params, timeout=30)
         response.raise_for_status()
-        data = response.json()
 
+        return self.split_batch(response.json(), symbols)
+
+    @classmethod
+    def split_batch(cls, data: dict, symbols: list[str]) -> dict:
+        # A single symbol comes back unwrapped
+        if len(symbols) == 1:
+            data = {cls.normalize_symbol(symbols[0]): data}
+
+        # Request-level failure (bad key, credits): same error for all
+        if data.get("status") == "error":
+            data = {cls.normalize_symbol(s): data for s in symbols}
+
+        frames = {}
+
+        for symbol in symbols:
+            try:
+                frames[symbol] = cls.to_frame(data.get(cls.normalize_symbol(symbol), {}))
+            except ValueError as e:
+                frames[symbol] = e
+
+        return frames
+
+    @staticmethod
+    def to_frame(data: dict) -> pd.DataFrame:
         if "status" in data and data["status"] == "error":
             raise ValueError(f"Twelve Data error: {data.get('message')}")
 
@@ -64,13 +111,6 @@ class TwelveDataMarketDataClient:
             raise ValueError("No data returned from Twelve Data")
 
         df = pd.DataFrame(values)
-        df = df.rename(columns={
-            "open": "open",
-            "high": "high",
-            "low": "low",
-            "close": "close",
-            "volume": "volume"
-        })
 
         # Convert OHLC to float
         df[["open", "high", "low", "close"]] = df[
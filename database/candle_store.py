@@ -0,0 +1,256 @@
+import io
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from data.resampler import OHLCV_COLUMNS, open_times_ms
+from database.models import Candle
+
+
+ROW_DTYPE = np.dtype([
+    ("open_time", "i8"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8")
+])
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+UPSERT_SET = ", ".join(f"{c} = EXCLUDED.{c}" for c in PRICE_COLUMNS)
+
+
+def month_start_ms(year: int, month: int) -> int:
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class CandleStore:
+    """
+    Candle Table Access (no ORM objects)
+    Purpose:
+    - Bulk upserts: COPY into a temp table on PostgreSQL,
+      a single executemany elsewhere (SQLite for local / tests)
+    - Range reads straight from the cursor into NumPy arrays
+    - Monthly open_time partitions created on demand (PostgreSQL)
+    """
+
+    TABLE = Candle.__tablename__
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.postgres = engine.dialect.name == "postgresql"
+        self.mark = "?" if engine.dialect.paramstyle == "qmark" else "%s"
+
+        self._partitions = set()
+
+    # ==============================
+    # SCHEMA
+    # ==============================
+
+    def create_table(self):
+        Candle.__table__.create(self.engine, checkfirst=True)
+
+    def ensure_partitions(self, first_ms: int, last_ms: int):
+        """
+        Monthly partitions covering [first_ms, last_ms] (PostgreSQL only)
+        """
+
+        if not self.postgres:
+            return
+
+        start = datetime.fromtimestamp(first_ms / 1000, timezone.utc)
+        end = datetime.fromtimestamp(last_ms / 1000, timezone.utc)
+
+        year, month = start.year, start.month
+        statements = []
+
+        while (year, month) <= (end.year, end.month):
+            name = f"{self.TABLE}_y{year}m{month:02d}"
+            next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+            if name not in self._partitions:
+                statements.append(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {self.TABLE} "
+                    f"FOR VALUES FROM ({month_start_ms(year, month)}) "
+                    f"TO ({month_start_ms(next_year, next_month)})"
+                )
+                self._partitions.add(name)
+
+            year, month = next_year, next_month
+
+        if statements:
+            with self.engine.begin() as conn:
+                for statement in statements:
+                    conn.exec_driver_sql(statement)
+
+    # ==============================
+    # WRITE
+    # ==============================
+
+    @staticmethod
+    def to_rows(df: pd.DataFrame) -> np.ndarray:
+        """
+        OHLCV frame (timestamp or datetime column) → ROW_DTYPE array
+        """
+
+        rows = np.empty(len(df), dtype=ROW_DTYPE)
+        rows["open_time"] = open_times_ms(df)
+
+        for column in PRICE_COLUMNS:
+            rows[column] = (
+                df[column].to_numpy(dtype="float64")
+                if column in df.columns
+                else np.nan
+            )
+
+        return rows
+
+    def upsert(self, symbol: str, interval: str, candles) -> int:
+        """
+        Insert or update bars (DataFrame or ROW_DTYPE array)
+        """
+
+        rows = candles if isinstance(candles, np.ndarray) else self.to_rows(candles)
+
+        if not len(rows):
+            return 0
+
+        self.ensure_partitions(int(rows["open_time"].min()), int(rows["open_time"].max()))
+
+        if self.postgres:
+            self._copy_upsert(symbol, interval, rows)
+        else:
+            self._executemany_upsert(symbol, interval, rows)
+
+        return len(rows)
+
+    def _executemany_upsert(self, symbol, interval, rows):
+        columns = ["symbol", '"interval"', "open_time", *PRICE_COLUMNS]
+        marks = ", ".join([self.mark] * len(columns))
+
+        sql = (
+            f"INSERT INTO {self.TABLE} ({', '.join(columns)}) VALUES ({marks}) "
+            f'ON CONFLICT (symbol, "interval", open_time) DO UPDATE SET {UPSERT_SET}'
+        )
+
+        # NaN volume → NULL
+        volume = rows["volume"].astype(object)
+        volume[np.isnan(rows["volume"])] = None
+
+        params = zip(
+            [symbol] * len(rows),
+            [interval] * len(rows),
+            rows["open_time"].tolist(),
+            rows["open"].tolist(),
+            rows["high"].tolist(),
+            rows["low"].tolist(),
+            rows["close"].tolist(),
+            volume.tolist()
+        )
+
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(sql, list(params))
+
+    def _copy_upsert(self, symbol, interval, rows):
+        frame = pd.DataFrame(rows)
+        frame.insert(0, "interval", interval)
+        frame.insert(0, "symbol", symbol)
+
+        buffer = io.StringIO()
+        frame.to_csv(buffer, index=False, header=False, na_rep="")
+        buffer.seek(0)
+
+        raw = self.engine.raw_connection()
+
+        try:
+            with raw.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TEMP TABLE candles_load "
+                    f"(LIKE {self.TABLE} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                cursor.copy_expert("COPY candles_load FROM STDIN WITH (FORMAT csv)", buffer)
+                cursor.execute(
+                    f"INSERT INTO {self.TABLE} SELECT * FROM candles_load "
+                    f'ON CONFLICT (symbol, "interval", open_time) DO UPDATE SET {UPSERT_SET}'
+                )
+
+            raw.commit()
+
+        except Exception:
+            raw.rollback()
+            raise
+
+        finally:
+            raw.close()
+
+    # ==============================
+    # READ
+    # ==============================
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        limit: int | None = None
+    ) -> np.ndarray:
+        """
+        Bars with start_ms <= open_time < end_ms, oldest first,
+        as a ROW_DTYPE array (limit → the latest `limit` bars)
+        """
+
+        where = [f"symbol = {self.mark}", f'"interval" = {self.mark}']
+        params = [symbol, interval]
+
+        if start_ms is not None:
+            where.append(f"open_time >= {self.mark}")
+            params.append(int(start_ms))
+
+        if end_ms is not None:
+            where.append(f"open_time < {self.mark}")
+            params.append(int(end_ms))
+
+        sql = (
+            f"SELECT open_time, {', '.join(PRICE_COLUMNS)} FROM {self.TABLE} "
+            f"WHERE {' AND '.join(where)} "
+            f"ORDER BY open_time {'DESC' if limit else 'ASC'}"
+        )
+
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        # DBAPI cursor: plain tuples, no Row / ORM objects
+        with self.engine.connect() as conn:
+            cursor = conn.connection.cursor()
+
+            try:
+                cursor.execute(sql, tuple(params))
+
+                # NULL volume → NaN
+                rows = np.fromiter(
+                    (r if r[5] is not None else (*r[:5], np.nan) for r in cursor),
+                    dtype=ROW_DTYPE
+                )
+            finally:
+                cursor.close()
+
+        return rows[::-1].copy() if limit else rows
+
+    def read_frame(self, symbol: str, interval: str, **kwargs) -> pd.DataFrame:
+        """
+        Same range as read(), in the OHLCV frame layout used by the clients
+        """
+
+        rows = self.read(symbol, interval, **kwargs)
+
+        return pd.DataFrame({
+            "timestamp": rows["open_time"],
+            **{c: rows[c] for c in PRICE_COLUMNS}
+        })[OHLCV_COLUMNS]
+
+    def latest_open_time(self, symbol: str, interval: str) -> int | None:
+        rows = self.read(symbol, interval, limit=1)
+        return int(rows["open_time"][0]) if len(rows) else None
@@ -1,4 +1,4 @@
-from database.session import SessionLocal
+from database.session import SessionLocal, async_session_factory
 
 def get_db():
     db = SessionLocal()
@@ -6,3 +6,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with async_session_factory()() as db:
+        yield db
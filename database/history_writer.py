@@ -0,0 +1,316 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+from data.cache_backend import json_default
+from database.models import AnalysisRecord
+
+
+COLUMNS = (
+    "signal", "trend", "stop_loss", "take_profit",
+    "rr_ratio", "confidence_percent", "trade_allowed", "block_reason"
+)
+
+
+def to_row(kind: str, result: dict, recorded_at: float) -> dict:
+    """
+    analyze_market result / signal → analysis_history row
+    """
+
+    row = {c: result.get(c) for c in COLUMNS}
+
+    for c in ("stop_loss", "take_profit", "rr_ratio", "confidence_percent"):
+        if row[c] is not None:
+            row[c] = float(row[c])
+
+    entry = result.get("entry_price", result.get("entry"))
+
+    row.update({
+        "kind": kind,
+        "created_at": datetime.fromtimestamp(
+            result.get("generated_at") or recorded_at, timezone.utc
+        ).replace(tzinfo=None),
+        "symbol": result.get("symbol") or "",
+        "interval": result.get("interval") or "",
+        "entry": None if entry is None else float(entry),
+        "payload": json.loads(json.dumps(result, default=json_default))
+    })
+
+    return row
+
+
+class HistoryWriter:
+    """
+    Background Analysis History Writer
+    Purpose:
+    - record() only appends to a buffer (no DB work on the request path)
+    - One thread flushes bulk inserts on size or time thresholds
+    - Slow DB → rows accumulate → bigger batches (up to max_batch)
+    - Bounded buffer: request-path records are shed when full (counted),
+      background producers can block instead (backpressure)
+    """
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int = 500,
+        max_batch: int = 5_000,
+        flush_interval: float = 1.0,
+        max_pending: int = 50_000,
+        max_attempts: int = 5,
+        base_backoff: float = 0.5
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+
+        self._cond = threading.Condition()
+        self._buffer = deque()
+        self._in_flight = 0
+        self._flush_now = False
+        self._thread = None
+        self._stopping = False
+
+        self._counters = defaultdict(int)
+        self._flush_ms = deque(maxlen=100)
+
+        # Log lines from the writer thread: one per bad kind and one
+        # per outage, the counters keep the totals
+        self._invalid_kinds = set()
+        self._failing = False
+
+    @classmethod
+    def shared(cls):
+        """
+        Writer used by analyze_market / the scanner when
+        ANALYSIS_HISTORY=1, else None
+        """
+
+        if os.getenv("ANALYSIS_HISTORY") != "1":
+            return None
+
+        with cls._lock:
+            if cls._shared is None:
+                from database.session import SessionLocal
+                cls._shared = cls(SessionLocal)
+                cls._shared.start()
+
+            return cls._shared
+
+    @classmethod
+    def shutdown(cls, timeout: float = 10.0):
+        with cls._lock:
+            writer, cls._shared = cls._shared, None
+
+        if writer is not None:
+            writer.stop(timeout)
+
+    # ==============================
+    # PRODUCER SIDE
+    # ==============================
+
+    def record(
+        self,
+        kind: str,
+        result: dict,
+        block: bool = False,
+        timeout: float = 5.0
+    ) -> bool:
+        """
+        Buffer one result; False if shed because the buffer is full
+        """
+
+        item = (kind, dict(result), time.time())
+
+        with self._cond:
+            if len(self._buffer) >= self.max_pending:
+                deadline = time.monotonic() + timeout
+
+                while block and len(self._buffer) >= self.max_pending:
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0 or self._stopping:
+                        break
+
+                    self._counters["blocked"] += 1
+                    self._cond.wait(remaining)
+
+                if len(self._buffer) >= self.max_pending:
+                    self._counters["dropped"] += 1
+                    return False
+
+            self._buffer.append(item)
+            self._counters["recorded"] += 1
+
+            if len(self._buffer) == self.batch_size:
+                self._cond.notify_all()
+
+            return True
+
+    # ==============================
+    # LIFECYCLE
+    # ==============================
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._write_loop, name="history-writer", daemon=True
+        )
+        self._thread.start()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Wait until every buffered row is written
+        """
+
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while self._buffer or self._in_flight:
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    return False
+
+                self._flush_now = True
+                self._cond.notify_all()
+                self._cond.wait(min(remaining, 0.05))
+
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        self.flush(timeout)
+
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    # ==============================
+    # WRITER
+    # ==============================
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+
+                while (
+                    len(self._buffer) < self.batch_size
+                    and not self._flush_now
+                    and not self._stopping
+                ):
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        break
+
+                    self._cond.wait(remaining)
+
+                if self._stopping and not self._buffer:
+                    return
+
+                self._flush_now = False
+
+                take = min(len(self._buffer), self.max_batch)
+                batch = [self._buffer.popleft() for _ in range(take)]
+                self._in_flight = take
+
+                # Space freed for blocked producers
+                self._cond.notify_all()
+
+            if batch:
+                self._write(batch)
+
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _write(self, batch: list):
+        rows = []
+
+        for kind, result, recorded_at in batch:
+            try:
+                rows.append(to_row(kind, result, recorded_at))
+            except Exception as e:
+                self._counters["invalid"] += 1
+
+                if kind not in self._invalid_kinds:
+                    self._invalid_kinds.add(kind)
+                    print(f"[HISTORY] skipping unserializable {kind}: {e}")
+
+        if not rows:
+            return
+
+        last_error = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            started = time.perf_counter()
+
+            try:
+                with self.session_factory() as session:
+                    session.execute(insert(AnalysisRecord), rows)
+                    session.commit()
+
+            except Exception as e:
+                self._counters["failures"] += 1
+                last_error = e
+
+                if attempt < self.max_attempts and not self._stopping:
+                    time.sleep(self.base_backoff * 2 ** (attempt - 1))
+                continue
+
+            self._flush_ms.append((time.perf_counter() - started) * 1000)
+            self._counters["batches"] += 1
+            self._counters["written"] += len(rows)
+
+            if last_error is not None:
+                self._report(f"[HISTORY] {len(rows)} rows written after {attempt} attempts: {last_error}")
+            elif self._failing:
+                self._failing = False
+                print(f"[HISTORY] writes recovered ({self._counters['lost']} rows lost so far)")
+            return
+
+        self._counters["lost"] += len(rows)
+        self._report(f"[HISTORY ERROR] {len(rows)} rows lost after {self.max_attempts} attempts: {last_error}")
+
+    def _report(self, message: str):
+        # First retried / lost batch of an outage only, until a batch
+        # goes through on its first attempt
+        if not self._failing:
+            self._failing = True
+            print(message)
+
+    # ==============================
+    # STATS
+    # ==============================
+
+    def stats(self) -> dict:
+        with self._cond:
+            samples = sorted(self._flush_ms)
+
+            return {
+                "pending": len(self._buffer),
+                "in_flight": self._in_flight,
+                **self._counters,
+                "flush_p50_ms": round(samples[len(samples) // 2], 1) if samples else None,
+                "flush_max_ms": round(samples[-1], 1) if samples else None
+            }
@@ -1,8 +1,11 @@
 from database.base import Base
 from database.session import engine
 from database import models
+from database.migrate import upgrade
 
 def init_db():
+    # Existing tables first: create_all never alters them
+    upgrade(engine)
     Base.metadata.create_all(bind=engine)
 
 if __name__ == "__main__":
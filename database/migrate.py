@@ -0,0 +1,95 @@
+from sqlalchemy import inspect, literal, text
+from sqlalchemy.schema import CreateIndex
+
+from database.base import Base
+from database import models
+
+
+# Columns of the former models.user / db.base schema
+RENAMED = {
+    "users": {"username": "name", "phone": "whatsapp_number"}
+}
+
+
+def column_ddl(column, dialect) -> str:
+    """
+    ADD COLUMN clause for a model column missing from its table
+    Always nullable (existing rows have no value); a scalar default
+    is applied to those rows
+    """
+
+    ddl = f"{column.name} {column.type.compile(dialect=dialect)}"
+    default = column.default
+
+    if default is not None and default.is_scalar:
+        value = literal(default.arg, column.type).compile(
+            dialect=dialect, compile_kwargs={"literal_binds": True}
+        )
+        ddl += f" DEFAULT {value}"
+
+    return ddl
+
+
+def plan(engine) -> list[str]:
+    """
+    Statements bringing existing tables up to database.models
+    (missing tables are left to create_all)
+    """
+
+    inspector = inspect(engine)
+    dialect = engine.dialect
+    statements = []
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+
+        for old, new in RENAMED.get(table.name, {}).items():
+            if old in existing and new not in existing:
+                statements.append(f"ALTER TABLE {table.name} RENAME COLUMN {old} TO {new}")
+                existing = (existing - {old}) | {new}
+
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            statements.append(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl(column, dialect)}")
+
+            # ADD COLUMN cannot carry UNIQUE on every backend
+            if column.unique:
+                statements.append(
+                    f"CREATE UNIQUE INDEX uq_{table.name}_{column.name} "
+                    f"ON {table.name} ({column.name})"
+                )
+
+        indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+
+        for index in table.indexes:
+            if index.name not in indexes:
+                statements.append(str(CreateIndex(index).compile(dialect=dialect)))
+
+    return statements
+
+
+def upgrade(engine) -> list[str]:
+    """
+    Apply plan() in one transaction; returns the statements run
+    (none once the schema is current)
+    """
+
+    statements = plan(engine)
+
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+
+    return statements
+
+
+if __name__ == "__main__":
+    from database.session import engine
+
+    for statement in upgrade(engine):
+        print(f"{statement};")
@@ -1,4 +1,9 @@
-from sqlalchemy import Column, Integer, Float, String, Boolean
+from datetime import datetime
+
+from sqlalchemy import (
+    JSON, BigInteger, Boolean, Column, DateTime, Float, ForeignKey, Index,
+    Integer, String
+)
 from database.base import Base
 
 class User(Base):
@@ -16,3 +21,70 @@ class User(Base):
 
     receive_signals = Column(Boolean, default=True)
     receive_high_profit_only = Column(Boolean, default=False)
+
+    email = Column(String, nullable=True)
+    clerk_id = Column(String, unique=True, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class UserSettings(Base):
+    __tablename__ = "user_settings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    account_balance = Column(Float, nullable=False)
+    risk_percent = Column(Float, nullable=False)
+    max_lot_size = Column(Float, nullable=True)
+    confidence_threshold = Column(Float, default=70.0)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AnalysisRecord(Base):
+    """
+    One analyze_market result or dispatched signal (audit / hit rates)
+    """
+
+    __tablename__ = "analysis_history"
+    __table_args__ = (
+        Index("ix_analysis_history_symbol_interval_ts", "symbol", "interval", "created_at"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    kind = Column(String(16), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    symbol = Column(String(20), nullable=False)
+    interval = Column(String(8), nullable=False)
+
+    signal = Column(String(16))
+    trend = Column(String(16))
+    entry = Column(Float)
+    stop_loss = Column(Float)
+    take_profit = Column(Float)
+    rr_ratio = Column(Float)
+    confidence_percent = Column(Float)
+    trade_allowed = Column(Boolean)
+    block_reason = Column(String(32))
+
+    payload = Column(JSON)
+
+
+class Candle(Base):
+    """
+    OHLCV bar; range-partitioned by open_time on PostgreSQL
+    (partitions created by CandleStore)
+    """
+
+    __tablename__ = "candles"
+    __table_args__ = {"postgresql_partition_by": "RANGE (open_time)"}
+
+    symbol = Column(String(20), primary_key=True)
+    interval = Column(String(8), primary_key=True)
+    open_time = Column(BigInteger, primary_key=True)
+
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float)
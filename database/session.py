@@ -1,7 +1,12 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import threading
+import time
+from collections import defaultdict
+
 from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
 
 load_dotenv()  # Make sure this is present
 
@@ -9,8 +14,207 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL is None:
     raise RuntimeError("DATABASE_URL is not set!")
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True
-)
+
+# ==============================
+# POOL CONFIG
+# ==============================
+
+def pool_options(prefix: str = "DB") -> dict:
+    """
+    Explicit pool sizing per process (env overrides):
+    at most pool_size + max_overflow connections per engine
+    """
+
+    return {
+        "pool_size": int(os.getenv(f"{prefix}_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv(f"{prefix}_MAX_OVERFLOW", "5")),
+        "pool_timeout": float(os.getenv(f"{prefix}_POOL_TIMEOUT", "10")),
+        "pool_recycle": int(os.getenv(f"{prefix}_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True
+    }
+
+
+QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "256"))
+
+
+def normalize_url(url: str):
+    """
+    postgres:// (Heroku / Render style) → postgresql://
+    A bare postgresql:// uses psycopg2 (the installed driver; newer
+    SQLAlchemy would pick psycopg 3)
+    """
+
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+
+    url = make_url(url)
+
+    if url.drivername == "postgresql":
+        url = url.set(drivername="postgresql+psycopg2")
+
+    return url
+
+
+def async_url(url: str):
+    """
+    Same database through an asyncio driver (asyncpg / aiosqlite)
+    """
+
+    url = normalize_url(url)
+    backend = url.get_backend_name()
+
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+
+    if backend != "postgresql":
+        raise ValueError(f"No async driver configured for {backend}")
+
+    query = dict(url.query)
+
+    # libpq's sslmode is spelled ssl for asyncpg
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+
+    query["prepared_statement_cache_size"] = str(PREPARED_STATEMENT_CACHE_SIZE)
+
+    return url.set(drivername="postgresql+asyncpg", query=query)
+
+
+# ==============================
+# POOL METRICS
+# ==============================
+
+class PoolMetrics:
+    """
+    Connection pool counters from pool events
+    - connects: new DBAPI connections (pool growth / recycle)
+    - checkouts / checkins, invalidations
+    - max_checked_out: high-water mark of concurrent use
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.counters = defaultdict(int)
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkout_seconds = 0.0
+        self._since = {}
+        self._lock = threading.Lock()
+
+        pool = engine.pool if hasattr(engine, "pool") else engine.sync_engine.pool
+
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, record):
+        with self._lock:
+            self.counters["connects"] += 1
+
+    def _on_checkout(self, dbapi_connection, record, proxy):
+        with self._lock:
+            self.counters["checkouts"] += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self._since[id(record)] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_connection, record):
+        with self._lock:
+            started = self._since.pop(id(record), None)
+
+            if started is not None:
+                self.counters["checkins"] += 1
+                self.checked_out -= 1
+                self.checkout_seconds += time.perf_counter() - started
+
+    def _on_invalidate(self, dbapi_connection, record, exception):
+        with self._lock:
+            self.counters["invalidations"] += 1
+
+    def snapshot(self) -> dict:
+        engine = getattr(self.engine, "sync_engine", self.engine)
+        pool = engine.pool
+
+        with self._lock:
+            checkins = self.counters["checkins"]
+
+            stats = {
+                "pool": type(pool).__name__,
+                **self.counters,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "avg_checkout_ms": (
+                    round(self.checkout_seconds / checkins * 1000, 2) if checkins else None
+                )
+            }
+
+        # QueuePool sizing (absent on SQLite's single-connection pools)
+        for name in ("size", "checkedin", "overflow"):
+            if hasattr(pool, name):
+                stats[name] = getattr(pool, name)()
+
+        return stats
+
+
+# ==============================
+# ENGINES
+# ==============================
+
+def build_engine(url: str, **overrides):
+    url = normalize_url(url)
+    options = {"query_cache_size": QUERY_CACHE_SIZE}
+
+    # In-memory / file SQLite (local, tests) keeps SQLAlchemy's own pool
+    if url.get_backend_name() != "sqlite":
+        options.update(pool_options())
+
+    options.update(overrides)
+
+    return create_engine(url, **options)
+
+
+engine = build_engine(DATABASE_URL)
+pool_metrics = PoolMetrics(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+_async_lock = threading.Lock()
+_async_metrics = None
+_async_sessionmaker = None
+
+
+def async_session_factory():
+    """
+    AsyncSession factory for async FastAPI handlers (created on first
+    use: needs asyncpg, or aiosqlite for SQLite)
+    """
+
+    global _async_metrics, _async_sessionmaker
+
+    with _async_lock:
+        if _async_sessionmaker is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+            url = async_url(DATABASE_URL)
+            options = {"query_cache_size": QUERY_CACHE_SIZE}
+
+            if url.get_backend_name() != "sqlite":
+                options.update(pool_options("DB_ASYNC"))
+
+            async_engine = create_async_engine(url, **options)
+            _async_metrics = PoolMetrics(async_engine)
+
+            _async_sessionmaker = async_sessionmaker(
+                async_engine, autoflush=False, expire_on_commit=False
+            )
+
+        return _async_sessionmaker
+
+
+def pool_stats() -> dict:
+    return {
+        "sync": pool_metrics.snapshot(),
+        "async": _async_metrics.snapshot() if _async_metrics else None
+    }
@@ -0,0 +1,381 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+from sqlalchemy import and_, select
+
+from data.cache_backend import CacheBackend, CacheError
+from database.models import User, UserSettings
+
+
+USER_COLUMNS = (
+    User.id,
+    User.name,
+    User.whatsapp_number,
+    User.account_balance,
+    User.risk_percent,
+    User.min_lot,
+    User.max_lot,
+    User.receive_signals,
+    User.receive_high_profit_only
+)
+
+SETTINGS_COLUMNS = (
+    UserSettings.account_balance,
+    UserSettings.risk_percent,
+    UserSettings.max_lot_size,
+    UserSettings.confidence_threshold
+)
+
+
+def effective_row(row) -> dict:
+    """
+    User row + active settings → the values used for sizing / delivery
+    (settings override the user's defaults when present)
+    """
+
+    (user_id, name, number, balance, risk, min_lot, max_lot,
+     receive, high_profit_only,
+     s_balance, s_risk, s_max_lot, s_confidence) = row
+
+    max_lot = 1.0 if max_lot is None else max_lot
+
+    if s_max_lot is not None:
+        max_lot = min(max_lot, s_max_lot)
+
+    return {
+        "id": user_id,
+        "name": name,
+        "whatsapp_number": number,
+        "account_balance": s_balance if s_balance is not None else balance,
+        "risk_percent": s_risk if s_risk is not None else (1.0 if risk is None else risk),
+        "min_lot": 0.001 if min_lot is None else min_lot,
+        "max_lot": max_lot,
+        "confidence_threshold": s_confidence,
+        "receive_signals": receive is not False,
+        "receive_high_profit_only": high_profit_only is True
+    }
+
+
+class UserSettingsCache:
+    """
+    Read-Through User Settings Cache
+    Purpose:
+    - User rows joined with their active settings, keyed by user id
+    - Bounded LRU for single-user reads (request path)
+    - Recipient snapshot (NumPy columns) for the fan-out, reloaded only
+      after a change, not per signal
+    - Version stamps: a write bumps the user's (and the global) version;
+      rows loaded before the bump are never served
+    - Writes publish a stamp through the CacheBackend; other workers
+      drop their entries when they see it change (checked at most
+      every `sync_interval`), max_age bounds staleness if it is down
+    """
+
+    VERSION_KEY = "users:version"
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        session_factory,
+        max_size: int = 50_000,
+        max_age: float = 300.0,
+        backend: CacheBackend | None = None,
+        sync_interval: float = 1.0
+    ):
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.max_age = max_age
+        self.backend = backend
+        self.sync_interval = sync_interval
+
+        self._remote_stamp = None
+        self._synced_at = None
+        self._publish_failing = False
+
+        self._entries = OrderedDict()
+        self._versions = defaultdict(int)
+        self._global_version = 0
+        self._epoch = 0
+        self._snapshot = None
+        self._mutex = threading.RLock()
+
+        self._counters = defaultdict(int)
+
+    @classmethod
+    def shared(cls):
+        with cls._lock:
+            if cls._shared is None:
+                from database.session import SessionLocal
+                cls._shared = cls(SessionLocal, backend=CacheBackend.shared())
+
+            return cls._shared
+
+    # ==============================
+    # QUERIES
+    # ==============================
+
+    @staticmethod
+    def query():
+        return (
+            select(*USER_COLUMNS, *SETTINGS_COLUMNS)
+            .outerjoin(
+                UserSettings,
+                and_(
+                    UserSettings.user_id == User.id,
+                    UserSettings.is_active.is_not(False)
+                )
+            )
+            # Latest active settings row wins
+            .order_by(User.id, UserSettings.id)
+        )
+
+    def _load(self, user_id: int | None = None) -> dict:
+        query = self.query()
+
+        if user_id is not None:
+            query = query.where(User.id == user_id)
+
+        rows = {}
+
+        with self.session_factory() as db:
+            for row in db.execute(query):
+                rows[row[0]] = effective_row(row)
+
+        self._counters["queries"] += 1
+        return rows
+
+    # ==============================
+    # SINGLE USERS
+    # ==============================
+
+    def get(self, user_id: int) -> dict | None:
+        """
+        Effective settings of one user (None if unknown)
+        """
+
+        now = time.monotonic()
+        self._sync(now)
+
+        with self._mutex:
+            entry = self._entries.get(user_id)
+
+            if entry is not None:
+                version, loaded_at, row = entry
+
+                if version == self._version(user_id) and now - loaded_at < self.max_age:
+                    self._entries.move_to_end(user_id)
+                    self._counters["hits"] += 1
+                    return row
+
+            self._counters["misses"] += 1
+            version = self._version(user_id)
+
+        row = self._load(user_id).get(user_id)
+
+        with self._mutex:
+            self._store(user_id, version, now, row)
+
+        return row
+
+    def _version(self, user_id: int) -> tuple:
+        # Lock held
+        return self._epoch, self._versions.get(user_id, 0)
+
+    def _store(self, user_id, version, loaded_at, row):
+        # Lock held; a write since the load leaves the entry stale
+        if version != self._version(user_id):
+            return
+
+        self._entries[user_id] = (version, loaded_at, row)
+        self._entries.move_to_end(user_id)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def invalidate(self, user_id: int | None = None):
+        """
+        After a write: bump the user's version (None → every user)
+        and publish it to the other workers
+        """
+
+        self._bump(user_id)
+
+        if self.backend is None:
+            return
+
+        stamp = uuid.uuid4().hex.encode()
+
+        try:
+            self.backend.set(self.VERSION_KEY, stamp)
+        except CacheError as e:
+            self._counters["sync_errors"] += 1
+
+            # Logged once per outage; sync_errors keeps the count
+            if not self._publish_failing:
+                self._publish_failing = True
+                print(f"[USER CACHE] invalidation not published: {e}")
+            return
+
+        if self._publish_failing:
+            self._publish_failing = False
+            print("[USER CACHE] invalidations published again")
+
+        with self._mutex:
+            # Our own write: already applied locally
+            self._remote_stamp = stamp
+
+    def _bump(self, user_id: int | None):
+        with self._mutex:
+            if user_id is None:
+                self._epoch += 1
+                self._entries.clear()
+            else:
+                self._versions[user_id] += 1
+                self._entries.pop(user_id, None)
+
+            self._global_version += 1
+            self._counters["invalidations"] += 1
+
+    def _sync(self, now: float):
+        """
+        Apply writes made by other workers: a changed published stamp
+        drops every entry and the snapshot (writes are rare)
+        """
+
+        if self.backend is None:
+            return
+
+        with self._mutex:
+            first = self._synced_at is None
+
+            if not first and now - self._synced_at < self.sync_interval:
+                return
+
+            self._synced_at = now
+
+        try:
+            stamp = self.backend.get(self.VERSION_KEY)
+        except CacheError:
+            self._counters["sync_errors"] += 1
+            return
+
+        with self._mutex:
+            changed = stamp != self._remote_stamp
+            self._remote_stamp = stamp
+
+        # First sync only adopts the stamp (nothing cached before it)
+        if changed and not first:
+            self._bump(None)
+            self._counters["remote_invalidations"] += 1
+
+    # ==============================
+    # BULK
+    # ==============================
+
+    def warm(self) -> int:
+        """
+        Load every user with one query (startup): fills the LRU and the
+        fan-out snapshot
+        """
+
+        now = time.monotonic()
+
+        with self._mutex:
+            global_version = self._global_version
+            epoch, versions = self._epoch, dict(self._versions)
+
+        rows = self._load()
+
+        with self._mutex:
+            for user_id, row in rows.items():
+                self._store(user_id, (epoch, versions.get(user_id, 0)), now, row)
+
+            # Stamped with the version read before the query: a write
+            # during the load makes it stale straight away
+            self._snapshot = (global_version, now, self._views(rows.values()))
+
+        return len(rows)
+
+    @classmethod
+    def _views(cls, rows) -> dict:
+        """
+        high_profit → recipient columns (all / not high-profit-only)
+        """
+
+        columns = cls._columns(rows)
+        keep = np.flatnonzero(~columns["high_profit_only"])
+
+        return {
+            True: columns,
+            False: {
+                name: (
+                    values[keep]
+                    if isinstance(values, np.ndarray)
+                    else [values[i] for i in keep.tolist()]
+                )
+                for name, values in columns.items()
+            }
+        }
+
+    @staticmethod
+    def _columns(rows) -> dict:
+        rows = [r for r in rows if r["receive_signals"]]
+
+        def column(name, dtype=float):
+            return np.array(
+                [np.nan if r[name] is None else r[name] for r in rows], dtype=dtype
+            )
+
+        return {
+            "id": [r["id"] for r in rows],
+            "number": [r["whatsapp_number"] for r in rows],
+            "balance": column("account_balance"),
+            "risk_percent": column("risk_percent"),
+            "min_lot": column("min_lot"),
+            "max_lot": column("max_lot"),
+            "confidence_threshold": column("confidence_threshold"),
+            "high_profit_only": np.array(
+                [r["receive_high_profit_only"] for r in rows], dtype=bool
+            )
+        }
+
+    def recipients(self, high_profit: bool) -> dict:
+        """
+        Column arrays of users receiving a signal (fan-out input)
+        """
+
+        self._sync(time.monotonic())
+
+        with self._mutex:
+            snapshot = self._snapshot
+            current = (
+                snapshot is not None
+                and snapshot[0] == self._global_version
+                and time.monotonic() - snapshot[1] < self.max_age
+            )
+
+        if current:
+            self._counters["snapshot_hits"] += 1
+        else:
+            self.warm()
+
+            with self._mutex:
+                snapshot = self._snapshot
+
+        return snapshot[2][bool(high_profit)]
+
+    def stats(self) -> dict:
+        with self._mutex:
+            return {
+                "entries": len(self._entries),
+                "max_size": self.max_size,
+                "version": self._global_version,
+                "snapshot_users": len(self._snapshot[2][True]["id"]) if self._snapshot else None,
+                **self._counters
+            }
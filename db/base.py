@@ -1,4 +1,5 @@
-from sqlalchemy.orm import DeclarativeBase
+# Removed: moved to 'deprecated/db/base.py' on 2026-10-19
+# Backup location: deprecated/db/base.py
+# Use database.base instead (single engine / Base / models).
 
-class Base(DeclarativeBase):
-    pass
+raise ImportError("db.base has been removed and backed up at deprecated/db/base.py; use database.base")
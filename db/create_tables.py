@@ -1,7 +1,5 @@
-from db.database import engine
-from db.base import Base
-from models.user import User
-from models.user_settings import UserSettings
+# Removed: moved to 'deprecated/db/create_tables.py' on 2026-10-19
+# Backup location: deprecated/db/create_tables.py
+# Use database.init_db instead (single engine / Base / models).
 
-Base.metadata.create_all(bind=engine)
-print("✅ Tables created successfully")
+raise ImportError("db.create_tables has been removed and backed up at deprecated/db/create_tables.py; use database.init_db")
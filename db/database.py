@@ -1,29 +1,5 @@
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
+# Removed: moved to 'deprecated/db/database.py' on 2026-10-19
+# Backup location: deprecated/db/database.py
+# Use database.session / database.deps instead (single engine / Base / models).
 
-load_dotenv()
-
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL is not set")
-
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True
-)
-
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+raise ImportError("db.database has been removed and backed up at deprecated/db/database.py; use database.session / database.deps")
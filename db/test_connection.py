@@ -1,4 +1,4 @@
-from db.database import engine
+from database.session import engine
 
 try:
     conn = engine.connect()
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from db.base import Base
+from datetime import datetime
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True, index=True)
+    username = Column(String(50), unique=True, nullable=False)
+    phone = Column(String(20), unique=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,3 +1,6 @@
+from risk.instrument_registry import instrument_registry
+
+
 class MT5Bridge:
     """
     Generates MT5-compatible trade instructions
@@ -5,12 +8,19 @@ class MT5Bridge:
 
     @staticmethod
     def generate(order):
-        lots = round(order.units / 100_000, 2)
+        symbol = order.instrument.replace("_", "")
+
+        # Lots follow the instrument's contract size (100k FX,
+        # 100 oz gold, 1 BTC), not a fixed 100k
+        lots = order.lots
+
+        if lots is None:
+            lots = order.units / instrument_registry.spec(symbol).lot_size
 
         return {
-            "symbol": order.instrument.replace("_", ""),
+            "symbol": symbol,
             "action": order.side.upper(),
-            "volume_lots": lots,
+            "volume_lots": round(lots, 2),
             "order_type": "MARKET",
             "stop_loss": order.stop_loss,
             "take_profit": order.take_profit,
@@ -0,0 +1,529 @@
+import glob
+import json
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+
+from execution.order_builder import OrderBuilder
+from execution.brokers.mt5 import MT5Bridge
+from notifications.dispatch_queue import idempotency_key
+
+
+class FileDropTransport:
+    """
+    Atomic file drop for an EA polling its MQL5/Files folder
+    - outbox/batch-{first_seq}.json, written to a tmp file then renamed
+      (the EA never sees a partial batch)
+    - acks/ack-*.txt written by the EA: one "seq received_at" per line
+    """
+
+    def __init__(self, directory: str):
+        self.outbox = os.path.join(directory, "outbox")
+        self.acks = os.path.join(directory, "acks")
+
+        os.makedirs(self.outbox, exist_ok=True)
+        os.makedirs(self.acks, exist_ok=True)
+
+    def send(self, batch: dict):
+        path = os.path.join(self.outbox, f"batch-{batch['first_seq']:012d}.json")
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, "w") as f:
+            json.dump(batch, f, separators=(",", ":"), default=float)
+
+        os.replace(tmp_path, path)
+
+    def poll_acks(self) -> list[tuple[int, float]]:
+        acks = []
+
+        for path in sorted(glob.glob(os.path.join(self.acks, "ack-*.txt"))):
+            try:
+                with open(path) as f:
+                    lines = f.read().split("\n")
+                os.remove(path)
+            except OSError:
+                continue
+
+            for line in lines:
+                parts = line.split()
+
+                if parts:
+                    acks.append((
+                        int(parts[0]),
+                        float(parts[1]) if len(parts) > 1 else time.time()
+                    ))
+
+        return acks
+
+    def close(self):
+        pass
+
+
+class SocketTransport:
+    """
+    Local socket queue: the EA connects (MQL5 SocketConnect) and reads
+    one JSON line per batch; it answers with
+    {"ack": [seq, ...], "received_at": ts} lines
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = socket.create_server((host, port))
+        self.address = self._server.getsockname()
+
+        self._clients = []
+        self._acks = deque()
+        self._lock = threading.Lock()
+
+        threading.Thread(
+            target=self._accept_loop, name="mt5-accept", daemon=True
+        ).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            with self._lock:
+                self._clients.append(conn)
+
+            threading.Thread(
+                target=self._read_acks, args=(conn,), name="mt5-acks", daemon=True
+            ).start()
+
+    def _read_acks(self, conn):
+        try:
+            for line in conn.makefile("rb"):
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+
+                received_at = message.get("received_at") or time.time()
+                self._acks.extend((int(seq), received_at) for seq in message.get("ack", []))
+        except OSError:
+            pass
+        finally:
+            self._drop(conn)
+
+    def _drop(self, conn):
+        with self._lock:
+            if conn in self._clients:
+                self._clients.remove(conn)
+
+        conn.close()
+
+    def send(self, batch: dict):
+        line = json.dumps(batch, separators=(",", ":"), default=float).encode() + b"\n"
+        delivered = False
+
+        with self._lock:
+            clients = list(self._clients)
+
+        for conn in clients:
+            try:
+                conn.sendall(line)
+                delivered = True
+            except OSError:
+                self._drop(conn)
+
+        if not delivered:
+            raise ConnectionError("No MT5 consumer connected")
+
+    def poll_acks(self) -> list[tuple[int, float]]:
+        acks = []
+
+        while self._acks:
+            acks.append(self._acks.popleft())
+
+        return acks
+
+    def close(self):
+        self._server.close()
+
+        with self._lock:
+            clients, self._clients = self._clients, []
+
+        for conn in clients:
+            conn.close()
+
+
+class MT5ExportQueue:
+    """
+    Batched MT5 Order Export
+    Purpose:
+    - Analysis → OrderBuilder → MT5Bridge instruction, queued (no I/O on submit)
+    - Background batches to a file drop or local socket consumed by an EA
+    - Monotonic sequence numbers (persisted), dedup by trade key
+    - Acknowledgements tracked; unacked batches re-sent after a timeout
+    - Latency stamps: signal created → exported → acked by the EA
+    """
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        transport,
+        account: str = "mt5",
+        batch_window: float = 0.02,
+        max_batch: int = 100,
+        ack_timeout: float = 30.0,
+        retry_delay: float = 1.0,
+        dedup_size: int = 100_000,
+        state_path: str | None = None,
+        save_interval: float = 1.0
+    ):
+        self.transport = transport
+        self.account = account
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.ack_timeout = ack_timeout
+        self.retry_delay = retry_delay
+        self.dedup_size = dedup_size
+        self.state_path = state_path
+        self.save_interval = save_interval
+
+        self._cond = threading.Condition()
+        self._pending = deque()
+        self._unacked = OrderedDict()
+        self._seen = OrderedDict()
+        self._dirty = False
+        self._saved_at = 0.0
+        self._retry_at = 0.0
+
+        self.seq = 0
+        self._thread = None
+        self._stopping = False
+
+        self._latency = defaultdict(lambda: deque(maxlen=1000))
+        self._counters = defaultdict(int)
+
+        self.load()
+
+    @classmethod
+    def shared(cls):
+        """
+        Exporter used by the scanner, started on first use
+        MT5_EXPORT_DIR → file drop, MT5_EXPORT_PORT → local socket,
+        neither → None
+        """
+
+        directory = os.getenv("MT5_EXPORT_DIR")
+        port = os.getenv("MT5_EXPORT_PORT")
+
+        if not directory and not port:
+            return None
+
+        with cls._lock:
+            if cls._shared is None:
+                transport = (
+                    FileDropTransport(directory)
+                    if directory
+                    else SocketTransport(port=int(port))
+                )
+
+                cls._shared = cls(
+                    transport,
+                    state_path=os.getenv("MT5_EXPORT_STATE_PATH", "state/mt5_export.json")
+                )
+                cls._shared.start()
+
+            return cls._shared
+
+    @classmethod
+    def shutdown(cls, timeout: float = 5.0):
+        with cls._lock:
+            exporter, cls._shared = cls._shared, None
+
+        if exporter is not None:
+            exporter.stop(timeout)
+
+    # ==============================
+    # PRODUCER SIDE
+    # ==============================
+
+    def submit(self, analysis: dict, created_at: float | None = None) -> int | None:
+        """
+        Queue the order for `analysis`; its sequence number, or None
+        when the same trade was already exported
+        """
+
+        key = idempotency_key("mt5", self.account, analysis)
+        order = OrderBuilder.build_from_analysis(analysis)
+
+        created_at = created_at or analysis.get("generated_at") or time.time()
+
+        return self.submit_order(order, key, created_at)
+
+    def submit_order(self, order, key: str, created_at: float) -> int | None:
+        instruction = MT5Bridge.generate(order)
+
+        with self._cond:
+            if key in self._seen:
+                self._counters["duplicates"] += 1
+                return None
+
+            self._seen[key] = True
+
+            while len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+
+            self.seq += 1
+
+            instruction.update({
+                "seq": self.seq,
+                "key": key,
+                "created_at": created_at,
+                "queued_at": time.time()
+            })
+
+            self._pending.append(instruction)
+            self._counters["submitted"] += 1
+            self._dirty = True
+
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+
+            return self.seq
+
+    # ==============================
+    # LIFECYCLE
+    # ==============================
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._export_loop, name="mt5-export", daemon=True
+        )
+        self._thread.start()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Wait until every queued order is exported and acknowledged
+        """
+
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            self._cond.notify()
+
+            while self._pending or self._unacked:
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    return False
+
+                self._cond.wait(min(remaining, self.batch_window))
+
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        self.flush(timeout)
+
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+        self.save()
+        self.transport.close()
+
+    # ==============================
+    # EXPORTER
+    # ==============================
+
+    def _export_loop(self):
+        while True:
+            with self._cond:
+                if len(self._pending) < self.max_batch and not self._stopping:
+                    self._cond.wait(self.batch_window)
+
+                if self._stopping:
+                    return
+
+                now = time.time()
+                batch = self._take_batch(now) if now >= self._retry_at else []
+
+            if batch:
+                self._send(batch)
+
+            self._apply_acks(self.transport.poll_acks())
+
+            if self._dirty and time.time() - self._saved_at >= self.save_interval:
+                self.save()
+
+    def _take_batch(self, now: float) -> list[dict]:
+        """
+        Due re-sends first, then new orders (lock held)
+        """
+
+        batch = []
+
+        # Ordered by last export: stop at the first one not yet due
+        for instruction in self._unacked.values():
+            if len(batch) >= self.max_batch:
+                break
+
+            if now - instruction["exported_at"] < self.ack_timeout:
+                break
+
+            batch.append(instruction)
+
+        resent = len(batch)
+        self._counters["redelivered"] += resent
+
+        while self._pending and len(batch) < self.max_batch:
+            batch.append(self._pending.popleft())
+
+        # Re-sent orders move to the back of the ack-timeout order
+        for instruction in batch[:resent]:
+            self._unacked.move_to_end(instruction["seq"])
+
+        return batch
+
+    def _send(self, batch: list[dict]):
+        exported_at = time.time()
+
+        try:
+            self.transport.send({
+                "first_seq": batch[0]["seq"],
+                "exported_at": exported_at,
+                "orders": [{**i, "exported_at": exported_at} for i in batch]
+            })
+
+        except Exception as e:
+            print(f"[MT5 EXPORT ERROR] {e}")
+
+            with self._cond:
+                self._counters["send_errors"] += 1
+                self._retry_at = exported_at + self.retry_delay
+
+                # New orders go back to the front, in sequence order
+                for instruction in reversed(batch):
+                    if instruction["seq"] not in self._unacked:
+                        self._pending.appendleft(instruction)
+            return
+
+        with self._cond:
+            self._counters["batches"] += 1
+
+            for instruction in batch:
+                instruction["exported_at"] = exported_at
+
+                if instruction["seq"] not in self._unacked:
+                    self._counters["exported"] += 1
+                    self._latency["signal_to_export"].append(
+                        exported_at - instruction["created_at"]
+                    )
+
+                self._unacked[instruction["seq"]] = instruction
+
+            self._dirty = True
+
+    def _apply_acks(self, acks: list[tuple[int, float]]):
+        if not acks:
+            return
+
+        with self._cond:
+            for seq, received_at in acks:
+                instruction = self._unacked.pop(seq, None)
+
+                if instruction is None:
+                    continue
+
+                self._counters["acked"] += 1
+                self._latency["signal_to_ack"].append(
+                    received_at - instruction["created_at"]
+                )
+
+            self._dirty = True
+            self._cond.notify_all()
+
+    # ==============================
+    # PERSISTENCE
+    # ==============================
+
+    def save(self):
+        if not self.state_path:
+            return
+
+        with self._cond:
+            state = {
+                "seq": self.seq,
+                "unacked": list(self._unacked.values()) + list(self._pending),
+                "seen": list(self._seen)
+            }
+            self._dirty = False
+            self._saved_at = time.time()
+
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, default=float)
+
+        os.replace(tmp_path, self.state_path)
+
+    def load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[MT5 EXPORT] ignoring unreadable {self.state_path}: {e}")
+            return
+
+        self.seq = state["seq"]
+        self._seen = OrderedDict.fromkeys(state.get("seen", []), True)
+
+        # Everything not acknowledged before the restart is re-sent
+        for instruction in state.get("unacked", []):
+            instruction.pop("exported_at", None)
+            self._pending.append(instruction)
+
+    # ==============================
+    # STATS
+    # ==============================
+
+    def stats(self) -> dict:
+        with self._cond:
+            latency = {}
+
+            for name, samples in self._latency.items():
+                samples = sorted(samples)
+
+                latency[name] = {
+                    "p50_ms": self._percentile(samples, 0.50),
+                    "p95_ms": self._percentile(samples, 0.95),
+                    "max_ms": round(samples[-1] * 1000, 1) if samples else None
+                }
+
+            return {
+                "seq": self.seq,
+                "pending": len(self._pending),
+                "unacked": len(self._unacked),
+                **self._counters,
+                "latency": latency
+            }
+
+    @staticmethod
+    def _percentile(samples: list, q: float):
+        if not samples:
+            return None
+
+        idx = min(int(q * len(samples)), len(samples) - 1)
+        return round(samples[idx] * 1000, 1)
@@ -1,26 +1,61 @@
+from execution.matching_engine import PaperMatchingEngine
+
+
 class PaperBroker:
     """
     Simulates trade execution without real money
+    Positions live in a PaperMatchingEngine, so SL / TP are filled
+    and settled as prices arrive (on_price / on_bar)
+    With a TradeJournal, trades survive restarts
     """
 
-    def __init__(self, starting_balance: float = 10_000):
-        self.balance = starting_balance
-        self.open_trades = []
+    def __init__(
+        self,
+        starting_balance: float = 10_000,
+        engine: PaperMatchingEngine | None = None,
+        account: str = "default",
+        journal=None
+    ):
+        self.engine = engine or PaperMatchingEngine(starting_balance, journal=journal)
+        self.account = account
+
+        self.engine.open_account(account, starting_balance)
+
+    @property
+    def balance(self) -> float:
+        return self.engine.balance(self.account)
+
+    @property
+    def open_trades(self) -> list[dict]:
+        return self.engine.open_positions(self.account)
+
+    def execute(self, order, entry_price: float):
+        position = self.engine.open_position(
+            account=self.account,
+            symbol=order.instrument.replace("_", ""),
+            side=order.side,
+            units=order.units,
+            entry_price=entry_price,
+            stop_loss=order.stop_loss,
+            take_profit=order.take_profit
+        )
 
-    def execute(self, order):
         trade = {
+            "id": position.id,
             "instrument": order.instrument,
             "side": order.side,
             "units": order.units,
+            "entry_price": entry_price,
             "stop_loss": order.stop_loss,
             "take_profit": order.take_profit,
             "status": "OPEN"
         }
 
-        self.open_trades.append(trade)
-
         return {
             "message": "Paper trade executed",
             "trade": trade,
             "balance": self.balance
         }
+
+    def on_price(self, symbol: str, price: float) -> list[dict]:
+        return self.engine.on_price(symbol, price)
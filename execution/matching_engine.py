@@ -0,0 +1,421 @@
+import heapq
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+
+from risk.instrument_registry import instrument_registry
+
+
+@dataclass
+class PaperPosition:
+    id: int
+    account: str
+    symbol: str
+    side: str
+    units: float
+    entry_price: float
+    stop_loss: float | None
+    take_profit: float | None
+    opened_at: float = field(default_factory=time.time)
+
+    @property
+    def direction(self) -> int:
+        return 1 if self.side == "BUY" else -1
+
+    @property
+    def level_count(self) -> int:
+        """
+        Trigger levels this position puts in its symbol book
+        """
+
+        return (self.stop_loss is not None) + (self.take_profit is not None)
+
+
+class SymbolBook:
+    """
+    Trigger levels of one symbol's open positions
+    - upper: fires when price >= level (BUY take-profit, SELL stop-loss)
+    - lower: fires when price <= level (BUY stop-loss, SELL take-profit)
+    Heaps with lazy deletion: a closed position's other level is
+    discarded when it surfaces
+    """
+
+    def __init__(self):
+        self.upper = []
+        self.lower = []
+        self.stale = 0
+
+    def add(self, position: PaperPosition, seq: int):
+        buy = position.direction == 1
+
+        if position.take_profit is not None:
+            self._push(buy, position.take_profit, seq, position.id, "TP")
+
+        if position.stop_loss is not None:
+            self._push(not buy, position.stop_loss, seq, position.id, "SL")
+
+    def _push(self, upper: bool, level: float, seq: int, position_id: int, kind: str):
+        if upper:
+            heapq.heappush(self.upper, (level, seq, position_id, kind))
+        else:
+            heapq.heappush(self.lower, (-level, seq, position_id, kind))
+
+    def crossed(self, high: float, low: float, is_open) -> list:
+        """
+        Pop every live trigger crossed by [low, high]: (id, kind, level)
+        """
+
+        hits = []
+
+        while self.upper and self.upper[0][0] <= high:
+            level, _, position_id, kind = heapq.heappop(self.upper)
+
+            if is_open(position_id):
+                hits.append((position_id, kind, level))
+            else:
+                self.stale -= 1
+
+        while self.lower and -self.lower[0][0] >= low:
+            level, _, position_id, kind = heapq.heappop(self.lower)
+
+            if is_open(position_id):
+                hits.append((position_id, kind, -level))
+            else:
+                self.stale -= 1
+
+        return hits
+
+    def compact(self, is_open):
+        """
+        Drop levels of positions closed outside the book (manual closes)
+        """
+
+        self.upper = [e for e in self.upper if is_open(e[2])]
+        self.lower = [e for e in self.lower if is_open(e[2])]
+
+        heapq.heapify(self.upper)
+        heapq.heapify(self.lower)
+
+    def __len__(self):
+        return len(self.upper) + len(self.lower)
+
+
+class PaperMatchingEngine:
+    """
+    Price-Indexed Paper Matching Engine
+    Purpose:
+    - Many accounts, many symbols, thousands of open positions
+    - Per-symbol SL/TP heaps: a price or bar only touches the levels
+      it crossed (cost ∝ fills, not open orders)
+    - PnL settled into the account balance (account currency)
+    - Optional TradeJournal: every order / fill / close is logged and
+      the engine is rebuilt from it on start
+    """
+
+    def __init__(
+        self,
+        default_balance: float = 10_000,
+        history: int = 10_000,
+        journal=None
+    ):
+        self.default_balance = default_balance
+        self.journal = journal
+
+        self.balances = {}
+        self.positions = {}
+        self.closed = deque(maxlen=history)
+
+        self._books = defaultdict(SymbolBook)
+        self._by_account = defaultdict(set)
+        self._last_id = 0
+        self._lock = threading.RLock()
+
+        if journal is not None:
+            self.restore()
+
+    # ==============================
+    # ACCOUNTS
+    # ==============================
+
+    def open_account(self, account: str, balance: float | None = None):
+        with self._lock:
+            if account in self.balances:
+                return
+
+            balance = self.default_balance if balance is None else balance
+            self.balances[account] = balance
+
+            self._journal("account", {"account": account, "balance": balance})
+
+    def balance(self, account: str) -> float:
+        with self._lock:
+            return self.balances.get(account, self.default_balance)
+
+    # ==============================
+    # ORDERS
+    # ==============================
+
+    def open_position(
+        self,
+        account: str,
+        symbol: str,
+        side: str,
+        units: float,
+        entry_price: float,
+        stop_loss: float | None = None,
+        take_profit: float | None = None
+    ) -> PaperPosition:
+        side = side.upper()
+
+        if side not in ("BUY", "SELL"):
+            raise ValueError(f"Invalid side: {side}")
+
+        if units <= 0:
+            raise ValueError("Units must be positive")
+
+        with self._lock:
+            self.open_account(account)
+
+            self._last_id += 1
+
+            position = PaperPosition(
+                id=self._last_id,
+                account=account,
+                symbol=instrument_registry.clean(symbol),
+                side=side,
+                units=units,
+                entry_price=entry_price,
+                stop_loss=stop_loss,
+                take_profit=take_profit
+            )
+
+            self._journal("order", {
+                "account": account,
+                "symbol": position.symbol,
+                "side": side,
+                "units": units,
+                "stop_loss": stop_loss,
+                "take_profit": take_profit
+            })
+
+            # Indexed before the fill is logged: a snapshot taken on
+            # that event must already contain the position
+            self._index(position)
+            self._journal("fill", vars(position))
+
+        return position
+
+    def _index(self, position: PaperPosition):
+        self.positions[position.id] = position
+        self._by_account[position.account].add(position.id)
+        self._books[position.symbol].add(position, position.id)
+
+    def close_position(
+        self,
+        position_id: int,
+        price: float,
+        reason: str = "MANUAL",
+        timestamp: float | None = None
+    ) -> dict:
+        with self._lock:
+            position = self.positions.pop(position_id, None)
+
+            if position is None:
+                raise KeyError(f"No open position {position_id}")
+
+            self._forget(position, levels_left=position.level_count)
+
+            return self._settle(position, price, reason, timestamp)
+
+    def _forget(self, position: PaperPosition, levels_left: int):
+        """
+        Unindex a closed position; compact its book once stale levels
+        (left behind for lazy deletion) outweigh live ones (lock held)
+        """
+
+        self._by_account[position.account].discard(position.id)
+
+        book = self._books[position.symbol]
+        book.stale += levels_left
+
+        if book.stale > 1024 and book.stale > len(book) // 2:
+            book.compact(self.positions.__contains__)
+            book.stale = 0
+
+    def _settle(self, position: PaperPosition, price: float, reason: str, timestamp) -> dict:
+        """
+        Realize PnL into the account balance (lock held)
+        """
+
+        spec = instrument_registry.spec(position.symbol)
+
+        pnl = (
+            position.direction
+            * (price - position.entry_price)
+            * position.units
+            * instrument_registry.conversion_rate(spec.quote_currency)
+        )
+
+        self._book_close(position, price, reason, timestamp, pnl)
+
+        self._journal("close", {
+            "id": position.id,
+            "exit_price": price,
+            "exit_reason": reason,
+            "closed_at": self.closed[-1]["closed_at"],
+            "pnl": pnl
+        })
+
+        return self.closed[-1]
+
+    def _book_close(self, position, price, reason, timestamp, pnl):
+        self.balances[position.account] += pnl
+
+        trade = {
+            **vars(position),
+            "exit_price": price,
+            "exit_reason": reason,
+            "closed_at": time.time() if timestamp is None else timestamp,
+            "pnl": round(pnl, 2),
+            "balance": round(self.balances[position.account], 2)
+        }
+
+        self.closed.append(trade)
+
+    # ==============================
+    # JOURNAL
+    # ==============================
+
+    def _journal(self, event_type: str, payload: dict):
+        if self.journal is None:
+            return
+
+        self.journal.append(event_type, payload)
+
+        if self.journal.needs_snapshot:
+            self.journal.snapshot(self.snapshot_state())
+
+    def snapshot_state(self) -> dict:
+        with self._lock:
+            return {
+                "balances": dict(self.balances),
+                "positions": [vars(p) for p in self.positions.values()],
+                "last_id": self._last_id
+            }
+
+    def restore(self):
+        """
+        Rebuild balances and open positions: snapshot + replayed events
+        """
+
+        state, events = self.journal.load()
+
+        with self._lock:
+            if state:
+                self.balances.update(state["balances"])
+
+                for fields in state["positions"]:
+                    self._index(PaperPosition(**fields))
+
+                self._last_id = state["last_id"]
+
+            for event in events:
+                kind = event["type"]
+
+                if kind == "account":
+                    self.balances.setdefault(event["account"], event["balance"])
+
+                elif kind == "fill":
+                    fields = {k: event[k] for k in PaperPosition.__dataclass_fields__}
+                    self._index(PaperPosition(**fields))
+                    self._last_id = max(self._last_id, fields["id"])
+
+                elif kind == "close":
+                    position = self.positions.pop(event["id"], None)
+
+                    if position is not None:
+                        self._forget(position, levels_left=position.level_count)
+                        self._book_close(
+                            position,
+                            event["exit_price"],
+                            event["exit_reason"],
+                            event["closed_at"],
+                            event["pnl"]
+                        )
+
+    # ==============================
+    # MARKET EVENTS
+    # ==============================
+
+    def on_price(self, symbol: str, price: float, timestamp: float | None = None) -> list[dict]:
+        return self.on_bar(symbol, price, price, price, price, timestamp)
+
+    def on_bar(
+        self,
+        symbol: str,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        timestamp: float | None = None
+    ) -> list[dict]:
+        """
+        Fill every SL/TP crossed by the bar
+        - Both levels inside one bar → stop-loss (conservative)
+        - Gap through a level → filled at the open
+        """
+
+        symbol = instrument_registry.clean(symbol)
+
+        with self._lock:
+            book = self._books.get(symbol)
+
+            if book is None or not len(book):
+                return []
+
+            hits = {}
+            popped = defaultdict(int)
+
+            for position_id, kind, level in book.crossed(high, low, self.positions.__contains__):
+                popped[position_id] += 1
+
+                if kind == "SL" or position_id not in hits:
+                    hits[position_id] = (kind, level)
+
+            fills = []
+
+            for position_id, (kind, level) in hits.items():
+                position = self.positions.pop(position_id)
+
+                # Both levels crossed → both already popped, none stale
+                self._forget(position, levels_left=position.level_count - popped[position_id])
+
+                gapped = (
+                    (open_ >= level) if (kind == "TP") == (position.direction == 1)
+                    else (open_ <= level)
+                )
+                price = open_ if gapped else level
+
+                fills.append(self._settle(position, price, kind, timestamp))
+
+            return fills
+
+    # ==============================
+    # VIEWS
+    # ==============================
+
+    def open_positions(self, account: str | None = None) -> list[dict]:
+        with self._lock:
+            ids = self.positions if account is None else self._by_account.get(account, ())
+
+            return [dict(vars(self.positions[i])) for i in ids]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "accounts": len(self.balances),
+                "open_positions": len(self.positions),
+                "closed_trades": len(self.closed),
+                "pending_levels": sum(len(b) for b in self._books.values())
+            }
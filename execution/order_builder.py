@@ -7,10 +7,12 @@ class TradeOrder:
     instrument: str
     side: Literal["buy", "sell"]
     order_type: Literal["market"]
-    units: int
+    units: float
     stop_loss: float
     take_profit: float
     comment: str = "AUTO_STRATEGY"
+    # Sized lots (instrument contract size); None → derived from units
+    lots: float | None = None
 
 
 class OrderBuilder:
@@ -22,7 +24,15 @@ class OrderBuilder:
     def build_from_analysis(analysis: dict) -> TradeOrder:
         side = "sell" if analysis["signal"] == "SELL" else "buy"
 
-        units = int(analysis["position_size"])
+        # API responses are flattened; scan results keep `sizing`
+        sizing = analysis.get("sizing") or {}
+
+        units = float(
+            analysis["position_size"]
+            if "position_size" in analysis
+            else sizing["units"]
+        )
+        lots = analysis.get("recommended_lot_size", sizing.get("lots"))
 
         instrument = analysis["symbol"].replace("/", "_")
 
@@ -33,5 +43,6 @@ class OrderBuilder:
             units=units,
             stop_loss=analysis["stop_loss"],
             take_profit=analysis["take_profit"],
-            comment=f"{analysis['signal']}_{analysis['trend']}"
+            comment=f"{analysis['signal']}_{analysis['trend']}",
+            lots=lots
         )
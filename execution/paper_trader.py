@@ -1,41 +1,251 @@
+import json
+import os
 import time
 
+from analytics.htf_trend import HigherTimeframeTrend
+from data.resampler import interval_ms, open_times_ms
+from execution.matching_engine import PaperMatchingEngine
+
+
+class SymbolState:
+    """
+    Live per-symbol state: incremental indicators + last bar seen
+    """
+
+    def __init__(self, strategy, trend_service, interval: str):
+        self.interval = interval
+        self.signal_state = strategy.live_state()
+        self.trend_state = trend_service.live_state(interval)
+        self.last_time = None
+        self.last_close = None
+
+    def update(self, open_time: int, open: float, high: float, low: float, close: float):
+        self.last_time = open_time
+        self.last_close = close
+
+        self.trend_state.update(open_time, open, high, low, close)
+        return self.signal_state.update(close)
+
 
 class PaperTrader:
     """
     Paper Trading Engine
     Simulates live trading with virtual capital
+    - Consumes only newly closed bars each cycle
+    - Indicators and HTF trend updated incrementally
+    - Exits (SL / TP / reversal) via the paper matching engine
+    - Several symbols, capped number of open positions
+    - State persisted, so a restart resumes where it stopped
+      (optionally every trade event through a TradeJournal)
     """
 
+    ACCOUNT = "paper"
+    DEFAULT_STATE_PATH = os.getenv("PAPER_STATE_PATH", "state/paper_trader.json")
+
     def __init__(
         self,
         data_client,
         strategy,
         risk_manager,
         validator,
-        starting_balance=10000
+        starting_balance=10000,
+        trend_service=None,
+        state_path: str | None = DEFAULT_STATE_PATH,
+        max_open_positions: int = 3,
+        journal=None
     ):
         self.data_client = data_client
         self.strategy = strategy
         self.risk_manager = risk_manager
         self.validator = validator
+        self.trend_service = trend_service or HigherTimeframeTrend()
+        self.state_path = state_path
+        self.max_open_positions = max_open_positions
+
+        self.engine = PaperMatchingEngine(starting_balance, journal=journal)
+        self.engine.open_account(self.ACCOUNT, starting_balance)
 
-        self.balance = starting_balance
-        self.open_position = None
         self.trade_log = []
+        self._symbols = {}
+        self._resume_from = {}
+
+        self.load()
+
+    @property
+    def balance(self) -> float:
+        return self.engine.balance(self.ACCOUNT)
+
+    @property
+    def open_positions(self) -> list[dict]:
+        return self.engine.open_positions(self.ACCOUNT)
+
+    @property
+    def open_position(self):
+        positions = self.open_positions
+        return positions[0] if positions else None
+
+    # ==============================
+    # CYCLES
+    # ==============================
 
     def run_once(self, symbol="BTCUSDT", interval="1h", risk_pct=0.01):
         """
         Execute one paper trading cycle
         """
 
-        df = self.data_client.fetch_ohlcv(symbol, interval)
-        signal = self.strategy.generate_signal(df)
+        self.step(symbol, interval, risk_pct)
+        self.save()
+
+    def run(
+        self,
+        symbols: list[str],
+        interval: str = "1m",
+        risk_pct: float = 0.01,
+        cycles: int | None = None,
+        delay_seconds: float = 2.0
+    ):
+        """
+        Long-running loop: one cycle per candle close
+        """
+
+        period = interval_ms(interval) / 1000
+        cycle = 0
+
+        while cycles is None or cycle < cycles:
+            for symbol in symbols:
+                try:
+                    self.step(symbol, interval, risk_pct)
+                except Exception as e:
+                    print(f"[PAPER ERROR] {symbol}: {e}")
+
+            self.save()
+            cycle += 1
+
+            if cycles is None or cycle < cycles:
+                now = time.time()
+                time.sleep((now // period + 1) * period - now + delay_seconds)
+
+    def step(
+        self,
+        symbol: str,
+        interval: str,
+        risk_pct: float,
+        now: float | None = None
+    ) -> int:
+        """
+        Process the bars of `symbol` closed since the last cycle
+        """
+
+        now_ms = (time.time() if now is None else now) * 1000
+
+        key = (symbol, interval)
+        state = self._symbols.get(key)
+
+        if state is None:
+            state = self._warm_up(symbol, interval, now_ms)
+
+        # Bars missed since the last cycle (+ the in-progress one)
+        missed = 2
+
+        if state.last_time is not None:
+            missed += int((now_ms - state.last_time) // interval_ms(interval))
+
+        if missed > self.trend_service.required_bars(interval):
+            # Too far behind to catch up incrementally: skip the gap
+            self._resume_from.pop(f"{symbol}|{interval}", None)
+            state = self._warm_up(symbol, interval, now_ms)
+            missed = 2
+
+        df = self.data_client.fetch_ohlcv(symbol, interval, missed)
+
+        return self._consume(symbol, interval, risk_pct, state, df, now_ms)
+
+    def _warm_up(self, symbol: str, interval: str, now_ms: float) -> SymbolState:
+        """
+        Rebuild indicator state from one history fetch (start / restart)
+        Bars already traded before a restart only warm the indicators
+        """
+
+        key = (symbol, interval)
+        state = SymbolState(self.strategy, self.trend_service, interval)
+
+        df = self.data_client.fetch_ohlcv(
+            symbol, interval, self.trend_service.required_bars(interval)
+        )
+
+        times = open_times_ms(df)
+        closed = times + interval_ms(interval) <= now_ms
+        resume_from = self._resume_from.get(f"{symbol}|{interval}")
 
-        if signal == "NO_TRADE" or self.open_position:
+        bars = df[["open", "high", "low", "close"]].to_numpy(dtype=float)
+
+        for i in range(len(df)):
+            if not closed[i]:
+                break
+
+            if resume_from is not None and times[i] > resume_from:
+                # Bars after the persisted position are traded normally
+                break
+
+            state.update(int(times[i]), *bars[i])
+
+        self._symbols[key] = state
+        return state
+
+    def _consume(self, symbol, interval, risk_pct, state, df, now_ms) -> int:
+        times = open_times_ms(df)
+        bars = df[["open", "high", "low", "close"]].to_numpy(dtype=float)
+
+        processed = 0
+
+        for i in range(len(df)):
+            open_time = int(times[i])
+
+            if state.last_time is not None and open_time <= state.last_time:
+                continue
+
+            if open_time + interval_ms(interval) > now_ms:
+                break
+
+            open_, high, low, close = bars[i]
+
+            # Exits first: SL / TP crossed inside this bar
+            for trade in self.engine.on_bar(symbol, open_, high, low, close, open_time / 1000):
+                self._log_close(trade)
+
+            signal = state.update(open_time, open_, high, low, close)
+            self._on_signal(symbol, interval, risk_pct, state, signal, close, open_time)
+
+            processed += 1
+
+        return processed
+
+    # ==============================
+    # POSITION LIFECYCLE
+    # ==============================
+
+    def _on_signal(self, symbol, interval, risk_pct, state, signal, close, open_time):
+        held = []
+
+        for position in self.open_positions:
+            if position["symbol"] != symbol:
+                continue
+
+            # Reversal: opposite signal closes the position at the bar close
+            if signal in ("BUY", "SELL") and signal != position["side"]:
+                self._log_close(self.engine.close_position(
+                    position["id"], close, "REVERSAL", open_time / 1000
+                ))
+            else:
+                held.append(position)
+
+        if signal == "NO_TRADE" or held:
+            return
+
+        if len(self.open_positions) >= self.max_open_positions:
             return
 
-        entry = df.close.iloc[-1]
+        entry = close
         direction = signal
 
         stop = entry * (0.99 if direction == "BUY" else 1.01)
@@ -47,7 +257,7 @@ class PaperTrader:
 
         valid = self.validator(
             signal=signal,
-            trend="Bullish",
+            trend=state.trend_state.trend,
             entry=entry,
             stop_loss=stop,
             take_profit=take_profit
@@ -60,13 +270,86 @@ class PaperTrader:
             self.balance, risk_pct, entry, stop
         )
 
-        self.open_position = {
+        if not size:
+            return
+
+        position = self.engine.open_position(
+            self.ACCOUNT, symbol, signal, size, entry, stop, take_profit
+        )
+
+        opened = {
+            "id": position.id,
+            "symbol": symbol,
+            "interval": interval,
             "signal": signal,
             "entry": entry,
             "stop": stop,
             "take_profit": take_profit,
-            "size": size
+            "size": size,
+            "opened_at": open_time / 1000
         }
 
-        self.trade_log.append(self.open_position)
-        print("📄 Paper Trade Opened:", self.open_position)
+        self.trade_log.append(opened)
+        print("📄 Paper Trade Opened:", opened)
+
+    def _log_close(self, trade: dict):
+        self.trade_log.append(trade)
+        print(
+            "📄 Paper Trade Closed:",
+            trade["symbol"], trade["exit_reason"], trade["pnl"]
+        )
+
+    # ==============================
+    # PERSISTENCE
+    # ==============================
+
+    def save(self):
+        if not self.state_path:
+            return
+
+        state = {
+            "balance": self.balance,
+            "positions": self.open_positions,
+            "last_bars": {
+                f"{symbol}|{interval}": s.last_time
+                for (symbol, interval), s in self._symbols.items()
+            },
+            "trade_log": self.trade_log[-500:]
+        }
+
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, default=float)
+
+        os.replace(tmp_path, self.state_path)
+
+    def load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[PAPER] ignoring unreadable {self.state_path}: {e}")
+            return
+
+        # A journal already rebuilt balance and positions
+        if self.engine.journal is None:
+            self.engine.balances[self.ACCOUNT] = state["balance"]
+
+            for p in state.get("positions", []):
+                self.engine.open_position(
+                    self.ACCOUNT,
+                    p["symbol"],
+                    p["side"],
+                    p["units"],
+                    p["entry_price"],
+                    p["stop_loss"],
+                    p["take_profit"]
+                )
+
+        self._resume_from = state.get("last_bars", {})
+        self.trade_log = state.get("trade_log", [])
@@ -0,0 +1,252 @@
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+
+_encode = json.JSONEncoder(separators=(",", ":"), default=float).encode
+
+
+class JournalLocked(RuntimeError):
+    """
+    Another process already writes this journal directory
+    """
+
+
+class TradeJournal:
+    """
+    Append-Only Trade Journal (write-ahead log)
+    Purpose:
+    - Order / fill / close events as compact JSON lines
+    - fsync batched by time and size (background flusher), not per event
+    - Periodic snapshots; older segments are dropped after each one
+    - Replay = latest snapshot + events after it (torn tail tolerated)
+    - Single writer per directory (flock held until close)
+    """
+
+    SEGMENT = "journal-{:012d}.log"
+    SNAPSHOT = "snapshot-{:012d}.json"
+
+    def __init__(
+        self,
+        directory: str,
+        fsync_interval: float = 0.05,
+        fsync_batch: int = 4096,
+        snapshot_every: int = 50_000
+    ):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.snapshot_every = snapshot_every
+
+        os.makedirs(directory, exist_ok=True)
+
+        # Before anything is read or repaired: a second writer would
+        # interleave sequence numbers in the same segment
+        self._writer_fd = os.open(
+            os.path.join(directory, "writer.lock"), os.O_RDWR | os.O_CREAT, 0o600
+        )
+
+        try:
+            fcntl.flock(self._writer_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(self._writer_fd)
+            raise JournalLocked(f"Trade journal {directory} is held by another writer")
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+
+        self.seq = self._last_seq()
+        self._unsynced = 0
+        self._since_snapshot = 0
+        self._synced_seq = self.seq
+
+        self._file = open(self._segment_path(self.seq + 1), "ab", buffering=1 << 20)
+
+        self._closed = False
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="journal-fsync", daemon=True
+        )
+        self._flusher.start()
+
+    # ==============================
+    # FILES
+    # ==============================
+
+    def _segment_path(self, first_seq: int) -> str:
+        return os.path.join(self.directory, self.SEGMENT.format(first_seq))
+
+    def _segments(self) -> list[str]:
+        return sorted(glob.glob(os.path.join(self.directory, "journal-*.log")))
+
+    def _snapshots(self) -> list[str]:
+        return sorted(glob.glob(os.path.join(self.directory, "snapshot-*.json")))
+
+    @staticmethod
+    def _first_seq(path: str) -> int:
+        return int(os.path.basename(path).split("-")[1].split(".")[0])
+
+    def _last_seq(self) -> int:
+        """
+        Highest durable sequence number (drops a torn final line)
+        """
+
+        last = 0
+
+        snapshots = self._snapshots()
+        if snapshots:
+            last = self._first_seq(snapshots[-1])
+
+        segments = self._segments()
+        if segments:
+            for event in self._read_segment(segments[-1], repair=True):
+                last = max(last, event["seq"])
+
+        return last
+
+    def _read_segment(self, path: str, repair: bool = False):
+        good_bytes = 0
+
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break
+
+                if not line.endswith(b"\n"):
+                    break
+
+                good_bytes += len(line)
+                yield event
+
+        if repair and good_bytes < os.path.getsize(path):
+            # Crash mid-write: cut the partial record
+            with open(path, "r+b") as f:
+                f.truncate(good_bytes)
+
+    # ==============================
+    # WRITE PATH
+    # ==============================
+
+    def append(self, event_type: str, payload: dict) -> int:
+        """
+        Buffer one event; durable after the next batched fsync
+        """
+
+        with self._lock:
+            self.seq += 1
+
+            record = {"seq": self.seq, "ts": time.time(), "type": event_type, **payload}
+            self._file.write((_encode(record) + "\n").encode())
+
+            self._unsynced += 1
+            self._since_snapshot += 1
+
+            if self._unsynced >= self.fsync_batch:
+                self._cond.notify()
+
+            return self.seq
+
+    @property
+    def needs_snapshot(self) -> bool:
+        return self._since_snapshot >= self.snapshot_every
+
+    def sync(self):
+        """
+        Flush + fsync everything appended so far
+        """
+
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if not self._unsynced:
+            return
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self._unsynced = 0
+        self._synced_seq = self.seq
+        self._cond.notify_all()
+
+    def _flush_loop(self):
+        with self._lock:
+            while not self._closed:
+                self._cond.wait(self.fsync_interval)
+
+                if self._file is not None:
+                    self._sync_locked()
+
+    def snapshot(self, state: dict):
+        """
+        Persist `state` (as of the current seq) and start a new segment
+        """
+
+        with self._lock:
+            self._sync_locked()
+
+            seq = self.seq
+            path = os.path.join(self.directory, self.SNAPSHOT.format(seq))
+            tmp_path = f"{path}.tmp"
+
+            with open(tmp_path, "w") as f:
+                json.dump({"seq": seq, "state": state}, f, separators=(",", ":"), default=float)
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(tmp_path, path)
+
+            self._file.close()
+            self._file = open(self._segment_path(seq + 1), "ab", buffering=1 << 20)
+            self._since_snapshot = 0
+
+            for old in self._segments():
+                if self._first_seq(old) <= seq:
+                    os.remove(old)
+
+            for old in self._snapshots()[:-1]:
+                os.remove(old)
+
+    def close(self):
+        with self._lock:
+            self._sync_locked()
+            self._closed = True
+            self._cond.notify_all()
+
+            self._file.close()
+            self._file = None
+
+        self._flusher.join(timeout=1)
+
+        fcntl.flock(self._writer_fd, fcntl.LOCK_UN)
+        os.close(self._writer_fd)
+
+    # ==============================
+    # REPLAY
+    # ==============================
+
+    def load(self) -> tuple[dict | None, list]:
+        """
+        (latest snapshot state or None, events after it)
+        """
+
+        state, since = None, 0
+        snapshots = self._snapshots()
+
+        if snapshots:
+            with open(snapshots[-1]) as f:
+                snapshot = json.load(f)
+
+            state, since = snapshot["state"], snapshot["seq"]
+
+        events = [
+            event
+            for path in self._segments()
+            for event in self._read_segment(path)
+            if event["seq"] > since
+        ]
+
+        return state, events
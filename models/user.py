@@ -1,11 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime
-from db.base import Base
-from datetime import datetime
+# Removed: moved to 'deprecated/models/user.py' on 2026-10-19
+# Backup location: deprecated/models/user.py
+# Use database.models.User instead (single engine / Base / models).
 
-class User(Base):
-    __tablename__ = "users"
-
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String(50), unique=True, nullable=False)
-    phone = Column(String(20), unique=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+raise ImportError("models.user has been removed and backed up at deprecated/models/user.py; use database.models.User")
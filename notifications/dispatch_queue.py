@@ -0,0 +1,406 @@
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Notification:
+    key: str
+    channel: str
+    recipient: str
+    signal: dict
+    enqueued_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class Batch:
+    channel: str
+    recipient: str
+    messages: list
+    attempts: int = 0
+
+
+class PartialDelivery(Exception):
+    """
+    Raised by a sender whose batch failed part-way: the first
+    `delivered` messages went out and must not be sent again
+    """
+
+    def __init__(self, delivered: int, cause: Exception):
+        super().__init__(f"{delivered} delivered, then {cause!r}")
+        self.delivered = delivered
+        self.cause = cause
+
+
+def idempotency_key(channel: str, recipient: str, signal: dict) -> str:
+    """
+    Same trade to the same recipient on the same channel → same key
+    (expiry left out: it is stamped at scan time, so a rescan of the
+    same trade would otherwise get a fresh key)
+    """
+
+    parts = [
+        channel,
+        recipient,
+        signal.get("symbol"),
+        signal.get("interval"),
+        signal.get("signal"),
+        signal.get("entry_price", signal.get("entry"))
+    ]
+
+    return hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+
+
+class NotificationQueue:
+    """
+    Background Notification Queue
+    Purpose:
+    - Decouple scanning from delivery (enqueue never blocks)
+    - Batch messages per (channel, recipient), bounded worker threads
+    - Idempotency keys, retries with exponential backoff
+    - Dead-letter record and per-channel latency stats
+    """
+
+    def __init__(
+        self,
+        channels: dict,
+        workers: int = 2,
+        max_pending: int = 10_000,
+        batch_window: float = 0.5,
+        max_batch: int = 10,
+        max_attempts: int = 4,
+        base_backoff: float = 1.0,
+        dead_letter_path: str | None = None,
+        dedup_size: int = 100_000
+    ):
+        self.channels = channels
+        self.worker_count = workers
+        self.max_pending = max_pending
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.dead_letter_path = dead_letter_path
+        self.dedup_size = dedup_size
+
+        self._cond = threading.Condition()
+        self._buckets = OrderedDict()
+        self._pending = 0
+        self._in_flight = 0
+        self._retries = []
+        self._retry_seq = itertools.count()
+        self._seen = OrderedDict()
+
+        self._ready = queue.Queue(maxsize=max(workers * 2, 1))
+        self._threads = []
+        self._stopping = False
+
+        self.dead_letters = deque(maxlen=1000)
+
+        self._latency = defaultdict(lambda: deque(maxlen=1000))
+        self._counters = defaultdict(lambda: defaultdict(int))
+
+    # ==============================
+    # PRODUCER SIDE
+    # ==============================
+
+    def enqueue(
+        self,
+        channel: str,
+        recipient: str,
+        signal: dict,
+        key: str | None = None
+    ) -> bool:
+        """
+        Queue one message; False if duplicate or rejected
+        """
+
+        if channel not in self.channels:
+            raise ValueError(f"Unknown notification channel: {channel}")
+
+        key = key or idempotency_key(channel, recipient, signal)
+        note = Notification(key, channel, recipient, signal)
+
+        with self._cond:
+            if key in self._seen:
+                self._counters[channel]["duplicates"] += 1
+                return False
+
+            if self._pending >= self.max_pending:
+                self._counters[channel]["rejected"] += 1
+                rejected = True
+            else:
+                rejected = False
+
+                self._remember(key)
+                self._buckets.setdefault((channel, recipient), []).append(note)
+                self._pending += 1
+                self._counters[channel]["enqueued"] += 1
+                self._cond.notify()
+
+        if rejected:
+            self._dead_letter(Batch(channel, recipient, [note]), "queue full")
+            return False
+
+        return True
+
+    def _remember(self, key: str):
+        self._seen[key] = True
+
+        while len(self._seen) > self.dedup_size:
+            self._seen.popitem(last=False)
+
+    # ==============================
+    # LIFECYCLE
+    # ==============================
+
+    def start(self):
+        if self._threads:
+            return
+
+        self._stopping = False
+
+        batcher = threading.Thread(
+            target=self._batch_loop, name="notify-batcher", daemon=True
+        )
+        self._threads.append(batcher)
+
+        for i in range(self.worker_count):
+            self._threads.append(threading.Thread(
+                target=self._worker_loop, name=f"notify-worker-{i}", daemon=True
+            ))
+
+        for thread in self._threads:
+            thread.start()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Wait until nothing is pending, in flight or awaiting retry
+        """
+
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            self._cond.notify_all()
+
+            while self._pending or self._in_flight or self._retries:
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    return False
+
+                self._cond.wait(min(remaining, 0.05))
+
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        self.flush(timeout)
+
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+        for _ in range(self.worker_count):
+            self._ready.put(None)
+
+        for thread in self._threads:
+            thread.join(timeout=1)
+
+        self._threads = []
+
+    # ==============================
+    # BATCHER
+    # ==============================
+
+    def _batch_loop(self):
+        while True:
+            with self._cond:
+                ready, wait = self._collect_ready(time.time())
+
+                while not ready and not self._stopping:
+                    self._cond.wait(wait)
+                    ready, wait = self._collect_ready(time.time())
+
+                if self._stopping and not ready:
+                    return
+
+                self._in_flight += len(ready)
+
+            for batch in ready:
+                self._ready.put(batch)
+
+    def _collect_ready(self, now: float) -> tuple[list, float]:
+        """
+        Buckets that are full or older than the batch window, plus
+        retries whose backoff has elapsed (call with the lock held)
+        """
+
+        ready = []
+        wait = self.batch_window
+
+        for bucket_key in list(self._buckets):
+            messages = self._buckets[bucket_key]
+            age = now - messages[0].enqueued_at
+
+            if len(messages) >= self.max_batch or age >= self.batch_window or self._stopping:
+                del self._buckets[bucket_key]
+                self._pending -= len(messages)
+
+                for start in range(0, len(messages), self.max_batch):
+                    ready.append(Batch(
+                        bucket_key[0],
+                        bucket_key[1],
+                        messages[start:start + self.max_batch]
+                    ))
+            else:
+                wait = min(wait, self.batch_window - age)
+
+        while self._retries and self._retries[0][0] <= now:
+            ready.append(heapq.heappop(self._retries)[2])
+
+        if self._retries:
+            wait = min(wait, self._retries[0][0] - now)
+
+        return ready, max(wait, 0.001)
+
+    # ==============================
+    # WORKERS
+    # ==============================
+
+    def _worker_loop(self):
+        while True:
+            batch = self._ready.get()
+
+            if batch is None:
+                return
+
+            self._deliver(batch)
+
+    def _deliver(self, batch: Batch):
+        sender = self.channels[batch.channel]
+        counters = self._counters[batch.channel]
+
+        try:
+            sender.send_batch(batch.recipient, [m.signal for m in batch.messages])
+
+        except Exception as e:
+            batch.attempts += 1
+
+            # Only the undelivered tail is retried / dead-lettered
+            delivered = e.delivered if isinstance(e, PartialDelivery) else 0
+            sent, batch.messages = batch.messages[:delivered], batch.messages[delivered:]
+
+            with self._cond:
+                counters["failures"] += 1
+
+                if sent:
+                    self._record_delivered(batch.channel, sent)
+
+                # retryable=False: a rejected request (would fail the
+                # same way) or an unknown outcome (could deliver twice)
+                if batch.attempts < self.max_attempts and getattr(e, "retryable", True):
+                    delay = self.base_backoff * 2 ** (batch.attempts - 1)
+                    delay *= random.uniform(0.8, 1.2)
+
+                    heapq.heappush(
+                        self._retries,
+                        (time.time() + delay, next(self._retry_seq), batch)
+                    )
+                    counters["retries"] += 1
+                    retry = True
+                else:
+                    retry = False
+
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+            if not retry:
+                self._dead_letter(batch, repr(e))
+
+            return
+
+        with self._cond:
+            self._record_delivered(batch.channel, batch.messages)
+            counters["batches"] += 1
+
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def _record_delivered(self, channel: str, messages: list):
+        """
+        Delivery counters and latency (call with the lock held)
+        """
+
+        delivered_at = time.time()
+
+        self._counters[channel]["delivered"] += len(messages)
+        self._latency[channel].extend(
+            delivered_at - m.enqueued_at for m in messages
+        )
+
+    def _dead_letter(self, batch: Batch, reason: str):
+        record = {
+            "channel": batch.channel,
+            "recipient": batch.recipient,
+            "attempts": batch.attempts,
+            "reason": reason,
+            "failed_at": time.time(),
+            "keys": [m.key for m in batch.messages],
+            "signals": [m.signal for m in batch.messages]
+        }
+
+        with self._cond:
+            self.dead_letters.append(record)
+            self._counters[batch.channel]["dead_letters"] += len(batch.messages)
+
+        if self.dead_letter_path:
+            try:
+                os.makedirs(os.path.dirname(self.dead_letter_path) or ".", exist_ok=True)
+
+                with open(self.dead_letter_path, "a") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+
+            except OSError as e:
+                print(f"[NOTIFY] dead-letter write failed: {e}")
+
+    # ==============================
+    # METRICS
+    # ==============================
+
+    def stats(self) -> dict:
+        with self._cond:
+            channels = {}
+
+            for channel in self.channels:
+                samples = sorted(self._latency[channel])
+
+                channels[channel] = {
+                    **self._counters[channel],
+                    "latency_p50_ms": self._percentile(samples, 0.50),
+                    "latency_p95_ms": self._percentile(samples, 0.95),
+                    "latency_max_ms": round(samples[-1] * 1000, 1) if samples else None
+                }
+
+            return {
+                "pending": self._pending,
+                "in_flight": self._in_flight,
+                "awaiting_retry": len(self._retries),
+                "dead_letters": len(self.dead_letters),
+                "channels": channels
+            }
+
+    @staticmethod
+    def _percentile(samples: list, q: float):
+        if not samples:
+            return None
+
+        idx = min(int(q * len(samples)), len(samples) - 1)
+        return round(samples[idx] * 1000, 1)
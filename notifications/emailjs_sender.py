@@ -1,30 +1,72 @@
 import requests
 import os
 
+from notifications.dispatch_queue import PartialDelivery
+
 class EmailJSSender:
 
     SERVICE_ID = os.getenv("EMAILJS_SERVICE_ID")
     TEMPLATE_ID = os.getenv("EMAILJS_TEMPLATE_ID")
     PUBLIC_KEY = os.getenv("EMAILJS_PUBLIC_KEY")
 
+    # Template decides the address unless a recipient is passed
+    RECIPIENTS = [os.getenv("EMAILJS_TO_EMAIL") or "default"]
+
+    URL = "https://api.emailjs.com/api/v1.0/email/send"
+    TIMEOUT_SECONDS = 10
+
+    _session = requests.Session()
+
     @staticmethod
-    def send(signal: dict):
-        payload = {
+    def build_payload(signal: dict, recipient: str | None = None) -> dict:
+        params = {
+            "symbol": signal["symbol"],
+            "direction": signal["signal"],
+            "entry": signal["entry_price"],
+            "sl": signal["stop_loss"],
+            "tp": signal["take_profit"],
+            "confidence": signal["confidence_percent"],
+            "expiry": signal["signal_validity"]["expires_at"]
+        }
+
+        if "recommended_lot_size" in signal:
+            params["lots"] = signal["recommended_lot_size"]
+            params["risk_amount"] = signal["risk_amount"]
+
+        if recipient and recipient != "default":
+            params["to_email"] = recipient
+
+        return {
             "service_id": EmailJSSender.SERVICE_ID,
             "template_id": EmailJSSender.TEMPLATE_ID,
             "user_id": EmailJSSender.PUBLIC_KEY,
-            "template_params": {
-                "symbol": signal["symbol"],
-                "direction": signal["signal"],
-                "entry": signal["entry_price"],
-                "sl": signal["stop_loss"],
-                "tp": signal["take_profit"],
-                "confidence": signal["confidence_percent"],
-                "expiry": signal["signal_validity"]["expires_at"]
-            }
+            "template_params": params
         }
 
-        requests.post(
-            "https://api.emailjs.com/api/v1.0/email/send",
-            json=payload
-        )
+    @staticmethod
+    def send(signal: dict):
+        EmailJSSender.send_batch(EmailJSSender.RECIPIENTS[0], [signal])
+
+    @staticmethod
+    def send_batch(recipient: str, signals: list[dict]):
+        """
+        EmailJS has no batch endpoint: one POST per signal over a
+        kept-alive session, failing fast on timeouts / HTTP errors.
+        A failure after the first POST raises PartialDelivery so only
+        the rest is retried.
+        """
+
+        for sent, signal in enumerate(signals):
+            try:
+                response = EmailJSSender._session.post(
+                    EmailJSSender.URL,
+                    json=EmailJSSender.build_payload(signal, recipient),
+                    timeout=EmailJSSender.TIMEOUT_SECONDS
+                )
+                response.raise_for_status()
+
+            except Exception as e:
+                if sent:
+                    raise PartialDelivery(sent, e) from e
+
+                raise
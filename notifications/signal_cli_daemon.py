@@ -0,0 +1,282 @@
+import itertools
+import json
+import os
+import socket
+import subprocess
+import threading
+
+
+class SignalCLIError(RuntimeError):
+    """
+    signal-cli answered with a JSON-RPC error (not retried)
+    """
+
+    retryable = False
+
+
+class SignalCLIUnknownOutcome(ConnectionError):
+    """
+    The request was written but no answer came back: signal-cli may
+    have sent it, so it is not resent (would deliver twice)
+    """
+
+    retryable = False
+
+
+class SignalCLIDaemonClient:
+    """
+    Persistent signal-cli JSON-RPC client
+    Transports (one long-lived connection, no JVM start per message):
+    - "tcp://host:port"     → signal-cli daemon --tcp host:port
+    - "unix:///path/socket" → signal-cli daemon --socket /path/socket
+    - "stdio"               → spawn `signal-cli -a ACCOUNT jsonRpc` once
+    Reconnects transparently when the connection drops
+    """
+
+    def __init__(
+        self,
+        address: str,
+        account: str | None = None,
+        command: list[str] | None = None,
+        timeout: float = 10.0,
+        max_retries: int = 2
+    ):
+        if address == "stdio" and command is None and not account:
+            raise ValueError("signal-cli stdio mode needs an account (SIGNAL_CLI_ACCOUNT)")
+
+        self.address = address
+        self.account = account
+        self.command = command
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = {}
+
+        self._sock = None
+        self._process = None
+        self._rfile = None
+        self._wfile = None
+        self._reader = None
+        self._generation = 0
+
+    # ==============================
+    # CONNECTION
+    # ==============================
+
+    @property
+    def connected(self) -> bool:
+        return self._wfile is not None
+
+    def connect(self):
+        with self._lock:
+            if self.connected:
+                return
+
+            if self.address == "stdio":
+                command = self.command or [
+                    "signal-cli", "-a", self.account, "jsonRpc"
+                ]
+                self._process = subprocess.Popen(
+                    command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE
+                )
+                self._rfile = self._process.stdout
+                self._wfile = self._process.stdin
+
+            else:
+                if self.address.startswith("unix://"):
+                    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    sock.settimeout(self.timeout)
+                    sock.connect(self.address[len("unix://"):])
+                else:
+                    host, port = self.address.removeprefix("tcp://").rsplit(":", 1)
+                    sock = socket.create_connection((host, int(port)), self.timeout)
+
+                # Reads block in the reader thread; calls time out on their own
+                sock.settimeout(None)
+
+                self._sock = sock
+                self._rfile = sock.makefile("rb")
+                self._wfile = sock.makefile("wb")
+
+            self._generation += 1
+            self._reader = threading.Thread(
+                target=self._read_loop,
+                args=(self._rfile, self._generation),
+                name="signal-cli-reader",
+                daemon=True
+            )
+            self._reader.start()
+
+    def close(self):
+        with self._lock:
+            self._disconnect(ConnectionError("client closed"))
+
+    def _disconnect(self, error: Exception):
+        """
+        Tear down the transport and fail in-flight calls (lock held)
+        """
+
+        if self._sock is not None:
+            try:
+                # Wakes the reader thread blocked in recv()
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+        for stream in (self._wfile, self._rfile, self._sock):
+            try:
+                if stream is not None:
+                    stream.close()
+            except OSError:
+                pass
+
+        if self._process is not None:
+            self._process.terminate()
+
+        self._sock = self._process = self._rfile = self._wfile = None
+        self._generation += 1
+
+        pending, self._pending = self._pending, {}
+
+        for slot in pending.values():
+            slot["error"] = error
+            slot["event"].set()
+
+    def _read_loop(self, rfile, generation):
+        error = ConnectionError("signal-cli connection closed")
+
+        try:
+            for line in rfile:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+
+                # Notifications (incoming messages, receipts) have no id
+                slot = self._pending.get(message.get("id"))
+
+                if slot is not None:
+                    slot["response"] = message
+                    slot["event"].set()
+
+        except (OSError, ValueError) as e:
+            error = ConnectionError(f"signal-cli connection lost: {e}")
+
+        with self._lock:
+            if generation == self._generation:
+                self._disconnect(error)
+
+    # ==============================
+    # JSON-RPC
+    # ==============================
+
+    def call(self, method: str, params: dict | None = None) -> dict:
+        """
+        Retries only failures before the request was written
+        (connect / write errors); after that the outcome is unknown
+        """
+
+        last_error = None
+
+        for _ in range(self.max_retries + 1):
+            try:
+                return self._call_once(method, params)
+            except SignalCLIUnknownOutcome as e:
+                with self._lock:
+                    self._disconnect(e)
+
+                raise
+            except (ConnectionError, OSError, TimeoutError) as e:
+                last_error = e
+
+                with self._lock:
+                    self._disconnect(e)
+
+        raise ConnectionError(f"signal-cli unreachable: {last_error}")
+
+    def _call_once(self, method: str, params: dict | None) -> dict:
+        self.connect()
+
+        request_id = next(self._ids)
+        slot = {"event": threading.Event(), "response": None, "error": None}
+
+        request = {"jsonrpc": "2.0", "method": method, "id": request_id}
+
+        if params:
+            request["params"] = params
+
+        if self.account and self.address != "stdio":
+            request.setdefault("params", {})["account"] = self.account
+
+        with self._lock:
+            wfile = self._wfile
+
+            if wfile is None:
+                raise ConnectionError("signal-cli not connected")
+
+            self._pending[request_id] = slot
+
+        try:
+            with self._write_lock:
+                wfile.write(json.dumps(request).encode() + b"\n")
+                wfile.flush()
+
+            if not slot["event"].wait(self.timeout):
+                raise SignalCLIUnknownOutcome(
+                    f"signal-cli {method} timed out (request {request_id})"
+                )
+
+        finally:
+            self._pending.pop(request_id, None)
+
+        if slot["error"] is not None:
+            # Connection lost while waiting for the answer
+            raise SignalCLIUnknownOutcome(
+                f"signal-cli {method} (request {request_id}): {slot['error']}"
+            )
+
+        response = slot["response"]
+
+        if "error" in response:
+            raise SignalCLIError(response["error"].get("message", response["error"]))
+
+        return response.get("result") or {}
+
+    def send(self, recipients: list[str], message: str) -> dict:
+        """
+        One JSON-RPC call fans the message out to every recipient
+        """
+
+        return self.call("send", {"recipient": list(recipients), "message": message})
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def shared_daemon_client() -> SignalCLIDaemonClient | None:
+    """
+    Process-wide client configured via SIGNAL_CLI_DAEMON
+    (None → fall back to one signal-cli process per message)
+    """
+
+    global _shared_client
+
+    address = os.getenv("SIGNAL_CLI_DAEMON")
+
+    if not address:
+        return None
+
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = SignalCLIDaemonClient(
+                address,
+                account=os.getenv("SIGNAL_CLI_ACCOUNT")
+            )
+
+        return _shared_client
@@ -1,11 +1,19 @@
 import subprocess
 
+from notifications.signal_cli_daemon import shared_daemon_client
+
 class SignalCLISender:
 
     PHONE_NUMBER = "+254705798519,+254 110 861797"  # your Signal number
 
+    RECIPIENTS = [
+        number.replace(" ", "") for number in PHONE_NUMBER.split(",")
+    ]
+
+    TIMEOUT_SECONDS = 60
+
     @staticmethod
-    def send(signal: dict):
+    def format_message(signal: dict) -> str:
         message = f"""
 📊 TRADE SIGNAL
 
@@ -18,10 +26,54 @@ Confidence: {signal['confidence_percent']}%
 Valid Until: {signal['signal_validity']['expires_at']}
 """
 
-        subprocess.run([
-            "signal-cli",
-            "send",
-            SignalCLISender.PHONE_NUMBER,
-            "-m",
-            message
-        ])
+        # Personalized by the per-user fan-out
+        if "recommended_lot_size" in signal:
+            message += (
+                f"Your Lot Size: {signal['recommended_lot_size']}\n"
+                f"Your Risk: {signal['risk_amount']}\n"
+            )
+
+        return message
+
+    @staticmethod
+    def send(signal: dict):
+        SignalCLISender.send_to(SignalCLISender.RECIPIENTS, [signal])
+
+    @staticmethod
+    def send_batch(recipient: str, signals: list[dict]):
+        """
+        One delivery for every message queued for `recipient`
+        """
+
+        SignalCLISender.send_to([recipient], signals)
+
+    @staticmethod
+    def send_to(recipients: list[str], signals: list[dict]):
+        """
+        Persistent daemon (SIGNAL_CLI_DAEMON) when configured:
+        one JSON-RPC call fans out to all recipients.
+        Otherwise one signal-cli process per recipient.
+        """
+
+        message = "\n".join(
+            SignalCLISender.format_message(signal) for signal in signals
+        )
+
+        daemon = shared_daemon_client()
+
+        if daemon is not None:
+            daemon.send(recipients, message)
+            return
+
+        for recipient in recipients:
+            subprocess.run(
+                [
+                    "signal-cli",
+                    "send",
+                    recipient,
+                    "-m",
+                    message
+                ],
+                check=True,
+                timeout=SignalCLISender.TIMEOUT_SECONDS
+            )
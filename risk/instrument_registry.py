@@ -0,0 +1,215 @@
+import threading
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from config import load_config
+
+
+@dataclass
+class InstrumentSpec:
+    symbol: str
+    pip_size: float
+    pip_value_per_unit: float
+    lot_size: int = 100_000  # standard lot
+    base_currency: str | None = None
+    quote_currency: str = "USD"
+
+
+class InstrumentRegistry:
+    """
+    Instrument Specification Registry
+    Purpose:
+    - Contract specs for every scanned instrument (config/risk.yaml)
+    - Currency conversion matrix rebuilt from cached latest closes
+      (never fetched while sizing)
+    - O(1) spec lookup with the pip value in the account currency
+    """
+
+    def __init__(self, config: dict | None = None):
+        config = load_config("risk") if config is None else config
+
+        self.account_currency = config.get("account_currency", "USD")
+        self.pegged = config.get("pegged") or {}
+        self.fallback_rates = config.get("fallback_rates") or {}
+
+        self._specs = {}
+
+        for group in (config.get("instruments") or {}).values():
+            defaults = group.get("defaults") or {}
+
+            for symbol, overrides in (group.get("symbols") or {}).items():
+                self._specs[symbol] = self._build_spec(
+                    symbol, {**defaults, **(overrides or {})}
+                )
+
+        currencies = {self.account_currency, *self.pegged, *self.fallback_rates}
+
+        for spec in self._specs.values():
+            currencies.update((spec.base_currency, spec.quote_currency))
+
+        self.currencies = sorted(currencies)
+        self._index = {c: i for i, c in enumerate(self.currencies)}
+
+        self._closes = {}
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._resolved = {}
+
+        self.matrix = None
+        self.refresh()
+
+    @staticmethod
+    def _build_spec(symbol: str, fields: dict) -> InstrumentSpec:
+        if "base" in fields and "quote" in fields:
+            base, quote = fields["base"], fields["quote"]
+        elif symbol.endswith("USDT"):
+            base, quote = symbol[:-4], "USDT"
+        else:
+            base, quote = symbol[:3], symbol[3:]
+
+        return InstrumentSpec(
+            symbol=symbol,
+            pip_size=float(fields["pip_size"]),
+            pip_value_per_unit=float(fields["pip_size"]),
+            lot_size=fields.get("lot_size", 100_000),
+            base_currency=base,
+            quote_currency=quote
+        )
+
+    @staticmethod
+    def clean(symbol: str) -> str:
+        return symbol.replace("/", "").upper()
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._specs)
+
+    # ==============================
+    # PRICE CACHE
+    # ==============================
+
+    def record_close(self, symbol: str, close: float):
+        """
+        Cache the latest close (cheap; the matrix is rebuilt lazily)
+        """
+
+        symbol = self.clean(symbol)
+
+        if symbol in self._specs and close and close > 0:
+            self._closes[symbol] = float(close)
+            self._dirty = True
+
+    # ==============================
+    # CONVERSION MATRIX
+    # ==============================
+
+    def _currency_values(self) -> np.ndarray:
+        """
+        Value of one unit of each currency in the account currency
+        Closes are chained outwards from the account currency; the
+        static fallback rates only fill what no close reaches
+        """
+
+        values = {self.account_currency: 1.0}
+
+        for currency, peg in self.pegged.items():
+            if peg == self.account_currency:
+                values[currency] = 1.0
+
+        pairs = [
+            (self._specs[s].base_currency, self._specs[s].quote_currency, close)
+            for s, close in self._closes.items()
+        ]
+
+        changed = True
+        while changed:
+            changed = False
+
+            for base, quote, close in pairs:
+                if quote in values and base not in values:
+                    values[base] = close * values[quote]
+                    changed = True
+                elif base in values and quote not in values:
+                    values[quote] = values[base] / close
+                    changed = True
+
+        usd = values.get("USD")
+
+        for currency, rate in self.fallback_rates.items():
+            # Fallbacks are quoted in USD
+            if currency not in values and usd is not None:
+                values[currency] = rate * usd
+
+        for currency, peg in self.pegged.items():
+            if currency not in values and peg in values:
+                values[currency] = values[peg]
+
+        return np.array(
+            [values.get(c, np.nan) for c in self.currencies], dtype=float
+        )
+
+    def refresh(self):
+        """
+        Rebuild matrix[i, j] = units of currency j per unit of currency i
+        """
+
+        with self._lock:
+            values = self._currency_values()
+
+            self.matrix = values[:, None] / values[None, :]
+            self._resolved = {}
+            self._dirty = False
+
+    def _maybe_refresh(self):
+        # Rebuilt at most once per batch of new closes, not per lookup
+        if self._dirty:
+            self.refresh()
+
+    def conversion_rate(self, from_currency: str, to_currency: str | None = None) -> float:
+        to_currency = to_currency or self.account_currency
+
+        self._maybe_refresh()
+
+        try:
+            rate = self.matrix[self._index[from_currency], self._index[to_currency]]
+        except KeyError:
+            rate = np.nan
+
+        if not np.isfinite(rate):
+            raise ValueError(f"No conversion rate {from_currency}→{to_currency}")
+
+        return float(rate)
+
+    # ==============================
+    # SPECS
+    # ==============================
+
+    def spec(self, symbol: str) -> InstrumentSpec:
+        """
+        Spec with pip_value_per_unit in the account currency
+        """
+
+        self._maybe_refresh()
+
+        resolved = self._resolved.get(symbol)
+
+        if resolved is not None:
+            return resolved
+
+        base_spec = self._specs.get(self.clean(symbol))
+
+        if base_spec is None:
+            raise ValueError(f"No instrument spec for {symbol}")
+
+        resolved = replace(
+            base_spec,
+            pip_value_per_unit=base_spec.pip_size
+            * self.conversion_rate(base_spec.quote_currency)
+        )
+
+        self._resolved[symbol] = resolved
+        return resolved
+
+
+instrument_registry = InstrumentRegistry()
@@ -0,0 +1,431 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+from config import load_config
+from risk.instrument_registry import instrument_registry
+
+
+class RollingCorrelation:
+    """
+    Rolling log-return correlation of a fixed symbol set
+    - One row per bar time (closes of all symbols seen for that bar)
+    - Pairwise-complete: a pair only uses rows where both symbols
+      have a return (missing bars are not treated as flat)
+    - Running sums / cross-products updated per row: O(N²), not O(W·N²)
+    - Sums are re-anchored from the window every `window` rows
+      so floating-point drift cannot accumulate
+    """
+
+    def __init__(self, symbols: list[str], window: int = 200):
+        self.symbols = list(symbols)
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.window = window
+
+        n = len(self.symbols)
+
+        # Returns (0 where missing) and the presence mask per row
+        self._returns = np.zeros((window, n))
+        self._present = np.zeros((window, n))
+        self._pos = 0
+        self.count = 0
+        self._since_anchor = 0
+
+        # [i, j] over rows where both i and j are present:
+        # pair counts, Σ r_i, Σ r_i², Σ r_i·r_j
+        self._pairs = np.zeros((n, n))
+        self._sum = np.zeros((n, n))
+        self._square = np.zeros((n, n))
+        self._cross = np.zeros((n, n))
+
+        self._last_close = np.full(n, np.nan)
+        self._row = np.full(n, np.nan)
+        self._row_time = None
+
+        self._matrix = None
+
+    def record_close(self, symbol: str, bar_time: int, close: float):
+        i = self.index.get(symbol)
+
+        if i is None or not close or close <= 0:
+            return
+
+        if self._row_time is None:
+            self._row_time = bar_time
+
+        elif bar_time > self._row_time:
+            self._commit_row()
+            self._row_time = bar_time
+
+        elif bar_time < self._row_time:
+            # Late bar (already committed)
+            return
+
+        self._row[i] = close
+
+    def _commit_row(self):
+        seen = np.isfinite(self._row)
+        both = seen & np.isfinite(self._last_close)
+
+        returns = np.zeros(len(self.symbols))
+        returns[both] = np.log(self._row[both] / self._last_close[both])
+
+        self._last_close[seen] = self._row[seen]
+        self._row[:] = np.nan
+
+        # First row only primes the previous closes
+        if both.any():
+            self.push(returns, both)
+
+    @staticmethod
+    def _moments(returns: np.ndarray, present: np.ndarray) -> tuple:
+        """
+        Pairwise sums of rows (1-D: one row, 2-D: many)
+        """
+
+        returns, present = np.atleast_2d(returns), np.atleast_2d(present)
+
+        return (
+            present.T @ present,
+            returns.T @ present,
+            (returns ** 2).T @ present,
+            returns.T @ returns
+        )
+
+    def push(self, returns: np.ndarray, present: np.ndarray | None = None):
+        present = (
+            np.ones(len(self.symbols)) if present is None
+            else np.asarray(present, dtype=float)
+        )
+        returns = np.where(present > 0, returns, 0.0)
+
+        totals = (self._pairs, self._sum, self._square, self._cross)
+
+        if self.count == self.window:
+            old = self._moments(self._returns[self._pos], self._present[self._pos])
+
+            for total, value in zip(totals, old):
+                total -= value
+        else:
+            self.count += 1
+
+        self._returns[self._pos] = returns
+        self._present[self._pos] = present
+
+        for total, value in zip(totals, self._moments(returns, present)):
+            total += value
+
+        self._pos = (self._pos + 1) % self.window
+        self._matrix = None
+
+        self._since_anchor += 1
+
+        if self._since_anchor >= self.window:
+            anchored = self._moments(
+                self._returns[:self.count], self._present[:self.count]
+            )
+
+            for total, value in zip(totals, anchored):
+                total[:] = value
+
+            self._since_anchor = 0
+
+    def matrix(self) -> np.ndarray:
+        """
+        Correlation matrix (cached until the next row)
+        """
+
+        if self._matrix is None:
+            n = np.maximum(self._pairs, 1)
+
+            # mean[i, j]: mean of i over the rows shared with j
+            mean = self._sum / n
+            var = self._square / n - mean ** 2
+            cov = self._cross / n - mean * mean.T
+
+            scale = np.sqrt(np.clip(var, 0, None) * np.clip(var.T, 0, None))
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                corr = np.where((scale > 0) & (self._pairs > 1), cov / scale, 0.0)
+
+            np.fill_diagonal(corr, 1.0)
+            self._matrix = np.clip(corr, -1.0, 1.0)
+
+        return self._matrix
+
+    def pair_count(self, a: str, b: str) -> int:
+        """
+        Rows in the window where both symbols have a return
+        """
+
+        i, j = self.index.get(a), self.index.get(b)
+
+        if i is None or j is None:
+            return 0
+
+        return int(round(self._pairs[i, j]))
+
+    def correlation(self, a: str, b: str) -> float:
+        i, j = self.index.get(a), self.index.get(b)
+
+        if i is None or j is None:
+            return 1.0 if a == b else 0.0
+
+        return float(self.matrix()[i, j])
+
+
+class PortfolioRiskEngine:
+    """
+    Portfolio Exposure & Correlation Risk
+    Purpose:
+    - Net currency exposure of open positions plus accepted candidates
+    - Rolling return correlations per interval, updated per new bar
+    - Downsize or reject signals that breach the config/risk.yaml limits
+    """
+
+    def __init__(self, symbols: list[str] | None = None, config: dict | None = None):
+        if config is None:
+            config = load_config("risk").get("portfolio") or {}
+
+        self.symbols = symbols or instrument_registry.symbols
+        self.max_currency_exposure = config.get("max_currency_exposure", 10.0)
+        self.max_correlated_risk_percent = config.get("max_correlated_risk_percent", 3.0)
+        self.correlation_threshold = config.get("correlation_threshold", 0.7)
+        self.correlation_window = config.get("correlation_window", 200)
+        self.min_correlation_bars = config.get("min_correlation_bars", 30)
+        self.min_scale = config.get("min_scale", 0.25)
+
+        # Pegged currencies (USDT) net against their peg (USD)
+        pegged = instrument_registry.pegged
+
+        self.currencies = [c for c in instrument_registry.currencies if c not in pegged]
+        self.currency_index = {c: i for i, c in enumerate(self.currencies)}
+
+        for currency, peg in pegged.items():
+            self.currency_index[currency] = self.currency_index[peg]
+
+        self.position_source = None
+
+        self._unknown = set()
+        self._correlations = {}
+        self._recent_bars = deque(maxlen=10_000)
+        self._lock = threading.Lock()
+
+    # ==============================
+    # CORRELATION FEED
+    # ==============================
+
+    def record_bar(self, symbol: str, interval: str, bar_time: int, close: float):
+        with self._lock:
+            rolling = self._correlations.get(interval)
+
+            if rolling is None:
+                rolling = self._correlations[interval] = RollingCorrelation(
+                    self.symbols, self.correlation_window
+                )
+
+            rolling.record_close(symbol, int(bar_time), float(close))
+            self._recent_bars.append((symbol, interval, int(bar_time), float(close)))
+
+    def record_bars(self, bars):
+        for bar in bars:
+            self.record_bar(*bar)
+
+    def drain_bars(self) -> list:
+        """
+        Bars recorded since the last drain (shipped from scan workers)
+        """
+
+        with self._lock:
+            bars = list(self._recent_bars)
+            self._recent_bars.clear()
+
+        return bars
+
+    def correlation(self, interval: str, a: str, b: str) -> float:
+        rolling = self._correlations.get(interval)
+
+        if a == b:
+            return 1.0
+
+        if rolling is None or rolling.pair_count(a, b) < self.min_correlation_bars:
+            return 0.0
+
+        return rolling.correlation(a, b)
+
+    # ==============================
+    # EXPOSURE
+    # ==============================
+
+    def _leg(self, item: dict) -> dict | None:
+        """
+        Open position or signal → exposure leg
+        """
+
+        side = str(item.get("signal") or item.get("side") or "").upper()
+        direction = {"BUY": 1, "SELL": -1}.get(side)
+
+        sizing = item.get("sizing") or {}
+        units = item.get("units", sizing.get("units"))
+        price = item.get("entry_price", item.get("entry"))
+
+        if direction is None or not units or not price:
+            return None
+
+        spec = instrument_registry.spec(item["symbol"])
+
+        vector = np.zeros(len(self.currencies))
+        notional = units * price * instrument_registry.conversion_rate(spec.quote_currency)
+
+        vector[self.currency_index[spec.base_currency]] += direction * notional
+        vector[self.currency_index[spec.quote_currency]] -= direction * notional
+
+        return {
+            "symbol": instrument_registry.clean(item["symbol"]),
+            "interval": item.get("interval"),
+            "direction": direction,
+            "risk_amount": item.get("risk_amount", sizing.get("risk_amount")) or 0.0,
+            "exposure": vector
+        }
+
+    def exposure(self, items: list[dict]) -> dict:
+        """
+        Net exposure per currency (account currency)
+        """
+
+        total = np.zeros(len(self.currencies))
+
+        for leg in self._book(items):
+            total += leg["exposure"]
+
+        return {
+            c: round(float(total[i]), 2)
+            for i, c in enumerate(self.currencies)
+            if total[i]
+        }
+
+    def _book(self, items: list[dict]) -> list[dict]:
+        """
+        Exposure legs of open positions; an unknown symbol is skipped
+        (logged once per symbol) instead of failing the whole review
+        """
+
+        book = []
+
+        for item in items:
+            try:
+                leg = self._leg(item)
+            except ValueError as e:
+                symbol = item.get("symbol")
+
+                if symbol not in self._unknown:
+                    self._unknown.add(symbol)
+                    print(f"[PORTFOLIO] skipping open position {symbol}: {e}")
+                continue
+
+            if leg is not None:
+                book.append(leg)
+
+        return book
+
+    def open_positions(self) -> list[dict]:
+        return list(self.position_source()) if self.position_source else []
+
+    # ==============================
+    # REVIEW
+    # ==============================
+
+    def review(
+        self,
+        signals: list[dict],
+        account_balance: float,
+        open_positions: list[dict] | None = None
+    ) -> list[dict]:
+        """
+        Walk ranked signals; accepted ones (possibly downsized) join
+        the book before the next is checked. Rejected are dropped
+        """
+
+        open_positions = self.open_positions() if open_positions is None else open_positions
+
+        book = self._book(open_positions)
+        net = sum((leg["exposure"] for leg in book), np.zeros(len(self.currencies)))
+
+        exposure_limit = self.max_currency_exposure * account_balance
+        correlated_limit = self.max_correlated_risk_percent / 100 * account_balance
+
+        accepted = []
+
+        for signal in signals:
+            try:
+                leg = self._leg(signal)
+            except ValueError:
+                leg = None
+
+            if leg is None:
+                accepted.append(signal)
+                continue
+
+            scale, reason = 1.0, None
+
+            # Currency limits: only legs that grow a breach count
+            vector = leg["exposure"]
+            growing = (vector != 0) & (np.sign(vector) == np.sign(net + vector))
+
+            if growing.any():
+                room = exposure_limit - np.abs(net[growing])
+                currency_scale = float(np.clip(room / np.abs(vector[growing]), 0, 1).min())
+
+                if currency_scale < scale:
+                    scale, reason = currency_scale, "CURRENCY_EXPOSURE"
+
+            # Correlated risk: same-way exposure through correlated symbols
+            correlated = sum(
+                other["risk_amount"]
+                for other in book
+                if leg["direction"] * other["direction"]
+                * self.correlation(leg["interval"], leg["symbol"], other["symbol"])
+                >= self.correlation_threshold
+            )
+
+            if leg["risk_amount"] > 0:
+                corr_scale = max(correlated_limit - correlated, 0) / leg["risk_amount"]
+
+                if corr_scale < scale:
+                    scale, reason = corr_scale, "CORRELATED_RISK"
+
+            if scale < self.min_scale:
+                print(f"[PORTFOLIO] rejected {leg['symbol']} {signal.get('signal')}: {reason}")
+                continue
+
+            if scale < 1.0:
+                signal = self._downsize(signal, scale, reason)
+                leg["exposure"] = vector * scale
+                leg["risk_amount"] *= scale
+
+            book.append(leg)
+            net += leg["exposure"]
+            accepted.append(signal)
+
+        return accepted
+
+    @staticmethod
+    def _downsize(signal: dict, scale: float, reason: str) -> dict:
+        sizing = dict(signal.get("sizing") or {})
+
+        for key in ("units", "risk_amount", "actual_risk_percent"):
+            if key in sizing:
+                sizing[key] = round(sizing[key] * scale, 2)
+
+        if "lots" in sizing:
+            sizing["lots"] = round(sizing["lots"] * scale, 4)
+
+        return {
+            **signal,
+            "sizing": sizing,
+            "portfolio_adjustment": {"scale": round(scale, 3), "reason": reason}
+        }
+
+
+portfolio_risk = PortfolioRiskEngine()
@@ -1,12 +1,6 @@
-from dataclasses import dataclass
+import numpy as np
 
-
-@dataclass
-class InstrumentSpec:
-    symbol: str
-    pip_size: float
-    pip_value_per_unit: float
-    lot_size: int = 100_000  # standard lot
+from risk.instrument_registry import InstrumentSpec, instrument_registry
 
 
 class PositionSizer:
@@ -15,34 +9,19 @@ class PositionSizer:
     Supports:
     - Auto sizing from account balance & risk %
     - Manual lot sizing with real risk calculation
+    - Batch (NumPy array) variants of both for many accounts at once
     """
 
     MIN_LOT = 0.001
     MAX_LOT = 100.0
 
-    DEFAULT_SPECS = {
-        "EURUSD": InstrumentSpec(
-            symbol="EURUSD",
-            pip_size=0.0001,
-            pip_value_per_unit=0.0001
-        ),
-        "GBPUSD": InstrumentSpec(
-            symbol="GBPUSD",
-            pip_size=0.0001,
-            pip_value_per_unit=0.0001
-        ),
-        "USDJPY": InstrumentSpec(
-            symbol="USDJPY",
-            pip_size=0.01,
-            pip_value_per_unit=0.0001
-        ),
-        "XAUUSD": InstrumentSpec(
-            symbol="XAUUSD",
-            pip_size=0.01,
-            pip_value_per_unit=0.01,
-            lot_size=100
-        ),
-    }
+    @classmethod
+    def get_spec(cls, symbol: str) -> InstrumentSpec:
+        """
+        Registry spec (config/risk.yaml), pip value in account currency
+        """
+
+        return instrument_registry.spec(symbol)
 
     # ==============================
     # AUTO SAFE MODE (RECOMMENDED)
@@ -60,11 +39,7 @@ class PositionSizer:
         Calculates SAFE lot size based on account balance and risk %
         """
 
-        clean_symbol = symbol.replace("/", "").upper()
-        if clean_symbol not in cls.DEFAULT_SPECS:
-            raise ValueError(f"No instrument spec for {symbol}")
-
-        spec = cls.DEFAULT_SPECS[clean_symbol]
+        spec = cls.get_spec(symbol)
 
         risk_amount = balance * (risk_percent / 100)
 
@@ -111,11 +86,7 @@ class PositionSizer:
                 f"Lot size must be between {cls.MIN_LOT} and {cls.MAX_LOT}"
             )
 
-        clean_symbol = symbol.replace("/", "").upper()
-        if clean_symbol not in cls.DEFAULT_SPECS:
-            raise ValueError(f"No instrument spec for {symbol}")
-
-        spec = cls.DEFAULT_SPECS[clean_symbol]
+        spec = cls.get_spec(symbol)
 
         pip_distance = abs(entry_price - stop_loss) / spec.pip_size
         if pip_distance <= 0:
@@ -133,3 +104,99 @@ class PositionSizer:
             "pip_distance": round(pip_distance, 1),
             "actual_risk_percent": round(actual_risk_percent, 2)
         }
+
+    # ==============================
+    # BATCH MODE (MANY ACCOUNTS)
+    # ==============================
+    @staticmethod
+    def _pip_distances(spec: InstrumentSpec, entry_prices, stop_losses) -> np.ndarray:
+        pip_distance = np.abs(
+            np.asarray(entry_prices, dtype=float) - np.asarray(stop_losses, dtype=float)
+        ) / spec.pip_size
+
+        if not np.all(pip_distance > 0):
+            raise ValueError("Invalid stop loss distance")
+
+        return pip_distance
+
+    @classmethod
+    def calculate_positions(
+        cls,
+        symbol: str,
+        balances,
+        risk_percents,
+        entry_prices,
+        stop_losses
+    ) -> dict:
+        """
+        calculate_position for arrays of accounts (one symbol)
+        Arguments broadcast, e.g. per-user balances with one entry/stop
+        Returns the same keys, each holding an array
+        """
+
+        spec = cls.get_spec(symbol)
+
+        balances = np.atleast_1d(np.asarray(balances, dtype=float))
+        risk_percents = np.asarray(risk_percents, dtype=float)
+
+        risk_amount = balances * (risk_percents / 100)
+        pip_distance = cls._pip_distances(spec, entry_prices, stop_losses)
+
+        # Same operation order as the scalar path (bit-identical lots)
+        lots = risk_amount / (pip_distance * spec.pip_value_per_unit) / spec.lot_size
+
+        # Same safety clamps as the scalar path
+        np.clip(lots, cls.MIN_LOT, cls.MAX_LOT, out=lots)
+        units = lots * spec.lot_size
+
+        # Round in place; scalars are rounded before being broadcast
+        shape = lots.shape
+
+        return {
+            "units": units.round(2, out=units),
+            "lots": lots.round(4, out=lots),
+            "units_per_lot": spec.lot_size,
+            "risk_amount": risk_amount.round(2, out=risk_amount),
+            "pip_distance": np.broadcast_to(pip_distance.round(1), shape),
+            "actual_risk_percent": np.broadcast_to(risk_percents.round(2), shape)
+        }
+
+    @classmethod
+    def calculate_from_lots(
+        cls,
+        symbol: str,
+        balances,
+        lot_sizes,
+        entry_prices,
+        stop_losses
+    ) -> dict:
+        """
+        calculate_from_lot for arrays of accounts (one symbol)
+        """
+
+        lot_sizes = np.asarray(lot_sizes, dtype=float)
+
+        if not np.all((lot_sizes >= cls.MIN_LOT) & (lot_sizes <= cls.MAX_LOT)):
+            raise ValueError(
+                f"Lot size must be between {cls.MIN_LOT} and {cls.MAX_LOT}"
+            )
+
+        spec = cls.get_spec(symbol)
+
+        balances = np.atleast_1d(np.asarray(balances, dtype=float))
+        pip_distance = cls._pip_distances(spec, entry_prices, stop_losses)
+
+        units = lot_sizes * spec.lot_size
+        risk_amount = pip_distance * units * spec.pip_value_per_unit
+        actual_risk_percent = (risk_amount / balances) * 100
+
+        shape = actual_risk_percent.shape
+
+        return {
+            "units": np.broadcast_to(units.round(2), shape),
+            "lots": np.broadcast_to(lot_sizes.round(4), shape),
+            "units_per_lot": spec.lot_size,
+            "risk_amount": np.broadcast_to(risk_amount.round(2), shape),
+            "pip_distance": np.broadcast_to(pip_distance.round(1), shape),
+            "actual_risk_percent": actual_risk_percent.round(2, out=actual_risk_percent)
+        }
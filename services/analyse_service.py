@@ -1,6 +1,12 @@
+import os
+import time
+
+import pandas as pd
+
 from data.market_data_router import MarketDataRouter
 from strategy.ema_rsi_strategy import EMARsiStrategy
 from analytics.trend_engine import TrendEngine
+from analytics.htf_trend import HigherTimeframeTrend
 from analytics.volatility import calculate_volatility, calculate_atr
 from analytics.confidence_score import calculate_confidence
 from analytics.recheck_engine import RecheckDecisionEngine
@@ -8,9 +14,15 @@ from analytics.signal_validator import SignalValidator
 from analytics.signal_ranker import SignalRanker
 from data.validators import validate_trade
 from analytics.session_engine import MarketSessionEngine
+from analytics.spread_estimator import spread_estimator
 from analytics.news_engine import NewsEngine
 
 from risk.position_sizer import PositionSizer
+from risk.instrument_registry import instrument_registry
+from risk.portfolio_risk import portfolio_risk
+from data.resampler import ANALYSIS_BARS, interval_ms, open_times_ms
+from database.history_writer import HistoryWriter
+from data.cache_backend import CacheBackend
 
 
 # ==============================
@@ -20,6 +32,10 @@ from risk.position_sizer import PositionSizer
 data_router = MarketDataRouter()
 strategy = EMARsiStrategy()
 trend_engine = TrendEngine()
+htf_trend = HigherTimeframeTrend(trend_engine)
+
+# Identical /analyze requests share one result for this long (0 → off)
+ANALYSIS_CACHE_TTL = float(os.getenv("CACHE_ANALYSIS_TTL", "15"))
 
 
 # ==============================
@@ -28,16 +44,12 @@ trend_engine = TrendEngine()
 
 def estimate_spread(symbol: str) -> float:
     """
-    Approx Exness Standard spreads (pips)
+    Live spread estimate (registry pips) for the current session
+    Quotes are recorded in the background (QuoteSampler); static
+    Exness Standard table until enough quotes are recorded
     """
-    spreads = {
-        "EURUSD": 1.0,
-        "GBPUSD": 1.4,
-        "USDJPY": 1.2,
-        "XAUUSD": 2.5
-    }
 
-    return spreads.get(symbol.upper(), 1.5)
+    return spread_estimator.estimate(symbol)
 
 
 # ==============================
@@ -63,23 +75,6 @@ def detect_liquidity_trap(df):
     }
 
 
-# ==============================
-# PIP UTILS
-# ==============================
-
-def get_pip_size(symbol):
-
-    symbol = symbol.upper()
-
-    if "JPY" in symbol:
-        return 0.01
-
-    if "XAU" in symbol:
-        return 0.1
-
-    return 0.0001
-
-
 # ==============================
 # MAIN ENGINE
 # ==============================
@@ -92,7 +87,8 @@ def analyze_market(
     risk_percent: float,
     lot_size: float | None,
     min_lot: float,
-    max_lot: float
+    max_lot: float,
+    history: pd.DataFrame | None = None
 ) -> dict:
 
     """
@@ -101,6 +97,7 @@ def analyze_market(
     - Liquidity filtered
     - Risk controlled
     - Backtest safe
+    `history` skips the fetch (pre-fetched / resampled candles)
     """
     
     # ==============================
@@ -136,10 +133,15 @@ def analyze_market(
         # ==============================
         # MARKET DATA
 
-    try:
-        df = data_router.fetch_ohlcv(symbol, interval)
-    except Exception as e:
-        return {"error": f"Market data failed: {e}"}
+    if history is None:
+        try:
+            history = data_router.fetch_ohlcv(
+                symbol, interval, htf_trend.required_bars(interval, ANALYSIS_BARS)
+            )
+        except Exception as e:
+            return {"error": f"Market data failed: {e}"}
+
+    df = history.tail(ANALYSIS_BARS) if history is not None else None
 
     if df is None or len(df) < 60:
         return {
@@ -147,13 +149,23 @@ def analyze_market(
             "message": "Insufficient data"
         }
 
+    # Latest close feeds the sizing conversion rates and the
+    # portfolio correlations (no extra fetch)
+    last_close = df["close"].iloc[-1]
+    instrument_registry.record_close(symbol, last_close)
+
+    # Correlations only see closed bars (the last one may be forming)
+    opens = open_times_ms(df.tail(2))
+    closed = -1 if opens[-1] + interval_ms(interval) <= time.time() * 1000 else -2
+    portfolio_risk.record_bar(symbol, interval, opens[closed], df["close"].iloc[closed])
+
 
         # ==============================
         # STRATEGY
 
     try:
         signal = strategy.generate_signal(df)
-        trend = trend_engine.classify_trend(df)
+        trend = htf_trend.trend_for(symbol, interval, history)
         entry = float(df.close.iloc[-1])
     except Exception as e:
         return {"error": f"Strategy failure: {e}"}
@@ -170,6 +182,8 @@ def analyze_market(
     trade_allowed = False
     rr_ratio = None
     atr = None
+    volatility = None
+    confidence = None
     block_reason = None
 
 
@@ -221,7 +235,7 @@ def analyze_market(
         # SL DISTANCE FILTER
         # ------------------
 
-        pip_size = get_pip_size(symbol)
+        pip_size = instrument_registry.spec(symbol).pip_size
 
         sl_pips = abs(entry - stop) / pip_size
 
@@ -373,7 +387,7 @@ def analyze_market(
         # FINAL RESPONSE
     # ==============================
 
-    return {
+    result = {
         "symbol": symbol,
         "interval": interval,
 
@@ -392,6 +406,7 @@ def analyze_market(
         "liquidity": liquidity,
 
         "rr_ratio": round(rr_ratio, 2) if rr_ratio else None,
+        "confidence_percent": confidence,
 
         "trade_allowed": trade_allowed,
         "block_reason": block_reason,
@@ -399,5 +414,42 @@ def analyze_market(
         "sizing": sizing,
         "recheck": recheck,
 
+        # Signal creation stamp (order export latency starts here)
+        "generated_at": time.time(),
+
         "analysis_only": True
     }
+
+    # Audit trail (buffered; written in the background)
+    writer = HistoryWriter.shared()
+
+    if writer is not None:
+        writer.record("analysis", result)
+
+    return result
+
+
+# ==============================
+# ANALYSIS SNAPSHOTS
+# ==============================
+
+def analysis_snapshot(**params) -> dict:
+    """
+    analyze_market result shared by identical requests on every node
+    - one node computes a missing snapshot, the others wait and read it
+    - errors are returned but never cached
+    """
+
+    if ANALYSIS_CACHE_TTL <= 0:
+        return analyze_market(**params)
+
+    key = "analysis:" + "|".join(f"{k}={params[k]}" for k in sorted(params))
+    computed = {}
+
+    def compute():
+        computed["result"] = analyze_market(**params)
+        return None if "error" in computed["result"] else computed["result"]
+
+    result = CacheBackend.shared().get_or_set(key, compute, ttl=ANALYSIS_CACHE_TTL)
+
+    return result if result is not None else computed["result"]
@@ -1,3 +1,6 @@
+from collections import deque
+
+import numpy as np
 import pandas as pd
 from strategy.base_strategy import BaseStrategy
 
@@ -10,23 +13,34 @@ class EMARsiStrategy(BaseStrategy):
     - RSI > 50 → Momentum confirmation
     """
 
-    def generate_signal(self, df: pd.DataFrame) -> str:
+    EMA_FAST = 50
+    EMA_SLOW = 200
+    RSI_PERIOD = 14
+
+    def indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        EMA fast / slow and RSI for every bar
+        """
+
         df = df.copy()
 
-        df["ema_fast"] = df["close"].ewm(span=50).mean()
-        df["ema_slow"] = df["close"].ewm(span=200).mean()
+        df["ema_fast"] = df["close"].ewm(span=self.EMA_FAST).mean()
+        df["ema_slow"] = df["close"].ewm(span=self.EMA_SLOW).mean()
 
         delta = df["close"].diff()
         gain = delta.clip(lower=0)
         loss = -delta.clip(upper=0)
 
-        avg_gain = gain.rolling(14).mean()
-        avg_loss = loss.rolling(14).mean()
+        avg_gain = gain.rolling(self.RSI_PERIOD).mean()
+        avg_loss = loss.rolling(self.RSI_PERIOD).mean()
 
         rs = avg_gain / avg_loss
         df["rsi"] = 100 - (100 / (1 + rs))
 
-        last = df.iloc[-1]
+        return df
+
+    def generate_signal(self, df: pd.DataFrame) -> str:
+        last = self.indicators(df).iloc[-1]
 
         if last.ema_fast > last.ema_slow and last.rsi > 50:
             return "BUY"
@@ -35,3 +49,89 @@ class EMARsiStrategy(BaseStrategy):
             return "SELL"
 
         return "NO_TRADE"
+
+    def signal_series(self, df: pd.DataFrame) -> pd.Series:
+        """
+        generate_signal evaluated for every bar (causal indicators,
+        so bar i matches generate_signal(df.iloc[:i + 1]))
+        """
+
+        ind = self.indicators(df)
+
+        signal = np.select(
+            [
+                (ind.ema_fast > ind.ema_slow) & (ind.rsi > 50),
+                (ind.ema_fast < ind.ema_slow) & (ind.rsi < 50)
+            ],
+            ["BUY", "SELL"],
+            default="NO_TRADE"
+        )
+
+        return pd.Series(signal, index=df.index)
+
+    def live_state(self) -> "EMARsiState":
+        return EMARsiState(self)
+
+
+class EMARsiState:
+    """
+    Incremental EMARsiStrategy (one close at a time)
+    Same maths as `indicators`: adjusted EMAs and a rolling-mean RSI,
+    so update(close_i) == signal_series(df).iloc[i]
+    """
+
+    def __init__(self, strategy: EMARsiStrategy):
+        self.strategy = strategy
+
+        self._decay_fast = 1 - 2 / (strategy.EMA_FAST + 1)
+        self._decay_slow = 1 - 2 / (strategy.EMA_SLOW + 1)
+
+        # Adjusted EMA = weighted sum / sum of weights
+        self._fast = [0.0, 0.0]
+        self._slow = [0.0, 0.0]
+
+        self._gains = deque(maxlen=strategy.RSI_PERIOD)
+        self._losses = deque(maxlen=strategy.RSI_PERIOD)
+        self._prev_close = None
+
+        self.ema_fast = None
+        self.ema_slow = None
+        self.rsi = None
+        self.signal = "NO_TRADE"
+
+    def update(self, close: float) -> str:
+        close = float(close)
+
+        for ema, decay in ((self._fast, self._decay_fast), (self._slow, self._decay_slow)):
+            ema[0] = ema[0] * decay + close
+            ema[1] = ema[1] * decay + 1
+
+        self.ema_fast = self._fast[0] / self._fast[1]
+        self.ema_slow = self._slow[0] / self._slow[1]
+
+        if self._prev_close is not None:
+            delta = close - self._prev_close
+            self._gains.append(max(delta, 0.0))
+            self._losses.append(max(-delta, 0.0))
+
+        self._prev_close = close
+
+        self.rsi = None
+
+        if len(self._gains) == self.strategy.RSI_PERIOD:
+            avg_gain = sum(self._gains) / self.strategy.RSI_PERIOD
+            avg_loss = sum(self._losses) / self.strategy.RSI_PERIOD
+
+            if avg_loss > 0:
+                self.rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+            elif avg_gain > 0:
+                self.rsi = 100.0
+
+        if self.rsi is not None and self.ema_fast > self.ema_slow and self.rsi > 50:
+            self.signal = "BUY"
+        elif self.rsi is not None and self.ema_fast < self.ema_slow and self.rsi < 50:
+            self.signal = "SELL"
+        else:
+            self.signal = "NO_TRADE"
+
+        return self.signal
@@ -0,0 +1,112 @@
+import glob
+import json
+import os
+import socket
+import threading
+import time
+
+
+class FakeEA:
+    """
+    Stand-in for an MT5 Expert Advisor consuming exported orders
+    - executes each sequence number once (re-sent batches are ignored)
+    - records signal → received latency per order
+    - `ack` False: receive but never acknowledge (forces re-sends)
+    """
+
+    def __init__(self):
+        self.orders = {}
+        self.batches = 0
+        self.duplicates = 0
+        self.latencies = []
+        self.ack = True
+
+    def receive(self, batch: dict) -> list[int]:
+        received_at = time.time()
+        self.batches += 1
+
+        for order in batch["orders"]:
+            if order["seq"] in self.orders:
+                self.duplicates += 1
+                continue
+
+            self.orders[order["seq"]] = order
+            self.latencies.append(received_at - order["created_at"])
+
+        return [order["seq"] for order in batch["orders"]] if self.ack else []
+
+    def latency_ms(self, q: float) -> float:
+        samples = sorted(self.latencies)
+        return samples[min(int(q * len(samples)), len(samples) - 1)] * 1000
+
+
+class FakeFileDropEA(FakeEA):
+    """
+    Polls outbox/ like an EA's OnTimer, answers in acks/
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 0.002):
+        super().__init__()
+        self.outbox = os.path.join(directory, "outbox")
+        self.acks = os.path.join(directory, "acks")
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            for path in sorted(glob.glob(os.path.join(self.outbox, "batch-*.json"))):
+                with open(path) as f:
+                    batch = json.load(f)
+                os.remove(path)
+
+                seqs = self.receive(batch)
+
+                if seqs:
+                    now = time.time()
+                    ack_path = os.path.join(self.acks, f"ack-{seqs[0]:012d}.txt")
+
+                    with open(f"{ack_path}.tmp", "w") as f:
+                        f.write("\n".join(f"{seq} {now}" for seq in seqs))
+                    os.replace(f"{ack_path}.tmp", ack_path)
+
+            self._stop.wait(self.poll_interval)
+
+
+class FakeSocketEA(FakeEA):
+    """
+    Connects to the exporter's socket like MQL5 SocketConnect
+    """
+
+    def __init__(self, address):
+        super().__init__()
+        self.sock = socket.create_connection(address)
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.sock.close()
+        self._thread.join(timeout=1)
+
+    def _loop(self):
+        try:
+            for line in self.sock.makefile("rb"):
+                seqs = self.receive(json.loads(line))
+
+                if seqs:
+                    self.sock.sendall(
+                        json.dumps({"ack": seqs, "received_at": time.time()}).encode() + b"\n"
+                    )
+        except OSError:
+            pass
@@ -0,0 +1,212 @@
+import socketserver
+import threading
+import time
+from collections import Counter
+
+from data.cache_backend import RELEASE_SCRIPT
+
+
+class FakeRedisServer:
+    """
+    In-process Redis-protocol server (RESP2) for offline tests
+    - GET / SET (EX, PX, NX, XX) / DEL / EXISTS / PTTL / PING / AUTH /
+      SELECT / FLUSHALL, and EVAL of the lock release script
+    - `commands` counts every command received
+    - `drop_connections()` closes open client sockets (server restart)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, password: str | None = None):
+        self.password = password
+        self.data = {}
+        self.commands = Counter()
+        self.lock = threading.Lock()
+        self.sockets = set()
+
+        fake = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                fake.sockets.add(self.connection)
+                authed = fake.password is None
+
+                try:
+                    while True:
+                        args = fake.read_command(self.rfile)
+
+                        if args is None:
+                            return
+
+                        name = args[0].decode().upper()
+                        fake.commands[name] += 1
+
+                        if not authed and name not in ("AUTH", "PING"):
+                            reply = Error("NOAUTH Authentication required.")
+                        elif name == "AUTH":
+                            authed = args[-1].decode() == fake.password
+                            reply = "OK" if authed else Error("WRONGPASS invalid password")
+                        else:
+                            reply = fake.execute(name, args[1:])
+
+                        self.wfile.write(encode(reply))
+                        self.wfile.flush()
+
+                except (ConnectionError, OSError):
+                    return
+
+                finally:
+                    fake.sockets.discard(self.connection)
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}{host}:{port}/0"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.drop_connections()
+
+    def drop_connections(self):
+        for sock in list(self.sockets):
+            try:
+                sock.shutdown(2)
+            except OSError:
+                pass
+
+    # ==============================
+    # PROTOCOL
+    # ==============================
+
+    @staticmethod
+    def read_command(rfile):
+        line = rfile.readline()
+
+        if not line:
+            return None
+
+        if not line.startswith(b"*"):
+            raise ConnectionError("Inline commands are not supported")
+
+        args = []
+
+        for _ in range(int(line[1:-2])):
+            length = int(rfile.readline()[1:-2])
+            args.append(rfile.read(length + 2)[:-2])
+
+        return args
+
+    # ==============================
+    # COMMANDS
+    # ==============================
+
+    def _live(self, key):
+        # Lock held
+        entry = self.data.get(key)
+
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+
+        return entry
+
+    def execute(self, name, args):
+        with self.lock:
+            if name == "PING":
+                return "PONG"
+
+            if name in ("SELECT", "FLUSHALL"):
+                if name == "FLUSHALL":
+                    self.data.clear()
+                return "OK"
+
+            if name == "GET":
+                entry = self._live(args[0])
+                return entry[0] if entry else None
+
+            if name == "SET":
+                return self._set(args[0], args[1], [a.decode().upper() for a in args[2:]])
+
+            if name == "DEL":
+                return sum(self._live(k) is not None and self.data.pop(k) is not None for k in args)
+
+            if name == "EXISTS":
+                return sum(self._live(k) is not None for k in args)
+
+            if name == "PTTL":
+                entry = self._live(args[0])
+
+                if entry is None:
+                    return -2
+
+                return -1 if entry[1] is None else int((entry[1] - time.monotonic()) * 1000)
+
+            if name == "EVAL":
+                if args[0].decode() != RELEASE_SCRIPT:
+                    return Error("ERR only the lock release script is supported")
+
+                key, token = args[2], args[3]
+                entry = self._live(key)
+
+                if entry is not None and entry[0] == token:
+                    del self.data[key]
+                    return 1
+
+                return 0
+
+            return Error(f"ERR unknown command '{name}'")
+
+    def _set(self, key, value, options):
+        expires = None
+        i = 0
+
+        while i < len(options):
+            option = options[i]
+
+            if option in ("EX", "PX"):
+                amount = int(options[i + 1])
+                expires = time.monotonic() + (amount if option == "EX" else amount / 1000)
+                i += 2
+                continue
+
+            if option == "NX" and self._live(key) is not None:
+                return None
+
+            if option == "XX" and self._live(key) is None:
+                return None
+
+            i += 1
+
+        self.data[key] = (value, expires)
+        return "OK"
+
+
+class Error(str):
+    pass
+
+
+def encode(reply) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+
+    if isinstance(reply, Error):
+        return b"-" + reply.encode() + b"\r\n"
+
+    if isinstance(reply, bool) or isinstance(reply, int):
+        return b":%d\r\n" % int(reply)
+
+    if isinstance(reply, str):
+        return b"+" + reply.encode() + b"\r\n"
+
+    if isinstance(reply, bytes):
+        return b"$%d\r\n" % len(reply) + reply + b"\r\n"
+
+    return b"*%d\r\n" % len(reply) + b"".join(encode(r) for r in reply)
@@ -0,0 +1,98 @@
+import json
+import socketserver
+import sys
+import threading
+import time
+
+
+def handle_request(request: dict, sent: list) -> dict:
+    """
+    Minimal signal-cli JSON-RPC semantics for `send`
+    """
+
+    if request.get("method") != "send":
+        return {
+            "jsonrpc": "2.0",
+            "id": request.get("id"),
+            "error": {"code": -32601, "message": "Method not found"}
+        }
+
+    params = request.get("params", {})
+    sent.append(params)
+
+    return {
+        "jsonrpc": "2.0",
+        "id": request.get("id"),
+        "result": {
+            "timestamp": int(time.time() * 1000),
+            "results": [
+                {"recipientAddress": {"number": r}, "type": "SUCCESS"}
+                for r in params.get("recipient", [])
+            ]
+        }
+    }
+
+
+class FakeSignalCLIDaemon:
+    """
+    In-process stand-in for `signal-cli daemon --tcp`
+    - records every `send` call
+    - `drop_next` closes the connection on the next request
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.sent = []
+        self.connections = 0
+        self.drop_next = False
+
+        fake = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                fake.connections += 1
+
+                # Unsolicited notification, like incoming receipts
+                self.wfile.write(b'{"jsonrpc":"2.0","method":"receive","params":{}}\n')
+
+                for line in self.rfile:
+                    if fake.drop_next:
+                        fake.drop_next = False
+                        return
+
+                    response = handle_request(json.loads(line), fake.sent)
+                    self.wfile.write(json.dumps(response).encode() + b"\n")
+                    self.wfile.flush()
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self.server.daemon_threads = True
+
+    @property
+    def address(self) -> str:
+        host, port = self.server.server_address
+        return f"tcp://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    """
+    stdio mode: `python -m tests.fake_signal_cli_daemon`
+    """
+
+    sent = []
+
+    for line in sys.stdin:
+        response = handle_request(json.loads(line), sent)
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
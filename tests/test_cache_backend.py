@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from data.cache_backend import CacheBackend, MemoryBackend, RedisBackend
+from data.candle_codec import decode_candles, encode_candles
+from data.resampler import open_times_ms
+from tests.fake_redis import FakeRedisServer
+
+
+BARS = 5_000
+
+
+def twelve_data_frame(limit: int) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    close = 1.08 + np.cumsum(rng.normal(0, 5e-4, BARS))
+
+    return pd.DataFrame({
+        "datetime": pd.date_range("2026-01-05", periods=BARS, freq="h").strftime("%Y-%m-%d %H:%M:%S"),
+        "open": close - 1e-4,
+        "high": close + 5e-4,
+        "low": close - 5e-4,
+        "close": close,
+        "volume": 0.0
+    }).tail(limit).reset_index(drop=True)
+
+
+class CountingProvider:
+    """
+    Slow upstream shared by every node; counts calls
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def fetch(self, symbol, interval, limit):
+        with self.lock:
+            self.calls.append(limit)
+
+        time.sleep(0.2)
+        return twelve_data_frame(limit)
+
+
+def check_codec():
+    df = twelve_data_frame(1_000)
+    payload = encode_candles(df, fetched_limit=1_000)
+    decoded, fetched = decode_candles(payload)
+
+    as_json = json.dumps(df.to_dict("records")).encode()
+    print(f"codec: {len(payload)} bytes vs {len(as_json)} JSON ({len(as_json) / len(payload):.1f}x)")
+
+    assert fetched == 1_000 and len(payload) < len(as_json) / 2
+    assert np.array_equal(decoded["close"].to_numpy(), df["close"].to_numpy())
+    assert np.array_equal(decoded["timestamp"].to_numpy(), open_times_ms(df))
+    assert not decoded["close"].to_numpy().flags.writeable
+
+    # Volume kept when present (crypto)
+    crypto = df.assign(volume=np.arange(len(df), dtype=float))
+    assert np.array_equal(decode_candles(encode_candles(crypto))[0]["volume"], crypto["volume"])
+
+
+def check_backend(backend: CacheBackend):
+    name = type(backend).__name__
+
+    backend.set("k", b"\x00\r\nbinary", ttl=0.2)
+    assert backend.get("k") == b"\x00\r\nbinary"
+    time.sleep(0.25)
+    assert backend.get("k") is None, name
+
+    # Locks: exclusive, expire, and only the holder's token releases
+    with backend.lock("job", ttl=0.3) as held:
+        assert held
+
+        with backend.lock("job", ttl=0.3, timeout=0.05) as other:
+            assert not other
+
+        time.sleep(0.35)
+
+        # Expired: another caller takes it; our exit must not release theirs
+        thief = backend.lock("job", ttl=5, timeout=0.1)
+        assert thief.__enter__()
+
+    with backend.lock("job", timeout=0.05) as again:
+        assert not again, name
+
+    thief.__exit__(None, None, None)
+
+    with backend.lock("job", timeout=0.05) as again:
+        assert again, name
+
+
+def main():
+    os.environ.setdefault("TWELVE_DATA_API_KEY", "test")
+
+    from data.market_data_router import MarketDataRouter
+
+    check_codec()
+
+    server = FakeRedisServer(password="secret").start()
+
+    try:
+        check_backend(MemoryBackend())
+        check_backend(RedisBackend(server.url, prefix="test:"))
+        server.data.clear()
+
+        # 1. Two nodes, four concurrent callers each → one upstream call
+        provider = CountingProvider()
+        nodes = []
+
+        for _ in range(2):
+            router = MarketDataRouter(cache=RedisBackend(server.url, prefix="tc:"))
+            router.fetch_upstream = provider.fetch
+            nodes.append(router)
+
+        frames = []
+
+        def ask(router):
+            frames.append(router.fetch_ohlcv("EURUSD", "1h", 500))
+
+        threads = [threading.Thread(target=ask, args=(n,)) for n in nodes * 4]
+
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        print("upstream calls:", provider.calls, "commands:", dict(server.commands))
+        assert provider.calls == [500]
+        assert all(len(f) == 500 for f in frames)
+        assert len({float(f["close"].iloc[-1]) for f in frames}) == 1
+
+        # 2. A wider window refreshes once; narrower ones are served from it
+        assert len(nodes[1].fetch_ohlcv("EURUSD", "1h", 1_200)) == 1_200
+        assert len(nodes[0].fetch_ohlcv("EURUSD", "1h", 300)) == 300
+        assert provider.calls == [500, 1_200]
+
+        # 3. News calendar: downloaded once for every node, failures not cached
+        from analytics.news_engine import NewsEngine
+
+        CacheBackend._shared = RedisBackend(server.url, prefix="tc:")
+        soon = datetime.now(timezone.utc) + timedelta(minutes=10)
+        downloads = []
+
+        def feed():
+            downloads.append(1)
+
+            if len(downloads) == 1:
+                raise ConnectionError("feed down")
+
+            root = ET.fromstring(
+                "<weeklyevents><event><impact>High</impact>"
+                f"<date>{soon:%m-%d-%Y}</date><time>{soon:%H:%M}</time></event>"
+                "<event><impact>Low</impact><date>01-01-2026</date><time>10:00</time></event>"
+                "</weeklyevents>"
+            )
+            return root.findall("event")
+
+        NewsEngine.download_events = staticmethod(feed)
+
+        assert NewsEngine.get_high_impact_events() == []
+        assert NewsEngine.is_news_time() and NewsEngine.is_news_time()
+        assert len(downloads) == 2
+
+        # 4. Analysis snapshots: identical requests share one result
+        from services import analyse_service
+
+        runs = []
+
+        def fake_analysis(**params):
+            runs.append(params["symbol"])
+
+            if params["symbol"] == "BAD":
+                return {"error": "Market data failed"}
+
+            return {"symbol": params["symbol"], "signal": "BUY", "rr_ratio": np.float64(2.5)}
+
+        analyse_service.analyze_market = fake_analysis
+        params = {"interval": "1h", "account_balance": 1_000, "risk_percent": 1.0,
+                  "lot_size": None, "min_lot": 0.001, "max_lot": 100}
+
+        first = analyse_service.analysis_snapshot(symbol="EURUSD", **params)
+        second = analyse_service.analysis_snapshot(symbol="EURUSD", **params)
+        assert first == second == {"symbol": "EURUSD", "signal": "BUY", "rr_ratio": 2.5}
+
+        for _ in range(2):
+            assert "error" in analyse_service.analysis_snapshot(symbol="BAD", **params)
+
+        assert runs == ["EURUSD", "BAD", "BAD"]
+
+        # 5. Stale pooled sockets are replaced transparently
+        server.drop_connections()
+        assert len(nodes[0].fetch_ohlcv("EURUSD", "1h", 500)) == 500
+
+        # 6. Backend down: computed locally, no error
+        server.stop()
+        degraded = nodes[0].fetch_ohlcv("EURUSD", "1h", 500)
+        assert len(degraded) == 500 and nodes[0].cache.stats()["backend_errors"] == 1
+
+        print("node 0:", nodes[0].cache.stats())
+        print("cache backend OK")
+
+    finally:
+        CacheBackend._shared = None
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine
+
+from data.resampler import MINUTE_MS
+from database.candle_store import ROW_DTYPE, CandleStore, month_start_ms
+
+
+def year_of_minutes(seed: int = 46) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n = 365 * 24 * 60
+
+    rows = np.empty(n, dtype=ROW_DTYPE)
+    rows["open_time"] = month_start_ms(2025, 1) + np.arange(n) * MINUTE_MS
+
+    close = 1.08 * np.exp(np.cumsum(rng.normal(0, 2e-4, n)))
+    rows["open"] = np.r_[1.08, close[:-1]]
+    rows["close"] = close
+    rows["high"] = np.maximum(rows["open"], close) * (1 + rng.uniform(0, 1e-4, n))
+    rows["low"] = np.minimum(rows["open"], close) * (1 - rng.uniform(0, 1e-4, n))
+    rows["volume"] = rng.uniform(10, 1000, n)
+
+    return rows
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="candles-")
+
+    try:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'candles.db')}")
+        store = CandleStore(engine)
+        store.create_table()
+
+        rows = year_of_minutes()
+
+        started = time.perf_counter()
+        store.upsert("EURUSD", "1m", rows)
+        loaded = time.perf_counter() - started
+
+        started = time.perf_counter()
+        everything = store.read("EURUSD", "1m")
+        read_all = time.perf_counter() - started
+
+        print(f"{len(rows):,} bars | upsert {loaded:.2f}s | read all {read_all:.2f}s")
+        assert loaded < 20 and read_all < 5
+        assert np.array_equal(everything, rows)
+
+        # Range read: one March week
+        start = month_start_ms(2025, 3)
+        end = start + 7 * 24 * 60 * MINUTE_MS
+
+        started = time.perf_counter()
+        week = store.read("EURUSD", "1m", start_ms=start, end_ms=end)
+        print(f"week range read: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        mask = (rows["open_time"] >= start) & (rows["open_time"] < end)
+        assert np.array_equal(week, rows[mask])
+
+        # Latest bars, oldest first
+        tail = store.read("EURUSD", "1m", limit=500)
+        assert np.array_equal(tail, rows[-500:])
+
+        # Upsert overlap: existing bars updated, new ones appended,
+        # other intervals / symbols untouched
+        revised = rows[-10:].copy()
+        revised["close"] += 0.01
+        revised["volume"] = np.nan
+
+        extra = rows[-5:].copy()
+        extra["open_time"] += 5 * MINUTE_MS
+
+        store.upsert("EURUSD", "1m", np.concatenate([revised, extra]))
+        store.upsert("EURUSD", "5m", rows[:100])
+        store.upsert("GBPUSD", "1m", rows[:100])
+
+        tail = store.read("EURUSD", "1m", limit=15)
+        assert np.allclose(tail["close"][:10], rows["close"][-10:] + 0.01)
+        assert np.isnan(tail["volume"][:10]).all()
+        assert store.latest_open_time("EURUSD", "1m") == extra["open_time"][-1]
+        assert len(store.read("EURUSD", "1m")) == len(rows) + 5
+
+        frame = store.read_frame("EURUSD", "5m")
+        assert list(frame.columns) == ["timestamp", "open", "high", "low", "close", "volume"]
+        assert len(frame) == 100 and frame["timestamp"].iloc[0] == rows["open_time"][0]
+
+        print("candle store OK")
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
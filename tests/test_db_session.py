@@ -0,0 +1,88 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+
+from sqlalchemy import select
+
+from database.models import User, UserSettings
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="db-")
+
+    # The engine is built from DATABASE_URL at import
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'app.db')}"
+
+    from api.user import register_user
+    from database import session
+    from database.init_db import init_db
+
+    try:
+        # URL handling: libpq style URL → asyncpg with statement cache
+        url = session.async_url("postgres://u:p@db:5432/app?sslmode=require")
+        assert url.drivername == "postgresql+asyncpg"
+        assert url.query["ssl"] == "require" and "sslmode" not in url.query
+        assert url.query["prepared_statement_cache_size"] == "256"
+
+        # Explicit pool sizing for server databases (no connection made)
+        pg = session.build_engine("postgresql://u:p@db:5432/app")
+        assert (pg.pool.size(), pg.pool._max_overflow) == (5, 5)
+        assert pg.pool._recycle == 1800
+
+        # One Base / metadata: every table from a single init
+        init_db()
+
+        with session.SessionLocal() as db:
+            db.add(User(name="a", whatsapp_number="+1", account_balance=1000))
+            db.commit()
+
+            user = db.scalar(select(User))
+            db.add(UserSettings(user_id=user.id, account_balance=1000, risk_percent=1.0))
+            db.commit()
+
+            assert db.scalar(select(UserSettings.confidence_threshold)) == 70.0
+
+        # Pool metrics under concurrent use
+        def work():
+            for _ in range(20):
+                with session.SessionLocal() as db:
+                    db.scalar(select(User.id))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = session.pool_stats()
+        print("pool:", stats)
+
+        sync = stats["sync"]
+        assert sync["checkouts"] >= 80 and sync["checkouts"] == sync["checkins"]
+        assert sync["checked_out"] == 0 and sync["max_checked_out"] >= 1
+
+        # Async session through the /users handler
+        async def register():
+            async with session.async_session_factory()() as db:
+                return await register_user(
+                    {"name": "b", "whatsapp_number": "+2", "account_balance": 500}, db
+                )
+
+        response = asyncio.run(register())
+        assert response["status"] == "registered"
+
+        with session.SessionLocal() as db:
+            assert db.get(User, response["user_id"]).account_balance == 500
+
+        assert session.pool_stats()["async"]["checkouts"] >= 1
+
+        print("db session OK")
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import time
+
+from notifications.dispatch_queue import NotificationQueue, PartialDelivery, idempotency_key
+from notifications.signal_cli_daemon import SignalCLIError
+
+
+class SlowSender:
+    """Simulates a slow provider (blocking POST)"""
+
+    batches = []
+
+    @classmethod
+    def send_batch(cls, recipient, signals):
+        time.sleep(0.2)
+        cls.batches.append((recipient, len(signals)))
+
+
+class FlakySender:
+    """Fails the first two calls, then succeeds"""
+
+    calls = 0
+
+    @classmethod
+    def send_batch(cls, recipient, signals):
+        cls.calls += 1
+
+        if cls.calls <= 2:
+            raise ConnectionError("provider unavailable")
+
+
+class PartialSender:
+    """Delivers two messages, then fails on the third (first call only)"""
+
+    batches = []
+
+    @classmethod
+    def send_batch(cls, recipient, signals):
+        cls.batches.append([s["entry_price"] for s in signals])
+
+        if len(cls.batches) == 1:
+            raise PartialDelivery(2, TimeoutError("read timed out"))
+
+
+class RejectingSender:
+    """signal-cli rejects the request (JSON-RPC error)"""
+
+    calls = 0
+
+    @classmethod
+    def send_batch(cls, recipient, signals):
+        cls.calls += 1
+        raise SignalCLIError("Invalid recipient")
+
+
+def make_signal(symbol, entry):
+    return {
+        "symbol": symbol,
+        "interval": "1h",
+        "signal": "BUY",
+        "entry_price": entry,
+        "signal_validity": {"expires_at": "2026-01-01T00:00:00Z"}
+    }
+
+
+def main():
+    q = NotificationQueue(
+        channels={
+            "email": SlowSender,
+            "signal": FlakySender,
+            "partial": PartialSender,
+            "rejected": RejectingSender
+        },
+        workers=2,
+        batch_window=0.05,
+        base_backoff=0.05
+    )
+    q.start()
+
+    started = time.perf_counter()
+
+    for i in range(20):
+        q.enqueue("email", "trader@example.com", make_signal("EURUSD", 1.1 + i / 1000))
+
+    q.enqueue("signal", "+15550000", make_signal("XAUUSD", 2400.0))
+
+    # Duplicate (same idempotency key) is ignored
+    duplicate = q.enqueue("signal", "+15550000", make_signal("XAUUSD", 2400.0))
+
+    for entry in (1.1, 1.2, 1.3):
+        q.enqueue("partial", "trader@example.com", make_signal("GBPUSD", entry))
+
+    q.enqueue("rejected", "+15550009", make_signal("EURUSD", 1.1))
+
+    # Rescan of the same trade with a later expiry keeps its key
+    rescanned = make_signal("XAUUSD", 2400.0)
+    rescanned["signal_validity"] = {"expires_at": "2026-01-01T04:00:00Z"}
+    assert idempotency_key("signal", "+15550000", rescanned) == \
+        idempotency_key("signal", "+15550000", make_signal("XAUUSD", 2400.0))
+
+    print(f"Enqueue time: {(time.perf_counter() - started) * 1000:.2f}ms")
+    print("Duplicate accepted:", duplicate)
+
+    q.flush()
+    q.stop()
+
+    print("Email batches:", SlowSender.batches)
+    print("Flaky sender calls:", FlakySender.calls)
+    print("Partial sender batches:", PartialSender.batches)
+    print("Stats:", q.stats())
+
+    # Partial failure: only the undelivered message is retried
+    assert PartialSender.batches == [[1.1, 1.2, 1.3], [1.3]]
+    assert q.stats()["channels"]["partial"]["delivered"] == 3
+
+    # JSON-RPC error: dead-lettered on the first attempt, never resent
+    assert RejectingSender.calls == 1
+    assert q.stats()["channels"]["rejected"]["dead_letters"] == 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+from sqlalchemy import create_engine, func, inspect, select
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.history_writer import HistoryWriter
+from database.models import AnalysisRecord
+
+
+def result(i: int) -> dict:
+    return {
+        "symbol": ["EURUSD", "GBPUSD", "XAUUSD"][i % 3],
+        "interval": "1h",
+        "signal": "BUY" if i % 2 else "HOLD",
+        "trend": "BULLISH",
+        "entry": np.float64(1.08 + i * 1e-5),
+        "stop_loss": 1.07,
+        "take_profit": 1.10,
+        "rr_ratio": 2.0,
+        "confidence_percent": 71.5,
+        "trade_allowed": bool(i % 2),
+        "block_reason": None,
+        "sizing": {"units": np.float64(10_000), "lots": 0.1},
+        "generated_at": time.time()
+    }
+
+
+class SlowSession:
+    """
+    Session wrapper adding a fixed commit delay (slow database)
+    """
+
+    def __init__(self, factory, delay: float):
+        self.session = factory()
+        self.delay = delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.session.close()
+
+    def execute(self, *args):
+        return self.session.execute(*args)
+
+    def commit(self):
+        time.sleep(self.delay)
+        self.session.commit()
+
+
+class FlakySession(SlowSession):
+    """
+    Commit fails the first `failures` times (database restarting)
+    """
+
+    failures = 0
+
+    def commit(self):
+        if FlakySession.failures:
+            FlakySession.failures -= 1
+            raise ConnectionError("database unavailable")
+
+        self.session.commit()
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="history-")
+
+    try:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'history.db')}")
+        Base.metadata.create_all(engine, tables=[AnalysisRecord.__table__])
+        factory = sessionmaker(bind=engine)
+
+        indexes = inspect(engine).get_indexes("analysis_history")
+        assert indexes[0]["column_names"] == ["symbol", "interval", "created_at"]
+
+        # Slow DB: 50 ms per commit, producers never wait
+        writer = HistoryWriter(
+            lambda: SlowSession(factory, 0.05),
+            batch_size=200,
+            flush_interval=0.1
+        )
+        writer.start()
+
+        n = 20_000
+        latencies = np.empty(n)
+
+        for i in range(n):
+            started = time.perf_counter()
+            writer.record("analysis", result(i))
+            latencies[i] = time.perf_counter() - started
+
+        assert writer.flush(30)
+        stats = writer.stats()
+
+        print(f"record p50 {np.percentile(latencies, 50) * 1e6:.1f} µs "
+              f"p99 {np.percentile(latencies, 99) * 1e6:.1f} µs | {stats}")
+
+        assert np.percentile(latencies, 99) < 0.001
+        assert stats["written"] == n and stats["batches"] < n / 200
+
+        with factory() as session:
+            count = session.scalar(select(func.count()).select_from(AnalysisRecord))
+            row = session.scalars(
+                select(AnalysisRecord)
+                .where(AnalysisRecord.symbol == "GBPUSD", AnalysisRecord.interval == "1h")
+                .order_by(AnalysisRecord.created_at.desc())
+            ).first()
+
+        assert count == n
+        assert row.payload["sizing"]["units"] == 10_000
+        assert row.entry == float(result(row.id - 1)["entry"])
+
+        # Full buffer: request-path records are shed, blocking ones wait
+        writer.max_pending = 100
+
+        for i in range(1_000):
+            writer.record("analysis", result(i))
+
+        assert writer.record("signal", result(0), block=True, timeout=5)
+        assert writer.flush(30)
+
+        stats = writer.stats()
+        print("bounded:", stats)
+        assert stats["dropped"] > 0 and stats["written"] == n + 1_001 - stats["dropped"]
+
+        writer.stop()
+
+        # Retries log one line per batch, not one per attempt
+        FlakySession.failures = 3
+        flaky = HistoryWriter(lambda: FlakySession(factory, 0), base_backoff=0.01)
+        out = io.StringIO()
+
+        with redirect_stdout(out):
+            flaky._write([("analysis", result(i), time.time()) for i in range(10)])
+
+        print("retried:", out.getvalue().strip())
+        assert out.getvalue().count("[HISTORY") == 1
+        assert flaky.stats()["failures"] == 3 and flaky.stats()["written"] == 10
+
+        # An outage logs its first batch and the recovery, not every batch
+        flaky._write([("analysis", result(0), time.time())])
+        out = io.StringIO()
+
+        with redirect_stdout(out):
+            FlakySession.failures = 30
+
+            for _ in range(5):
+                flaky._write([("analysis", result(0), time.time())])
+
+            FlakySession.failures = 0
+            flaky._write([("analysis", result(0), time.time())])
+
+        print("outage:", out.getvalue().strip())
+        assert out.getvalue().count("[HISTORY") == 2 and "recovered" in out.getvalue()
+
+        print("history writer OK")
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from analytics.htf_trend import HigherTimeframeTrend
+
+
+def make_hourly_bars(count=700, start="2026-01-05 00:00:00"):
+    rng = np.random.default_rng(11)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.001, count))
+    open_ = np.r_[close[0], close[:-1]]
+
+    return pd.DataFrame({
+        "timestamp": (
+            pd.date_range(start, periods=count, freq="1h")
+            .as_unit("ms").asi8
+        ),
+        "open": open_,
+        "high": np.maximum(open_, close) + 0.0005,
+        "low": np.minimum(open_, close) - 0.0005,
+        "close": close,
+        "volume": 0.0
+    })
+
+
+def main():
+    service = HigherTimeframeTrend()
+    df = make_hourly_bars()
+
+    trends = service.trend_series(df, "1h").to_numpy()
+    warm = service.required_bars("1h", 0)
+
+    assert set(trends[warm:]) <= {"Bullish", "Bearish", "Ranging"}
+    assert len(set(trends[warm:])) > 1
+
+    # No lookahead: bar i's trend only depends on bars up to i
+    for i in range(warm, len(df)):
+        truncated = service.trend_series(df.iloc[:i + 1], "1h").iloc[-1]
+        assert truncated == trends[i], i
+
+    # Rewriting the future leaves the past untouched
+    shocked = df.copy()
+    shocked.loc[500:, ["open", "high", "low", "close"]] *= 1.5
+    assert (service.trend_series(shocked, "1h").to_numpy()[:500] == trends[:500]).all()
+
+    # Backtester: the window df.iloc[:i] is judged with trends[i - 1]
+    for i in range(warm + 1, len(df), 7):
+        window = df.iloc[:i]
+        assert service.trend_for("EURUSD", "1h", window) == trends[i - 1], i
+
+    # Incremental state replays the same series bar by bar
+    live = service.live_state("1h")
+
+    for i, row in enumerate(df.itertuples(index=False)):
+        state = live.update(row.timestamp, row.open, row.high, row.low, row.close)
+
+        if i >= warm:
+            assert state == trends[i], i
+
+    print("HTF trends (last 10):", list(trends[-10:]))
+    print("htf trend OK")
+
+
+if __name__ == "__main__":
+    main()
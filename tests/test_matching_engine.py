@@ -0,0 +1,100 @@
+import time
+
+import numpy as np
+
+from execution.matching_engine import PaperMatchingEngine
+
+
+SYMBOLS = ["EURUSD", "GBPUSD", "AUDUSD", "NZDUSD", "XAUUSD"]
+PRICES = {"EURUSD": 1.08, "GBPUSD": 1.27, "AUDUSD": 0.66, "NZDUSD": 0.60, "XAUUSD": 2350.0}
+
+
+def main():
+    rng = np.random.default_rng(40)
+    engine = PaperMatchingEngine(default_balance=10_000, history=None)
+
+    expected = {}
+
+    # 20k positions over 200 accounts
+    for i in range(20_000):
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        price = PRICES[symbol]
+        side = "BUY" if rng.random() < 0.5 else "SELL"
+        distance = price * rng.uniform(0.002, 0.05)
+        sign = 1 if side == "BUY" else -1
+
+        position = engine.open_position(
+            account=f"acct-{i % 200}",
+            symbol=symbol,
+            side=side,
+            units=1 if symbol == "XAUUSD" else 1_000,
+            entry_price=price,
+            stop_loss=price - sign * distance,
+            take_profit=price + sign * 2 * distance
+        )
+        expected[position.id] = position
+
+    # Random walk bars; compare fills with a brute-force scan
+    fills = 0
+    started = time.perf_counter()
+    brute = 0.0
+
+    for step in range(500):
+        for symbol in SYMBOLS:
+            open_ = PRICES[symbol]
+            close = open_ * (1 + rng.normal(0, 0.002))
+            high = max(open_, close) * (1 + abs(rng.normal(0, 0.001)))
+            low = min(open_, close) * (1 - abs(rng.normal(0, 0.001)))
+            PRICES[symbol] = close
+
+            t = time.perf_counter()
+            should_fill = {
+                p.id for p in expected.values()
+                if p.symbol == symbol and (
+                    (p.direction == 1 and (low <= p.stop_loss or high >= p.take_profit))
+                    or (p.direction == -1 and (high >= p.stop_loss or low <= p.take_profit))
+                )
+            }
+            brute += time.perf_counter() - t
+
+            filled = {f["id"] for f in engine.on_bar(symbol, open_, high, low, close)}
+            assert filled == should_fill, (symbol, step)
+
+            for position_id in filled:
+                del expected[position_id]
+
+            fills += len(filled)
+
+    elapsed = time.perf_counter() - started - brute
+
+    # Stale counters match the closed positions' levels left in the heaps
+    for symbol, book in engine._books.items():
+        left = sum(1 for e in book.upper + book.lower if e[2] not in engine.positions)
+        assert book.stale == left, (symbol, book.stale, left)
+
+    print(f"{fills} fills over 2500 bars in {elapsed * 1000:.1f} ms "
+          f"(brute-force scan: {brute * 1000:.1f} ms)")
+    print("Stats:", engine.stats())
+
+    pnl = sum(t["pnl"] for t in engine.closed)
+    balances = sum(engine.balances.values()) - 200 * 10_000
+    assert abs(pnl - balances) < 1e-3 * max(abs(pnl), 1)
+    print("Realized PnL:", round(pnl, 2))
+
+    # One bar through both levels: both popped, nothing left stale
+    book_engine = PaperMatchingEngine()
+    wide = book_engine.open_position("a", "EURUSD", "BUY", 1_000, 1.08, 1.07, 1.09)
+    book_engine.open_position("a", "EURUSD", "SELL", 1_000, 1.08, 1.20)
+    book = book_engine._books["EURUSD"]
+
+    fills = book_engine.on_bar("EURUSD", 1.08, 1.095, 1.065, 1.08)
+    assert [(f["id"], f["exit_reason"]) for f in fills] == [(wide.id, "SL")]
+    assert book.stale == 0 and len(book) == 1
+
+    # Manual close of a stop-only position leaves one stale level
+    book_engine.close_position(wide.id + 1, 1.08)
+    assert book.stale == 1 and len(book) == 1
+
+
+if __name__ == "__main__":
+    main()
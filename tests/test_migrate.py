@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.migrate import upgrade
+from database.models import User
+
+
+# users as created before the email / clerk_id / created_at columns
+BASELINE_USERS = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    whatsapp_number VARCHAR NOT NULL UNIQUE,
+    account_balance FLOAT NOT NULL,
+    risk_percent FLOAT,
+    min_lot FLOAT,
+    max_lot FLOAT,
+    receive_signals BOOLEAN,
+    receive_high_profit_only BOOLEAN
+)
+"""
+
+# users as created by the former models.user (db.create_tables)
+LEGACY_USERS = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY,
+    username VARCHAR(50) NOT NULL UNIQUE,
+    phone VARCHAR(20) NOT NULL UNIQUE,
+    created_at DATETIME
+)
+"""
+
+
+def upgraded(directory, name, ddl, insert):
+    engine = create_engine(f"sqlite:///{os.path.join(directory, name)}")
+
+    with engine.begin() as conn:
+        conn.execute(text(ddl))
+        conn.execute(text("CREATE INDEX ix_users_id ON users (id)"))
+        conn.execute(text(insert))
+
+    statements = upgrade(engine)
+    Base.metadata.create_all(bind=engine)
+
+    print(f"{name}:", *statements, sep="\n  ")
+
+    # Idempotent: nothing left to do
+    assert upgrade(engine) == []
+
+    return engine, statements
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="migrate-")
+
+    try:
+        engine, statements = upgraded(
+            directory, "baseline.db", BASELINE_USERS,
+            "INSERT INTO users (name, whatsapp_number, account_balance) VALUES ('a', '+1', 1000)"
+        )
+
+        assert len(statements) == 4
+        assert {"user_settings", "analysis_history", "candles"} <= set(inspect(engine).get_table_names())
+
+        with sessionmaker(bind=engine)() as db:
+            user = db.scalars(select(User)).one()
+            assert user.name == "a" and user.email is None
+
+            db.add(User(name="b", whatsapp_number="+2", account_balance=1, clerk_id="c1"))
+            db.commit()
+
+        with sessionmaker(bind=engine)() as db:
+            db.add(User(name="c", whatsapp_number="+3", account_balance=1, clerk_id="c1"))
+
+            try:
+                db.commit()
+                raise AssertionError("clerk_id must stay unique")
+            except Exception as e:
+                assert "UNIQUE" in str(e)
+
+        engine, statements = upgraded(
+            directory, "legacy.db", LEGACY_USERS,
+            "INSERT INTO users (username, phone) VALUES ('old', '+9')"
+        )
+
+        with sessionmaker(bind=engine)() as db:
+            user = db.scalars(select(User)).one()
+
+        assert (user.name, user.whatsapp_number) == ("old", "+9")
+        assert user.receive_signals is True and user.risk_percent == 1.0
+
+        print("migrate OK")
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
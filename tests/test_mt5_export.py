@@ -0,0 +1,157 @@
+import os
+import shutil
+import tempfile
+import time
+
+from execution.brokers.mt5_export import FileDropTransport, MT5ExportQueue, SocketTransport
+from tests.fake_mt5_ea import FakeFileDropEA, FakeSocketEA
+
+
+def analysis(i: int) -> dict:
+    return {
+        "symbol": "EURUSD",
+        "interval": "1h",
+        "signal": "BUY" if i % 2 else "SELL",
+        "trend": "BULLISH",
+        "entry": 1.08 + i * 1e-5,
+        "stop_loss": 1.07,
+        "take_profit": 1.10,
+        "sizing": {"units": 10_000 + i},
+        "signal_validity": {"expires_at": "2026-01-01T00:00:00Z"},
+        "generated_at": time.time()
+    }
+
+
+def check_contract_sizes():
+    """
+    Metals and crypto export their own lot sizes, not units / 100k
+    """
+
+    from execution.brokers.mt5 import MT5Bridge
+    from execution.order_builder import OrderBuilder
+
+    gold = {**analysis(1), "symbol": "XAUUSD", "entry": 2350.0, "stop_loss": 2340.0,
+            "take_profit": 2370.0, "sizing": {"units": 10.0, "lots": 0.1}}
+    bitcoin = {**analysis(1), "symbol": "BTCUSDT", "entry": 65_000.0, "stop_loss": 64_000.0,
+               "take_profit": 67_000.0, "sizing": {"units": 0.1, "lots": 0.1}}
+
+    for signal in (gold, bitcoin):
+        order = OrderBuilder.build_from_analysis(signal)
+        assert order.units == signal["sizing"]["units"]
+        assert MT5Bridge.generate(order)["volume_lots"] == 0.1, signal["symbol"]
+
+        # Without sized lots: units / the registry contract size
+        order.lots = None
+        assert MT5Bridge.generate(order)["volume_lots"] == 0.1, signal["symbol"]
+
+    # Flattened API response
+    flat = {**bitcoin, "position_size": 0.1, "recommended_lot_size": 0.1}
+    del flat["sizing"]
+    assert MT5Bridge.generate(OrderBuilder.build_from_analysis(flat))["volume_lots"] == 0.1
+
+
+def run(exporter: MT5ExportQueue, n: int, first: int = 0, pace: float = 0.0) -> float:
+    started = time.perf_counter()
+
+    for i in range(first, first + n):
+        assert exporter.submit(analysis(i)) == exporter.seq
+
+        if pace:
+            time.sleep(pace)
+
+    assert exporter.flush(10)
+    return time.perf_counter() - started
+
+
+def main():
+    check_contract_sizes()
+
+    directory = tempfile.mkdtemp(prefix="mt5-")
+
+    try:
+        # File drop: batches, dedup, acks, latency
+        drop = os.path.join(directory, "drop")
+        state_path = os.path.join(directory, "export.json")
+
+        exporter = MT5ExportQueue(
+            FileDropTransport(drop), batch_window=0.005, state_path=state_path
+        )
+        ea = FakeFileDropEA(drop).start()
+        exporter.start()
+
+        elapsed = run(exporter, 2_000)
+
+        assert exporter.submit(analysis(5)) is None
+        assert sorted(ea.orders) == list(range(1, 2_001))
+
+        stats = exporter.stats()
+        print(f"file drop: {elapsed:.2f}s | batches {stats['batches']} | "
+              f"EA latency p50 {ea.latency_ms(0.5):.1f} ms p95 {ea.latency_ms(0.95):.1f} ms")
+        print("  exporter:", stats["latency"])
+
+        assert stats["acked"] == 2_000 and stats["duplicates"] == 1
+        assert stats["batches"] < 2_000
+
+        order = ea.orders[2]
+        assert order["action"] == "BUY" and order["volume_lots"] == 0.1
+        assert order["created_at"] <= order["queued_at"] <= order["exported_at"]
+
+        # Signals arriving one by one: end-to-end signal → EA latency
+        ea.latencies.clear()
+        run(exporter, 200, first=10_000, pace=0.002)
+
+        p95 = ea.latency_ms(0.95)
+        print(f"  paced: EA latency p50 {ea.latency_ms(0.5):.1f} ms p95 {p95:.1f} ms")
+        assert p95 < 100
+
+        exporter.stop()
+        ea.stop()
+
+        # Restart: sequence continues, dedup survives
+        exporter = MT5ExportQueue(
+            FileDropTransport(drop), batch_window=0.005, state_path=state_path
+        )
+        assert exporter.seq == 2_200
+        assert exporter.submit(analysis(7)) is None
+        assert exporter.submit(analysis(2_000)) == 2_201
+        exporter.transport.close()
+
+        # Socket: unacknowledged batches are re-sent, EA dedups by seq
+        transport = SocketTransport()
+        exporter = MT5ExportQueue(transport, batch_window=0.002, ack_timeout=0.1)
+
+        # No consumer yet: the send fails and is retried
+        exporter.retry_delay = 0.05
+        exporter.start()
+        exporter.submit(analysis(0))
+        time.sleep(0.05)
+
+        ea = FakeSocketEA(transport.address)
+        ea.ack = False
+        ea.start()
+
+        time.sleep(0.3)
+        ea.ack = True
+
+        elapsed = run(exporter, 2_000, first=1)
+
+        stats = exporter.stats()
+        print(f"socket: {elapsed:.2f}s | batches {stats['batches']} | "
+              f"EA latency p50 {ea.latency_ms(0.5):.1f} ms p95 {ea.latency_ms(0.95):.1f} ms")
+
+        assert sorted(ea.orders) == list(range(1, 2_002))
+        assert stats["send_errors"] >= 1
+        assert stats["redelivered"] >= 1 and ea.duplicates >= 1
+        assert stats["acked"] == 2_001
+
+        exporter.stop()
+        ea.stop()
+
+        print("mt5 export OK")
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.validators import validate_trade
+from execution.paper_trader import PaperTrader
+from risk.position_sizing import RiskManager
+from strategy.ema_rsi_strategy import EMARsiStrategy
+
+
+SYMBOLS = [
+    "EURUSD", "GBPUSD", "AUDUSD", "NZDUSD", "USDCAD", "USDCHF",
+    "EURGBP", "XAUUSD", "XAGUSD", "BTCUSDT", "ETHUSDT", "SOLUSDT"
+]
+
+START_MS = int(pd.Timestamp("2026-01-05").value // 1_000_000)
+BARS = 2_000
+
+
+class FakeMinuteClient:
+    """
+    Serves synthetic 1m bars up to `now` (last one still in progress)
+    """
+
+    def __init__(self):
+        rng = np.random.default_rng(41)
+        self.frames = {}
+        self.now = 0.0
+        self.bars_served = 0
+
+        for i, symbol in enumerate(SYMBOLS):
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0015, BARS)))
+            open_ = np.r_[close[0], close[:-1]]
+            spread = close * 0.0005
+
+            self.frames[symbol] = pd.DataFrame({
+                "timestamp": START_MS + np.arange(BARS) * 60_000,
+                "open": open_,
+                "high": np.maximum(open_, close) + spread,
+                "low": np.minimum(open_, close) - spread,
+                "close": close,
+                "volume": 1.0
+            })
+
+    def fetch_ohlcv(self, symbol, interval, limit=500):
+        df = self.frames[symbol]
+        visible = df[df["timestamp"] <= self.now * 1000].tail(limit)
+
+        self.bars_served += len(visible)
+        return visible.reset_index(drop=True)
+
+
+def make_trader(client, path):
+    return PaperTrader(
+        data_client=client,
+        strategy=EMARsiStrategy(),
+        risk_manager=RiskManager(),
+        validator=validate_trade,
+        state_path=path,
+        max_open_positions=4
+    )
+
+
+def main():
+    client = FakeMinuteClient()
+    path = os.path.join(tempfile.mkdtemp(), "paper.json")
+
+    trader = make_trader(client, path)
+
+    # Warm-up at minute 1000, then one cycle per minute
+    minute = 1_000
+    cycle_times = []
+
+    while minute < 1_600:
+        client.now = (START_MS / 1000) + minute * 60 + 1
+
+        started = time.perf_counter()
+        for symbol in SYMBOLS:
+            trader.step(symbol, "1m", 0.01, now=client.now)
+        trader.save()
+        cycle_times.append(time.perf_counter() - started)
+
+        minute += 1
+
+    served_before = client.bars_served
+    print(f"Cycle for {len(SYMBOLS)} symbols: "
+          f"median {np.median(cycle_times[1:]) * 1000:.2f} ms, "
+          f"max {max(cycle_times[1:]) * 1000:.2f} ms")
+    print("Open:", [(p["symbol"], p["side"]) for p in trader.open_positions])
+    print("Balance:", round(trader.balance, 2), "| log entries:", len(trader.trade_log))
+
+    # Restart: positions and balance come back, trading resumes
+    restarted = make_trader(client, path)
+
+    assert round(restarted.balance, 6) == round(trader.balance, 6)
+    assert len(restarted.open_positions) == len(trader.open_positions)
+
+    for minute in range(1_600, 1_700):
+        client.now = (START_MS / 1000) + minute * 60 + 1
+
+        for symbol in SYMBOLS:
+            restarted.step(symbol, "1m", 0.01, now=client.now)
+
+    print("After restart:", round(restarted.balance, 2),
+          "| bars fetched since restart:", client.bars_served - served_before)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from risk.portfolio_risk import PortfolioRiskEngine, RollingCorrelation
+
+
+def signal(symbol, side, entry, units, risk_amount, interval="1h"):
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "signal": side,
+        "entry_price": entry,
+        "sizing": {"units": units, "lots": units / 100_000, "risk_amount": risk_amount}
+    }
+
+
+def main():
+    rng = np.random.default_rng(39)
+
+    # Incremental correlation == full recompute over the window
+    symbols = ["EURUSD", "GBPUSD", "USDJPY"]
+    rolling = RollingCorrelation(symbols, window=100)
+
+    common = rng.normal(0, 0.001, 450)
+    returns = np.column_stack([
+        common + rng.normal(0, 0.0004, 450),
+        common + rng.normal(0, 0.0006, 450),
+        -common + rng.normal(0, 0.0008, 450)
+    ])
+    closes = np.exp(np.cumsum(returns, axis=0))
+
+    for t, row in enumerate(closes):
+        for symbol, close in zip(symbols, row):
+            rolling.record_close(symbol, t, close)
+
+    # Last bar is still open; committed rows are returns[1:-1]
+    expected = np.corrcoef(returns[1:-1][-100:].T)
+    assert np.allclose(rolling.matrix(), expected, atol=1e-9)
+    print("Correlation EURUSD/GBPUSD:", round(rolling.correlation("EURUSD", "GBPUSD"), 3))
+
+    # Gaps: pairwise-complete rows, never a zero return for a missing bar
+    gappy = RollingCorrelation(symbols, window=100)
+    present = rng.random((300, 3)) > np.array([0.0, 0.3, 0.6])
+
+    for row, mask in zip(returns[:300], present):
+        gappy.push(row, mask)
+
+    expected = pd.DataFrame(np.where(present, returns[:300], np.nan)[-100:]).corr().to_numpy()
+    assert np.allclose(gappy.matrix(), expected, atol=1e-9)
+    assert gappy.pair_count("EURUSD", "USDJPY") == present[-100:, 2].sum()
+    print("Pairwise EURUSD/USDJPY:", round(gappy.correlation("EURUSD", "USDJPY"), 3))
+
+    # Three USD-short signals: the third is downsized or dropped
+    engine = PortfolioRiskEngine(symbols=symbols)
+
+    for t, row in enumerate(closes):
+        for symbol, close in zip(symbols, row):
+            engine.record_bar(symbol, "1h", t, close)
+
+    candidates = [
+        signal("EURUSD", "BUY", 1.08, 33_000, 100),
+        signal("GBPUSD", "BUY", 1.27, 33_000, 100),
+        signal("USDJPY", "SELL", 150.0, 33_000, 100)
+    ]
+
+    accepted = engine.review(candidates, account_balance=10_000)
+
+    print("Accepted:", [(s["symbol"], s.get("portfolio_adjustment")) for s in accepted])
+    print("Net exposure:", engine.exposure(accepted))
+    assert len(accepted) < 3 or "portfolio_adjustment" in accepted[-1]
+
+    # Inline cost: 50 open positions, 100 candidates
+    open_positions = [
+        signal(symbols[i % 3], "BUY" if i % 2 else "SELL", 1.1, 10_000, 10)
+        for i in range(50)
+    ]
+    started = time.perf_counter()
+    engine.review(candidates * 33, 1_000_000, open_positions)
+    print(f"Review of 99 signals: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    # An open position on an unknown symbol is skipped, not fatal
+    unknown = signal("NOTASYMBOL", "BUY", 1.0, 10_000, 10)
+    assert engine.review(candidates, 10_000, [unknown]) == engine.review(candidates, 10_000, [])
+    assert engine.exposure([unknown]) == {}
+
+
+if __name__ == "__main__":
+    main()
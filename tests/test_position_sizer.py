@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+
+from config import load_config
+from risk.instrument_registry import InstrumentRegistry
+from risk.position_sizer import PositionSizer
+
+
+def main():
+    rng = np.random.default_rng(7)
+    count = 100_000
+
+    balances = rng.uniform(50, 250_000, count)
+    risk_percents = rng.uniform(0.25, 3.0, count)
+    entry, stop = 1.0850, 1.0815
+
+    started = time.perf_counter()
+    batch = PositionSizer.calculate_positions(
+        "EURUSD", balances, risk_percents, entry, stop
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(f"Sized {count} accounts in {elapsed:.2f} ms")
+
+    for i in rng.choice(count, 1000, replace=False):
+        single = PositionSizer.calculate_position(
+            "EURUSD", balances[i], risk_percents[i], entry, stop
+        )
+
+        # Same 0.01 lot step, exactly
+        assert round(batch["lots"][i] / 0.01) == round(single["lots"] / 0.01), i
+
+        for key in ("units", "lots", "risk_amount", "pip_distance"):
+            assert batch[key][i] == single[key], key
+
+    lots = rng.choice([0.01, 0.1, 0.5, 1.0], count)
+    manual = PositionSizer.calculate_from_lots(
+        "XAU/USD", balances, lots, 2350.0, 2342.5
+    )
+    single = PositionSizer.calculate_from_lot(
+        "XAU/USD", balances[0], lots[0], 2350.0, 2342.5
+    )
+
+    assert np.isclose(manual["actual_risk_percent"][0], single["actual_risk_percent"])
+    print("Manual lots, first account:", single)
+
+    # Every scanned instrument has a spec; pip values follow closes
+    registry = InstrumentRegistry()
+    universe = load_config("settings")["universe"]
+
+    for group in universe.values():
+        for symbol in group:
+            assert registry.spec(symbol).pip_value_per_unit > 0, symbol
+
+    registry.record_close("USDJPY", 150.0)
+    registry.record_close("EURUSD", 1.10)
+
+    assert np.isclose(registry.spec("USDJPY").pip_value_per_unit, 0.01 / 150)
+    assert np.isclose(registry.conversion_rate("EUR", "JPY"), 165.0)
+    print("EUR→JPY:", registry.conversion_rate("EUR", "JPY"))
+
+
+if __name__ == "__main__":
+    main()
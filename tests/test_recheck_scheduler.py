@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+
+from analytics.recheck_scheduler import RecheckScheduler
+
+
+# 2026-01-05 00:00 UTC (candle boundary for every interval)
+T0 = 1_767_571_200.0
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="recheck-")
+    path = os.path.join(directory, "recheck_queue.json")
+
+    try:
+        scheduler = RecheckScheduler(path)
+
+        # Heap ordering: due symbols come out earliest first
+        scheduler.schedule("GBPUSD", "1h", T0 + 300)
+        scheduler.schedule("EURUSD", "1h", T0 + 100)
+        scheduler.schedule("USDJPY", "1h", T0 + 200)
+        scheduler.schedule("XAUUSD", "1h", T0 + 900)
+
+        assert scheduler.next_due_time() == T0 + 100
+        assert scheduler.pop_due(T0 + 50) == []
+        assert scheduler.pop_due(T0 + 300) == ["EURUSD", "USDJPY", "GBPUSD"]
+
+        # Lazy invalidation: rescheduling leaves a stale heap entry that
+        # is skipped, never returned twice
+        scheduler.schedule("EURUSD", "1h", T0 + 1_000)
+        scheduler.schedule("EURUSD", "1h", T0 + 400)
+        scheduler.schedule("XAUUSD", "1h", T0 + 2_000)
+
+        assert len(scheduler._heap) == 4
+        assert scheduler.next_due_time() == T0 + 400
+        assert scheduler.pop_due(T0 + 1_500) == ["EURUSD"]
+        assert scheduler.next_due_time() == T0 + 2_000
+        assert len(scheduler._heap) == 1
+
+        # Interval filter keeps other intervals queued
+        scheduler.schedule("BTCUSDT", "15m", T0 + 1_600)
+        assert scheduler.pop_due(T0 + 2_000, interval="1h") == ["XAUUSD"]
+        assert scheduler.pop_due(T0 + 2_000) == ["BTCUSDT"]
+
+        # Recheck results: Nth candle close from now
+        at = scheduler.schedule_result(
+            "EURUSD", "1h", {"recheck": {"recheck_after_candles": 3}}, now=T0 + 10
+        )
+        assert at == T0 + 3 * 3_600
+
+        at = scheduler.schedule_result("GBPUSD", "4h", {"signal": "BUY"}, now=T0 + 10)
+        assert at == T0 + 4 * 3_600
+
+        # register() only adds never-seen symbols, due immediately
+        scheduler.register(["EURUSD", "AUDUSD"], "1h", now=T0 + 20)
+        assert scheduler.upcoming()[0] == {"symbol": "AUDUSD", "interval": "1h", "next_check": T0 + 20}
+        assert len(scheduler.upcoming()) == 3
+
+        # Persistence round-trip (live entries only)
+        scheduler.save()
+        restored = RecheckScheduler(path)
+
+        assert restored.upcoming() == scheduler.upcoming()
+        assert restored.pop_due(T0 + 4 * 3_600) == ["AUDUSD", "EURUSD", "GBPUSD"]
+
+        # Unreadable file: start empty instead of failing
+        with open(path, "w") as f:
+            f.write("{not json")
+
+        assert RecheckScheduler(path).upcoming() == []
+
+        print("recheck scheduler OK")
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
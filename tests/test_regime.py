@@ -0,0 +1,20 @@
+from data.resampler import resample_ohlcv
+from analytics.regime_engine import RegimeEngine
+from tests.test_resampler import make_minute_bars
+
+
+def main():
+    df = resample_ohlcv(make_minute_bars(60 * 24 * 30), "15m")
+
+    traps = RegimeEngine.liquidity_trap_series(df)
+    print("Stop hunts:", traps.sum().to_dict())
+
+    engine = RegimeEngine()
+    timeline = engine.state_timeline(df, "15m")
+
+    print(timeline.tail())
+    print("State summary:", RegimeEngine.state_summary(timeline))
+
+
+if __name__ == "__main__":
+    main()
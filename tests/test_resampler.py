@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from data.resampler import IncrementalResampler, resample_ohlcv
+
+
+def make_minute_bars(count=600, start="2026-01-05 00:00:00"):
+    rng = np.random.default_rng(7)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.0002, count))
+    open_ = np.r_[close[0], close[:-1]]
+
+    return pd.DataFrame({
+        "timestamp": (
+            pd.date_range(start, periods=count, freq="1min")
+            .as_unit("ms").asi8
+        ),
+        "open": open_,
+        "high": np.maximum(open_, close) + 0.0001,
+        "low": np.minimum(open_, close) - 0.0001,
+        "close": close,
+        "volume": rng.integers(1, 100, count).astype(float)
+    })
+
+
+def main():
+    df = make_minute_bars()
+
+    bars_15m = resample_ohlcv(df, "15m")
+    bars_1h = resample_ohlcv(df, "1h")
+
+    print("15m bars:", len(bars_15m))
+    print(bars_1h.head())
+
+    live = IncrementalResampler("15m")
+    closed = live.update_frame(df)
+
+    print("Incremental closed bars:", len(closed))
+    print("Current partial bar:", live.current)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import threading
+from datetime import datetime, timezone
+
+from analytics.recheck_scheduler import RecheckScheduler
+from analytics.scan_scheduler import CandleCloseScanScheduler
+
+
+def at(hour, minute, second=0, microsecond=0):
+    # Monday 2026-01-05
+    return datetime(2026, 1, 5, hour, minute, second, microsecond, tzinfo=timezone.utc)
+
+
+def main():
+    calls = []
+
+    def scan(intervals, account_balance, risk_percent):
+        calls.append(intervals)
+
+    scheduler = CandleCloseScanScheduler(1_000, 1.0, delay_seconds=5, scan_fn=scan)
+    scheduler.market_closed = lambda: False
+
+    # Boundary comes from the fire time, not from wall-clock minutes
+    assert scheduler.boundary_for(at(12, 0, 5)) == at(12, 0)
+    assert scheduler.boundary_for(at(12, 0, 59, 999_999)) == at(12, 0)
+    assert scheduler.boundary_for(at(12, 4, 30)) == at(12, 0)
+    assert scheduler.boundary_for(at(12, 5, 4)) == at(12, 0)
+    assert scheduler.boundary_for(at(0, 0, 3)) == datetime(2026, 1, 4, 23, 55, tzinfo=timezone.utc)
+
+    # Merged intervals per boundary
+    assert scheduler.run_boundary(at(12, 5, 5)) == ["5m"]
+    assert scheduler.run_boundary(at(12, 15, 5)) == ["5m", "15m"]
+    assert scheduler.run_boundary(at(16, 0, 5)) == ["5m", "15m", "1h", "4h"]
+    assert scheduler.run_boundary(at(0, 0, 5)) == ["5m", "15m", "1h", "4h", "1d"]
+
+    # A run delayed into the next minute still scans the hour close
+    assert scheduler.run_boundary(at(13, 1, 2)) == ["5m", "15m", "1h"]
+    assert calls[-1] == ["5m", "15m", "1h"]
+
+    # Coarser schedule: every fire lands on an hourly boundary
+    hourly = CandleCloseScanScheduler(1_000, 1.0, intervals=["1h", "4h"], scan_fn=scan)
+    hourly.market_closed = lambda: False
+
+    assert hourly.boundary_for(at(12, 0, 40)) == at(12, 0)
+    assert hourly.run_boundary(at(12, 0, 40)) == ["1h", "4h"]
+    assert hourly.run_boundary(at(13, 0, 5)) == ["1h"]
+
+    # Market closed: nothing scanned
+    count = len(calls)
+    scheduler.market_closed = lambda: True
+    assert scheduler.run_boundary(at(12, 5, 5)) == []
+    assert len(calls) == count
+
+    # Overlap: a fire while the previous scan runs is skipped
+    scheduler.market_closed = lambda: False
+    started, release = threading.Event(), threading.Event()
+
+    def slow_scan(intervals, account_balance, risk_percent):
+        started.set()
+        release.wait(5)
+
+    scheduler.scan_fn = slow_scan
+    first = threading.Thread(target=scheduler.run_boundary, args=(at(12, 10, 5),))
+    first.start()
+    started.wait(5)
+
+    assert scheduler.run_boundary(at(12, 15, 5)) == []
+
+    release.set()
+    first.join()
+
+    # Scan errors are reported, the lock is released
+    def failing_scan(intervals, account_balance, risk_percent):
+        raise RuntimeError("provider down")
+
+    scheduler.scan_fn = failing_scan
+    assert scheduler.run_boundary(at(12, 20, 5)) == ["5m"]
+    assert scheduler._running.acquire(blocking=False)
+    scheduler._running.release()
+
+    # Adaptive: the recheck scheduler reaches the scan
+    recheck = RecheckScheduler(None)
+    received = []
+
+    def adaptive_scan(intervals, account_balance, risk_percent, scheduler):
+        received.append(scheduler)
+
+    adaptive = CandleCloseScanScheduler(1_000, 1.0, scan_fn=adaptive_scan, recheck=recheck)
+    adaptive.market_closed = lambda: False
+
+    assert adaptive.run_boundary(at(12, 5, 5)) == ["5m"]
+    assert received == [recheck]
+
+    print("scan scheduler OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from data.market_data_router import MarketDataRouter
+from data.resampler import resample_ohlcv
+from data.shared_candles import SharedCandleCache
+from strategy.ema_rsi_strategy import EMARsiStrategy
+
+
+NAMESPACE = f"test-candles-{os.getpid()}"
+BARS = 2_000
+
+
+def upstream_frame(limit: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    close = 1.08 + np.cumsum(rng.normal(0, 5e-4, BARS))
+
+    df = pd.DataFrame({
+        "datetime": pd.date_range("2026-01-01", periods=BARS, freq="h").strftime("%Y-%m-%d %H:%M:%S"),
+        "open": close - 1e-4,
+        "high": close + 5e-4,
+        "low": close - 5e-4,
+        "close": close
+    })
+
+    return df.tail(limit).reset_index(drop=True)
+
+
+def counting_fetch(log_path):
+    def fetch(symbol, interval, limit):
+        # Slow upstream: concurrent workers pile up on the key lock
+        with open(log_path, "a") as f:
+            f.write(f"{os.getpid()}\n")
+
+        time.sleep(0.3)
+        return upstream_frame(limit)
+
+    return fetch
+
+
+def worker(namespace, lock_dir, log_path, start, results):
+    cache = SharedCandleCache(namespace, capacity=BARS, max_age=60, lock_dir=lock_dir)
+    start.wait()
+
+    df = cache.get("EURUSD", "1h", 500, counting_fetch(log_path))
+    results.put((len(df), float(df["close"].iloc[-1]), cache.stats().get("waits", 0)))
+
+    cache.close()
+
+
+def torn_writer(namespace, lock_dir, generations):
+    cache = SharedCandleCache(namespace, capacity=BARS, max_age=0, lock_dir=lock_dir)
+
+    for g in range(1, generations + 1):
+        # Every value of generation g equals g: a mixed read is torn
+        cache.get("TORN", "1h", BARS, lambda s, i, n: _constant(g))
+
+    cache.close()
+
+
+def _constant(value: float) -> pd.DataFrame:
+    return pd.DataFrame({
+        "timestamp": np.full(BARS, value),
+        **{c: np.full(BARS, value) for c in ("open", "high", "low", "close", "volume")}
+    })
+
+
+def main():
+    lock_dir = tempfile.mkdtemp(prefix="candle-locks-")
+    log_path = os.path.join(lock_dir, "upstream.log")
+    cache = SharedCandleCache(NAMESPACE, capacity=BARS, max_age=60, lock_dir=lock_dir)
+
+    try:
+        # This process stays attached (a long-lived worker): the others
+        # closing does not remove the segment
+        cache._segment("EURUSD", "1h")
+
+        # 1. Four workers ask for the same window at once → one upstream call
+        context = mp.get_context("spawn")
+        start = context.Event()
+        results = context.Queue()
+
+        workers = [
+            context.Process(target=worker, args=(NAMESPACE, lock_dir, log_path, start, results))
+            for _ in range(4)
+        ]
+
+        for p in workers:
+            p.start()
+
+        time.sleep(1.0)
+        start.set()
+
+        outcomes = [results.get(timeout=30) for _ in workers]
+
+        for p in workers:
+            p.join(10)
+
+        with open(log_path) as f:
+            calls = f.read().split()
+
+        print("workers:", outcomes, "upstream calls:", len(calls))
+        assert len(calls) == 1
+        assert all(n == 500 for n, _, _ in outcomes)
+        assert len({close for _, close, _ in outcomes}) == 1
+
+        # 2. This process reads the same memory, zero-copy and read-only
+        fetch = counting_fetch(log_path)
+
+        a = cache.get("EURUSD", "1h", 500, fetch)
+        b = cache.get("EURUSD", "1h", 300, fetch)
+
+        assert np.shares_memory(a["close"].to_numpy(), b["close"].to_numpy())
+        assert not a["close"].to_numpy().flags.writeable
+        assert a["timestamp"].dtype == np.int64
+        assert cache.stats()["hits"] == 2
+
+        started = time.perf_counter()
+        for _ in range(10_000):
+            cache.get("EURUSD", "1h", 500, fetch)
+        per_read = (time.perf_counter() - started) / 10_000
+        print(f"shared read: {per_read * 1e6:.1f} µs")
+
+        # Frames behave like provider frames downstream
+        df = cache.get("EURUSD", "1h", 500, fetch)
+        EMARsiStrategy().generate_signal(df.tail(500))
+        assert len(resample_ohlcv(df, "4h")) >= 125
+
+        # 3. A wider window than any fetched so far → one refresh
+        assert len(cache.get("EURUSD", "1h", 1_500, fetch)) == 1_500
+        assert cache.stats()["refreshes"] == 1
+
+        # Beyond the capacity: straight to the provider
+        assert cache.get("EURUSD", "1h", BARS + 1, lambda s, i, n: "direct") == "direct"
+
+        # 4. Seqlock: a reader never sees a half-written window
+        writer = context.Process(target=torn_writer, args=(NAMESPACE, lock_dir, 300))
+        fresh = SharedCandleCache(NAMESPACE, capacity=BARS, max_age=60, lock_dir=lock_dir)
+        segment = fresh._segment("TORN", "1h")
+        writer.start()
+
+        reads = torn = 0
+
+        while writer.is_alive() or reads == 0:
+            seq, bars, _, _ = segment.snapshot()
+
+            if bars == 0:
+                continue
+
+            window = segment.window(seq, bars)
+            lo, hi = window.min(), window.max()
+
+            # Only count reads the writer provably did not overlap
+            if int(segment.header[0]) < segment.overwritten_at(seq):
+                reads += 1
+                torn += lo != hi
+
+        writer.join()
+        print(f"seqlock: {reads} validated reads, {torn} torn")
+        assert reads > 0 and torn == 0
+
+        # 5. The router hands out copies that outlive later refreshes
+        os.environ.setdefault("TWELVE_DATA_API_KEY", "test")
+
+        router = MarketDataRouter(candle_cache=fresh, cache_ttl=0)
+        fresh.max_age = 0
+
+        generation = iter(range(1, 4))
+        router.fetch_upstream = lambda s, i, n: _constant(next(generation))
+
+        first = router.fetch_ohlcv("TORN", "1h", BARS)
+        router.fetch_ohlcv("TORN", "1h", BARS)
+        router.fetch_ohlcv("TORN", "1h", BARS)
+
+        assert (first["close"] == 1).all() and "shared_seq" not in first.attrs
+        assert not np.shares_memory(first["close"].to_numpy(), segment.buffers)
+
+        # 6. The last process to close removes the segment
+        fresh.close()
+
+        try:
+            shared_memory.SharedMemory(name=fresh._name("TORN", "1h"))
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError("segment left behind after the last close")
+
+        print("shared candles OK")
+
+    finally:
+        cache.close()
+
+        for symbol in ("EURUSD", "TORN"):
+            cache.unlink(symbol, "1h")
+
+        shutil.rmtree(lock_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import sys
+import time
+
+from notifications.signal_cli_daemon import (
+    SignalCLIDaemonClient,
+    SignalCLIError,
+    SignalCLIUnknownOutcome
+)
+from tests.fake_signal_cli_daemon import FakeSignalCLIDaemon
+
+
+def main():
+    daemon = FakeSignalCLIDaemon().start()
+    client = SignalCLIDaemonClient(daemon.address, account="+15550001")
+
+    started = time.perf_counter()
+    for i in range(100):
+        client.send(["+15550002", "+15550003"], f"signal {i}")
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(f"100 sends over one connection: {elapsed:.1f}ms")
+
+    # Connection drop after the request was written → outcome unknown,
+    # never resent (signal-cli may already have delivered it)
+    daemon.drop_next = True
+
+    try:
+        client.send(["+15550002"], "maybe sent")
+        raise AssertionError("expected SignalCLIUnknownOutcome")
+    except SignalCLIUnknownOutcome as e:
+        print("Unknown outcome:", e)
+
+    assert daemon.connections == 1 and len(daemon.sent) == 100
+
+    # The next call reconnects transparently
+    result = client.send(["+15550002"], "after reconnect")
+
+    print("Reconnect result:", result["results"])
+    print("Connections opened:", daemon.connections)
+    print("Messages recorded:", len(daemon.sent))
+    assert daemon.connections == 2 and len(daemon.sent) == 101
+
+    # JSON-RPC error: signal-cli rejected it, the queue must not resend
+    try:
+        client.call("listGroups")
+        raise AssertionError("expected SignalCLIError")
+    except SignalCLIError as e:
+        print("JSON-RPC error:", e)
+        assert e.retryable is False
+
+    client.close()
+    daemon.stop()
+
+    # stdio without an account cannot build the signal-cli command
+    try:
+        SignalCLIDaemonClient("stdio")
+        raise AssertionError("expected ValueError")
+    except ValueError as e:
+        print("stdio without account:", e)
+
+    stdio = SignalCLIDaemonClient(
+        "stdio",
+        command=[sys.executable, "-m", "tests.fake_signal_cli_daemon"]
+    )
+    print("stdio transport:", stdio.send(["+15550004"], "hello")["results"])
+    stdio.close()
+
+
+if __name__ == "__main__":
+    main()
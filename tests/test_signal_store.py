@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from analytics.signal_store import SignalStateStore
+from analytics.signal_validity import get_signal_validity
+
+
+def signal(symbol="EURUSD", interval="1h", side="BUY", entry=1.08, minutes=None):
+    validity = get_signal_validity(interval)
+
+    if minutes is not None:
+        expires = datetime.now(timezone.utc) + timedelta(minutes=minutes)
+        validity["expires_at"] = expires.replace(tzinfo=None).isoformat() + "Z"
+
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "signal": side,
+        "entry_price": entry,
+        "signal_validity": validity
+    }
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="signals-")
+    path = os.path.join(directory, "sent.json")
+
+    try:
+        store = SignalStateStore(path)
+        now = time.time()
+
+        sent = signal()
+        store.record(sent, now)
+
+        # Same trade, entry moved < 1 bucket → still sent; others are new
+        assert store.is_sent(signal(entry=1.08003), now)
+        assert not store.is_sent(signal(entry=1.0830), now)
+        assert not store.is_sent(signal(side="SELL"), now)
+        assert not store.is_sent(signal(interval="4h"), now)
+        assert not store.is_sent(signal(symbol="EUR/USD", entry=1.0830), now)
+        assert store.is_sent(signal(symbol="EUR/USD"), now)
+
+        # 1h validity = 240 minutes
+        assert store.is_sent(sent, now + 239 * 60)
+        assert not store.is_sent(sent, now + 241 * 60)
+
+        # Bucket edge (1.0805): neighbouring buckets are compared too
+        edge = SignalStateStore(None)
+        edge.record(signal(entry=1.08049), now)
+        assert edge.key(signal(entry=1.08049)) != edge.key(signal(entry=1.08051))
+        assert edge.is_sent(signal(entry=1.08051), now)
+        assert not edge.is_sent(signal(entry=1.0816), now)
+
+        fresh = store.filter_new([sent, signal(side="SELL")], now)
+        assert [s["signal"] for s in fresh] == ["SELL"]
+
+        # Persisted: a restart keeps live entries, drops expired ones
+        store.record(signal(symbol="GBPUSD", entry=1.27, minutes=-1), now)
+        store.save()
+
+        restored = SignalStateStore(path)
+        assert restored.is_sent(sent) and len(restored) == 1
+
+        # Saved only when something was recorded or expired
+        written = os.stat(path).st_mtime_ns
+        os.utime(path, ns=(0, 0))
+        restored.filter_new([sent])
+        restored.save()
+        assert os.stat(path).st_mtime_ns == 0
+
+        restored.record(signal(side="SELL"))
+        restored.save()
+        assert os.stat(path).st_mtime_ns >= written
+
+        # Scale: 100k live signals, O(1) lookups, heap-ordered eviction
+        big = SignalStateStore(None)
+        now = time.time()
+        signals = [
+            signal(entry=1.0 + i * 0.01, minutes=1 + i % 600)
+            for i in range(100_000)
+        ]
+
+        started = time.perf_counter()
+        for s in signals:
+            big.record(s, now)
+        recorded = time.perf_counter() - started
+
+        started = time.perf_counter()
+        hits = sum(big.is_sent(s, now) for s in signals)
+        looked_up = time.perf_counter() - started
+
+        started = time.perf_counter()
+        # Expiries are stamped while building: cut between minutes
+        evicted = big.evict(now + 300 * 60 + 30)
+        evicting = time.perf_counter() - started
+
+        print(f"record {recorded:.2f}s | lookup {looked_up:.2f}s | "
+              f"evict {evicted} in {evicting * 1000:.0f} ms")
+
+        assert hits == 100_000
+        assert evicted == sum(1 for i in range(100_000) if 1 + i % 600 <= 300)
+        assert len(big) == 100_000 - evicted
+
+        print("signal store OK")
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import time
+
+from analytics.spread_estimator import STATIC_SPREADS, QuoteSampler, SpreadEstimator
+
+
+QUOTES_PATH = os.path.join(os.path.dirname(__file__), "data", "recorded_quotes.csv")
+
+# 2025-10-20 (Monday), UTC
+ASIA = 1760918400 + 3 * 3600
+OVERLAP = 1760918400 + 14 * 3600
+
+
+def main():
+    estimator = SpreadEstimator(min_samples=20)
+
+    started = time.perf_counter()
+    count = estimator.replay(QUOTES_PATH)
+    print(f"Replayed {count} quotes in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    for symbol in ("EURUSD", "USDJPY", "XAUUSD", "BTCUSDT"):
+        asia = estimator.estimate(symbol, ASIA)
+        overlap = estimator.estimate(symbol, OVERLAP)
+
+        print(f"{symbol}: asia p75={asia} overlap p75={overlap}")
+        assert overlap < asia, symbol
+
+    # Unseen symbol → static table
+    assert estimator.estimate("GBPJPY") == 1.5
+    assert SpreadEstimator().estimate("EURUSD") == STATIC_SPREADS["EURUSD"]
+
+    print("EURUSD sessions:", list(estimator.stats("EURUSD")))
+
+    check_live_quotes()
+
+
+class FakeBookTicker:
+    """Binance book ticker: 0.5 wide (50 registry pips for BTCUSDT)"""
+
+    calls = 0
+
+    def fetch_book_ticker(self, symbol):
+        FakeBookTicker.calls += 1
+        return 65_000.0, 65_000.5
+
+
+def check_live_quotes():
+    """
+    The background sampler feeds analyze_market's spread estimate;
+    estimating itself makes no quote call
+    """
+
+    os.environ.setdefault("TWELVE_DATA_API_KEY", "test")
+
+    from analytics.spread_estimator import DEFAULT_SPREAD, spread_estimator
+    from services import analyse_service
+
+    analyse_service.data_router.crypto_client = FakeBookTicker()
+    sampler = QuoteSampler(analyse_service.data_router.fetch_quote, ["BTCUSDT", "EURUSD"])
+
+    assert analyse_service.estimate_spread("BTCUSDT") == DEFAULT_SPREAD
+
+    for _ in range(spread_estimator.min_samples):
+        sampler.sample()
+
+    estimate = analyse_service.estimate_spread("BTCUSDT")
+
+    print(f"BTCUSDT live estimate: {estimate}", sampler.stats())
+    assert abs(estimate - 50) < 50 * 0.05
+    assert FakeBookTicker.calls == spread_estimator.min_samples
+
+    # No bid/ask from Twelve Data: dropped after one try, static table
+    assert sampler.symbols == ["BTCUSDT"]
+    assert analyse_service.estimate_spread("EURUSD") == STATIC_SPREADS["EURUSD"]
+
+    # A failing source is counted every time, logged once
+    def down(symbol):
+        raise ConnectionError("unreachable")
+
+    failing = QuoteSampler(down, ["BTCUSDT"])
+    failing.sample()
+    failing.sample()
+    assert failing.stats()["errors"] == 2 and failing.stats()["failing"] == ["BTCUSDT"]
+
+    # Background thread: samples right away, stops promptly
+    threaded = QuoteSampler(analyse_service.data_router.fetch_quote, ["BTCUSDT"], interval=60)
+    threaded.start()
+    threaded.stop()
+    assert threaded.stats()["quotes"] == 1
+
+if __name__ == "__main__":
+    main()
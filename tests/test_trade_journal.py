@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from execution.matching_engine import PaperMatchingEngine
+from execution.trade_journal import JournalLocked, TradeJournal
+
+
+SYMBOLS = ["EURUSD", "GBPUSD", "XAUUSD"]
+PRICES = {"EURUSD": 1.08, "GBPUSD": 1.27, "XAUUSD": 2350.0}
+
+
+def simulate(engine: PaperMatchingEngine, rng, positions: int, bars: int):
+    for i in range(positions):
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        price = PRICES[symbol]
+        side = "BUY" if rng.random() < 0.5 else "SELL"
+        distance = price * rng.uniform(0.002, 0.03)
+        sign = 1 if side == "BUY" else -1
+
+        engine.open_position(
+            account=f"acct-{i % 50}",
+            symbol=symbol,
+            side=side,
+            units=1 if symbol == "XAUUSD" else 1_000,
+            entry_price=price,
+            stop_loss=price - sign * distance,
+            take_profit=price + sign * 2 * distance
+        )
+
+    for _ in range(bars):
+        for symbol in SYMBOLS:
+            price = PRICES[symbol] = PRICES[symbol] * (1 + rng.normal(0, 0.002))
+            engine.on_bar(symbol, price, price * 1.001, price * 0.999, price)
+
+
+def state_of(engine: PaperMatchingEngine):
+    return (
+        {a: round(b, 6) for a, b in engine.balances.items()},
+        sorted(tuple(sorted(p.items())) for p in engine.open_positions()),
+        engine._last_id
+    )
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="journal-")
+
+    try:
+        # Raw append throughput (fsync batched in the background)
+        journal = TradeJournal(os.path.join(directory, "raw"))
+        n = 200_000
+
+        started = time.perf_counter()
+        for i in range(n):
+            journal.append("fill", {"id": i, "symbol": "EURUSD", "units": 1000, "entry_price": 1.08})
+        journal.sync()
+        elapsed = time.perf_counter() - started
+
+        print(f"append: {n / elapsed:,.0f} events/s")
+        assert n / elapsed > 50_000
+        journal.close()
+
+        # Engine with snapshots every 5k events → rebuilt identically
+        path = os.path.join(directory, "engine")
+        journal = TradeJournal(path, snapshot_every=5_000)
+        engine = PaperMatchingEngine(history=None, journal=journal)
+
+        simulate(engine, np.random.default_rng(42), positions=6_000, bars=300)
+        journal.close()
+
+        stats = engine.stats()
+        print("engine:", stats, "| events:", journal.seq)
+        assert stats["closed_trades"] > 0 and stats["open_positions"] > 0
+
+        snapshots = [f for f in os.listdir(path) if f.startswith("snapshot-")]
+        assert len(snapshots) == 1, snapshots
+
+        restored = PaperMatchingEngine(journal=TradeJournal(path))
+        assert state_of(restored) == state_of(engine)
+
+        # One writer per directory: a second journal is refused
+        try:
+            TradeJournal(path)
+            raise AssertionError("expected JournalLocked")
+        except JournalLocked as e:
+            print("second writer:", e)
+
+        # Trading continues after the restart without reusing ids
+        position = restored.open_position("acct-0", "EURUSD", "BUY", 1000, 1.08, 1.07, 1.10)
+        assert position.id == engine._last_id + 1
+        restored.journal.close()
+
+        # Crash mid-write: the torn final record is dropped
+        segment = sorted(f for f in os.listdir(path) if f.startswith("journal-"))[-1]
+        with open(os.path.join(path, segment), "ab") as f:
+            f.write(b'{"seq":999999999,"type":"close","id":')
+
+        again = PaperMatchingEngine(journal=TradeJournal(path))
+        assert position.id in again.positions
+        assert state_of(again)[0] == state_of(restored)[0]
+
+        again.journal.append("account", {"account": "late", "balance": 1.0})
+        again.journal.close()
+
+        assert "late" in PaperMatchingEngine(journal=TradeJournal(path)).balances
+
+        print("trade journal OK")
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics.universe_screener import UniverseScreener
+from data.cache_backend import MemoryBackend
+from data.market_data_router import MarketDataRouter
+from data.resampler import ANALYSIS_BARS
+from data.twelve_data_market_data import TwelveDataMarketDataClient
+from strategy.ema_rsi_strategy import EMARsiStrategy
+
+
+def make_frame(seed: int, count: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, count))
+    open_ = np.r_[close[0], close[:-1]]
+
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2026-01-05", periods=count, freq="1h").as_unit("ms").asi8,
+        "open": open_,
+        "high": np.maximum(open_, close) + 0.2,
+        "low": np.minimum(open_, close) - 0.2,
+        "close": close,
+        "volume": 0.0
+    })
+
+
+class FakeTwelveData:
+    """
+    Batched time_series: one call per chunk of symbols
+    """
+
+    BATCH_SIZE = 50
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch_ohlcv_batch(self, symbols, interval, outputsize):
+        self.calls.append(len(symbols))
+        time.sleep(0.05)
+
+        return {
+            s: ValueError("No data returned from Twelve Data") if s == "BAD001"
+            else make_frame(sum(map(ord, s)), outputsize + 100)
+            for s in symbols
+        }
+
+
+class FakeBinance:
+    """
+    One klines call per symbol; records peak concurrency
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def fetch_ohlcv(self, symbol, interval, limit):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+        time.sleep(0.05)
+
+        with self.lock:
+            self.active -= 1
+
+        return make_frame(sum(map(ord, symbol)), limit)
+
+
+def main():
+    # Batched response parsing (several symbols / one symbol / request error)
+    values = [{"datetime": "2026-01-05 01:00:00", "open": "1", "high": "2", "low": "0.5", "close": "1.5"},
+              {"datetime": "2026-01-05 00:00:00", "open": "1", "high": "2", "low": "0.5", "close": "1"}]
+
+    split = TwelveDataMarketDataClient.split_batch(
+        {"EUR/USD": {"status": "ok", "values": values},
+         "XAU/USD": {"status": "error", "message": "symbol not found"}},
+        ["EURUSD", "XAUUSD"]
+    )
+    assert list(split["EURUSD"]["close"]) == [1.0, 1.5]
+    assert isinstance(split["XAUUSD"], ValueError)
+
+    assert len(TwelveDataMarketDataClient.split_batch({"values": values}, ["EURUSD"])["EURUSD"]) == 2
+
+    failed = TwelveDataMarketDataClient.split_batch(
+        {"status": "error", "message": "out of credits"}, ["EURUSD", "GBPUSD"]
+    )
+    assert all(isinstance(e, ValueError) for e in failed.values())
+
+    # 480 Twelve Data symbols + 20 Binance symbols (the router builds a
+    # Twelve Data client, replaced by the fake below)
+    os.environ.setdefault("TWELVE_DATA_API_KEY", "test")
+
+    router = MarketDataRouter(cache_ttl=0)
+    router.multi_asset_client = FakeTwelveData()
+    router.crypto_client = FakeBinance()
+
+    universe = [f"S{i:03d}XY" for i in range(479)] + ["BAD001"] + [f"C{i:02d}USDT" for i in range(20)]
+    screener = UniverseScreener(router)
+
+    started = time.perf_counter()
+    table = screener.scan(universe, "1h")
+    elapsed = time.perf_counter() - started
+
+    print(f"screened {len(table)} symbols in {elapsed:.2f}s:",
+          f"{len(router.multi_asset_client.calls)} batched calls,",
+          f"{router.crypto_client.calls} klines calls (peak {router.crypto_client.peak} in flight)")
+
+    assert screener.bars == ANALYSIS_BARS
+    assert len(table) == 499 and "BAD001" not in set(table["symbol"])
+    assert router.multi_asset_client.calls == [50] * 9 + [30]
+    assert router.crypto_client.calls == 20
+    assert 1 < router.crypto_client.peak <= screener.max_workers
+
+    # Same values as the per-symbol strategy on the analysis window
+    frames, _ = router.fetch_many(universe[:5] + universe[-2:], "1h", ANALYSIS_BARS)
+    rows = table.set_index("symbol")
+
+    for symbol, df in frames.items():
+        last = EMARsiStrategy().indicators(df.tail(ANALYSIS_BARS)).iloc[-1]
+        row = rows.loc[symbol]
+
+        assert np.isclose(row["ema_fast"], last.ema_fast), symbol
+        assert np.isclose(row["ema_slow"], last.ema_slow), symbol
+        assert np.isclose(row["rsi"], last.rsi), symbol
+        assert row["signal"] == EMARsiStrategy().generate_signal(df.tail(ANALYSIS_BARS))
+
+    # Through the cache backend: a second pass and the per-symbol path
+    # read the windows the first pass wrote, no Twelve Data calls
+    cached = MarketDataRouter(cache=MemoryBackend(), cache_ttl=60)
+    cached.multi_asset_client = FakeTwelveData()
+    cached.crypto_client = FakeBinance()
+
+    first, _ = cached.fetch_many(universe[:60], "1h", ANALYSIS_BARS)
+    assert cached.multi_asset_client.calls == [50, 10]
+
+    second, _ = cached.fetch_many(universe[:60], "1h", ANALYSIS_BARS)
+    single = cached.fetch_ohlcv(universe[0], "1h", ANALYSIS_BARS)
+
+    assert cached.multi_asset_client.calls == [50, 10]
+    assert np.allclose(second[universe[0]]["close"], first[universe[0]]["close"].tail(ANALYSIS_BARS))
+    assert np.allclose(single["close"], second[universe[0]]["close"])
+
+    print(table.head())
+    print("universe screener OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import asyncio
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+
+from pydantic import ValidationError
+
+from data.cache_backend import CacheError, MemoryBackend
+from database.models import User, UserSettings
+from database.user_cache import UserSettingsCache
+from notifications.dispatch_queue import NotificationQueue
+
+
+class NullSender:
+    @classmethod
+    def send_batch(cls, recipient, signals):
+        pass
+
+
+class DownBackend(MemoryBackend):
+    """
+    Backend whose writes fail (Redis unreachable)
+    """
+
+    down = True
+
+    def set(self, key, value, ttl=None):
+        if self.down:
+            raise CacheError("connection refused")
+
+        super().set(key, value, ttl)
+
+
+class PausingSessions:
+    """
+    Session factory whose next query waits for `release` (a write
+    landing while a read is in flight)
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.pause = False
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        if self.pause:
+            self.pause = False
+            self.started.set()
+            self.release.wait(5)
+
+        return self.factory()
+
+
+def signal(confidence: float) -> dict:
+    return {
+        "symbol": "EURUSD",
+        "interval": "1h",
+        "signal": "BUY",
+        "entry_price": 1.08,
+        "stop_loss": 1.075,
+        "take_profit": 1.095,
+        "rr_ratio": 3.0,
+        "confidence_percent": confidence,
+        "signal_validity": {"expires_at": "2026-01-01T00:00:00Z"}
+    }
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="users-")
+
+    # The shared cache / router build the engine from DATABASE_URL
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'app.db')}"
+
+    from analytics.signal_dispatcher import SignalDispatcher
+    from analytics.signal_fanout import SignalFanout
+    from api.user import SettingsUpdate, update_settings
+    from database import session
+    from database.init_db import init_db
+
+    try:
+        init_db()
+
+        with session.SessionLocal() as db:
+            db.add_all(
+                User(
+                    name=f"u{i}",
+                    whatsapp_number=f"+1555{i:06d}",
+                    account_balance=1_000 + i,
+                    receive_high_profit_only=(i % 10 == 0)
+                )
+                for i in range(5_000)
+            )
+            db.flush()
+            db.add_all(
+                UserSettings(
+                    user_id=i, account_balance=50_000, risk_percent=2.0,
+                    max_lot_size=0.5, confidence_threshold=80.0
+                )
+                for i in range(1, 5_001, 5)
+            )
+            db.commit()
+
+        sessions = PausingSessions(session.SessionLocal)
+        cache = UserSettingsCache(sessions, max_size=1_000)
+        UserSettingsCache._shared = cache
+
+        started = time.perf_counter()
+        assert cache.warm() == 5_000
+        print(f"warm-up: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        # Settings override the user row; others keep their defaults
+        user = cache.get(1)
+        assert user["account_balance"] == 50_000 and user["max_lot"] == 0.5
+        assert cache.get(2)["confidence_threshold"] is None
+
+        # Fan-out: many signals, one query
+        SignalDispatcher._queue = NotificationQueue(
+            channels={"signal": NullSender}, max_pending=1_000_000
+        )
+        fanout = SignalFanout(users=cache)
+
+        queries = cache.stats()["queries"]
+
+        for i in range(20):
+            stats = fanout.fan_out({**signal(75.0), "entry_price": 1.08 + i * 1e-4})
+
+        assert cache.stats()["queries"] == queries
+        print("fan-out:", stats)
+
+        # 500 high-profit-only users excluded; half of the 1000 users
+        # with an 80% threshold are among them
+        assert stats["recipients"] == 4_500
+        assert stats["skipped_low_confidence"] == 500
+
+        # Write through the router → one reload on the next fan-out
+        response = asyncio.run(update_settings(2, SettingsUpdate(confidence_threshold=90.0), _async_db()))
+        assert response["status"] == "updated"
+
+        stats = fanout.fan_out(signal(85.0))
+        assert cache.stats()["queries"] == queries + 1
+        assert stats["skipped_low_confidence"] == 1
+
+        assert cache.get(2)["confidence_threshold"] == 90.0
+
+        # Only whitelisted, in-range fields are accepted
+        for bad in ({"risk_percent": 500}, {"max_lot_size": 0}, {"is_active": False}):
+            try:
+                SettingsUpdate(**bad)
+            except ValidationError:
+                pass
+            else:
+                raise AssertionError(f"accepted {bad}")
+
+        # A read in flight when a write lands is not cached
+        cache.invalidate(3)
+        sessions.pause = True
+
+        reader = threading.Thread(target=cache.get, args=(3,))
+        reader.start()
+        sessions.started.wait(5)
+
+        cache.invalidate(3)
+        sessions.release.set()
+        reader.join()
+
+        hits = cache.stats().get("hits", 0)
+        cache.get(3)
+        assert cache.stats().get("hits", 0) == hits
+
+        # Bounded LRU
+        for user_id in range(1, 3_001):
+            cache.get(user_id)
+
+        stats = cache.stats()
+        print("cache:", stats)
+        assert stats["entries"] == 1_000 and stats["evictions"] > 0
+
+        # Two workers sharing a backend: B's write reaches A's cache
+        backend = MemoryBackend()
+        worker_a = UserSettingsCache(session.SessionLocal, backend=backend, sync_interval=0)
+        worker_b = UserSettingsCache(session.SessionLocal, backend=backend, sync_interval=0)
+
+        assert worker_a.get(4)["confidence_threshold"] is None
+        worker_a.recipients(False)
+
+        with session.SessionLocal() as db:
+            db.add(UserSettings(
+                user_id=4, account_balance=2_000, risk_percent=1.0,
+                max_lot_size=1.0, confidence_threshold=70.0
+            ))
+            db.commit()
+
+        worker_b.invalidate(4)
+
+        assert worker_a.get(4)["confidence_threshold"] == 70.0
+        assert worker_a.stats()["remote_invalidations"] == 1
+        assert worker_b.stats().get("remote_invalidations", 0) == 0
+
+        queries = worker_a.stats()["queries"]
+        worker_a.recipients(False)
+        assert worker_a.stats()["queries"] == queries + 1
+
+        # Unpublished invalidations: one line per outage, all counted
+        down = DownBackend()
+        worker_c = UserSettingsCache(session.SessionLocal, backend=down)
+        out = io.StringIO()
+
+        with redirect_stdout(out):
+            for user_id in range(1, 6):
+                worker_c.invalidate(user_id)
+
+            down.down = False
+            worker_c.invalidate(1)
+
+        assert out.getvalue().count("[USER CACHE]") == 2
+        assert worker_c.stats()["sync_errors"] == 5
+
+        print("user cache OK")
+
+    finally:
+        SignalDispatcher._queue = None
+        shutil.rmtree(directory)
+
+
+def _async_db():
+    from database.session import async_session_factory
+    return async_session_factory()()
+
+
+if __name__ == "__main__":
+    main()